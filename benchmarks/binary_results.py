@@ -0,0 +1,82 @@
+# Copyright (c) 2025, HuaweiCloudDeveloper
+# Licensed under the BSD 3-Clause License.
+# See LICENSE file in the project root for full license information.
+
+"""
+Time the loading of column values by the driver in text and in binary format,
+to choose the types fetched in binary with OPTIONS["binary_results"] (see
+BINARY_DB_TYPES in gaussdb_django/compiler.py).
+
+    python benchmarks/binary_results.py
+"""
+
+import datetime
+import decimal
+import time
+import uuid
+import zoneinfo
+
+import common  # noqa: F401, puts the repository on the path
+
+
+from gaussdb import pq  # noqa: E402
+from gaussdb.adapt import AdaptersMap  # noqa: E402
+from gaussdb.pq import Format  # noqa: E402
+
+from gaussdb_django.gaussdb_any import get_adapters_template  # noqa: E402
+
+VALUES = [
+    ("int4", 12345),
+    ("int8", 1234567890123),
+    ("numeric", decimal.Decimal("12345.67")),
+    ("float8", 1.5e10),
+    ("bool", True),
+    ("uuid", uuid.UUID("12345678-1234-5678-1234-567812345678")),
+    ("date", datetime.date(2020, 5, 17)),
+    (
+        "timestamptz",
+        datetime.datetime(
+            2020, 5, 17, 10, 11, 12, 123456, tzinfo=datetime.timezone.utc
+        ),
+    ),
+    ("timestamp", datetime.datetime(2020, 5, 17, 10, 11, 12)),
+    ("varchar", "hello world"),
+    ("bytea", b"\x00\x01" * 16),
+]
+# Text output of the server where it differs from the text dumpers.
+SERVER_TEXT = {
+    "timestamptz": b"2020-05-17 10:11:12.123456+00",
+    "bytea": b"\\x" + (b"\x00\x01" * 16).hex().encode(),
+}
+
+
+def main(number=100000):
+    adapters = AdaptersMap(get_adapters_template(True, zoneinfo.ZoneInfo("UTC")))
+    print("driver implementation: %s" % pq.__impl__)
+    for format in (Format.TEXT, Format.BINARY):
+        total = 0
+        for name, value in VALUES:
+            oid = adapters.types[name].oid
+            data = SERVER_TEXT.get(name) if format == Format.TEXT else None
+            if data is None:
+                dumper = adapters.get_dumper_by_oid(oid, format)(type(value))
+                data = bytes(dumper.dump(value))
+            loader = adapters.get_loader(oid, format)(oid)
+            assert loader.load(data) == value, name
+            start = time.perf_counter()
+            for _ in range(number):
+                loader.load(data)
+            elapsed = time.perf_counter() - start
+            total += elapsed
+            print(
+                "%-6s %-12s %6.0f ns"
+                % (format.name.lower(), name, elapsed / number * 1e9)
+            )
+        print(
+            "%-6s row of %d columns: %.2f us"
+            % (format.name.lower(), len(VALUES), total / number * 1e6)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# Copyright (c) 2025, HuaweiCloudDeveloper
+# Licensed under the BSD 3-Clause License.
+# See LICENSE file in the project root for full license information.
+
+"""
+Setup shared by the benchmarks, which run without a database server: Django is
+configured with the gaussdb_django backend and the models of benchapp, and the
+connection wraps a driver connection that is never opened.
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+# Server assumed by the benchmarks, in the format of the detection query.
+SERVER = ("gaussdb (GaussDB Kernel 505.2.0 build 1) compiled", "90204", "A", True)
+
+
+def setup(options=None, use_tz=True):
+    """Configure Django with a gaussdb_django default database."""
+    settings.configure(
+        DATABASES={
+            "default": {
+                "ENGINE": "gaussdb_django",
+                "NAME": "bench",
+                "HOST": "127.0.0.1",
+                "PORT": 8000,
+                "USER": "bench",
+                "PASSWORD": "bench",
+                "OPTIONS": options or {},
+            }
+        },
+        INSTALLED_APPS=["benchapp"],
+        USE_TZ=use_tz,
+        TIME_ZONE="UTC",
+    )
+    django.setup()
+
+    from gaussdb_django import capabilities
+    from django.db import connection
+
+    capabilities._capabilities[
+        capabilities._cache_key(connection.settings_dict)
+    ] = capabilities._build_capabilities(SERVER, datanodes=0, identity_columns=True)
+
+
+def offline_connection(cursor_class):
+    """
+    Attach a driver connection that is never opened to the default connection,
+    its cursors being instances of cursor_class.
+    """
+    import gaussdb
+    from django.db import connection
+    from gaussdb import pq
+    from gaussdb.adapt import AdaptersMap
+
+    from gaussdb_django.gaussdb_any import get_adapters_template
+
+    conn = gaussdb.Connection(pq.PGconn.connect_start(b"host=/nonexistent"))
+    conn._check_connection_ok = lambda: None
+    conn._adapters = AdaptersMap(get_adapters_template(settings.USE_TZ, None))
+    connection.connection = conn
+    connection.autocommit = True
+    connection._set_autocommit = lambda autocommit: None
+    connection._commit = lambda: None
+    connection._rollback = lambda: None
+    connection._savepoint_allowed = lambda: False
+    connection.create_cursor = lambda name=None: cursor_class()
+    return connection
@@ -0,0 +1,71 @@
+# Copyright (c) 2025, HuaweiCloudDeveloper
+# Licensed under the BSD 3-Clause License.
+# See LICENSE file in the project root for full license information.
+
+"""
+Time the compilation of a queryset of about 600 nodes by GaussDBSQLCompiler,
+and of single nodes to measure the overhead of compile() per node.
+
+    python benchmarks/compile_dispatch.py
+"""
+
+import hashlib
+import timeit
+
+import common
+
+common.setup()
+
+from benchapp.models import Item  # noqa: E402
+from django.db.models import F, Q, Value  # noqa: E402
+from django.db.models.functions import Coalesce, JSONObject, Lower  # noqa: E402
+from django.db.models.lookups import Exact  # noqa: E402
+
+
+def queryset():
+    q = Q()
+    for i in range(60):
+        q |= Q(name=f"n{i}", count__gt=i) | Q(price__lt=F("count") + i)
+    return (
+        Item.objects.filter(q)
+        .annotate(
+            lname=Lower("name"),
+            c=Coalesce("count", Value(0)),
+            j=JSONObject(a="name", b="count"),
+        )
+        .order_by("-count", "data__key", Lower("name"))
+    )
+
+
+def main():
+    qs = queryset()
+
+    def compile_query():
+        return qs.query.get_compiler(using="default").as_sql()
+
+    sql, params = compile_query()
+    # Compare the digest across changes to check the SQL is unchanged.
+    digest = hashlib.md5(repr((sql, params)).encode()).hexdigest()
+    print("queryset: %d characters of SQL, digest %s" % (len(sql), digest))
+    number = 300
+    best = min(timeit.repeat(compile_query, number=number, repeat=5)) / number
+    print("queryset: %.1f us per compilation" % (best * 1e6))
+
+    compiler = qs.query.get_compiler(using="default")
+    compiler.setup_query()
+    col = Item._meta.get_field("count").get_col(Item._meta.db_table)
+    nodes = [
+        ("Col", col),
+        ("Exact", Exact(col, 5)),
+        ("Lower", Lower(Item._meta.get_field("name").get_col(Item._meta.db_table))),
+    ]
+    number = 20000
+    for name, node in nodes:
+        best = min(
+            timeit.repeat(lambda: compiler.compile(node), number=number, repeat=7)
+        )
+        print("%-6s %.2f us per node" % (name, best / number * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# Copyright (c) 2025, HuaweiCloudDeveloper
+# Licensed under the BSD 3-Clause License.
+# See LICENSE file in the project root for full license information.
+
+"""
+Count the round trips and time of applying 50 migrations creating 10 models
+each, with and without OPTIONS["batch_ddl"], each statement sent to the fake
+server taking the given round trip time in seconds.
+
+    python benchmarks/migrate_ddl.py [rtt]
+"""
+
+import sys
+import time
+
+import common
+
+common.setup()
+
+from django.db import connection, models  # noqa: E402
+
+statements = []
+
+
+class Cursor:
+    rtt = 0.001
+
+    def execute(self, sql, params=None):
+        statements.append(sql)
+        time.sleep(self.rtt)
+
+    def close(self):
+        pass
+
+
+def migrations(count=50, size=10):
+    """
+    Return count lists of size models with an indexed varchar, a
+    unique_together and a foreign key to the previous model of the list.
+    """
+    result = []
+    for migration in range(count):
+        migration_models = []
+        for i in range(size):
+            attrs = {
+                "__module__": "benchapp.models",
+                "name": models.CharField(max_length=50, db_index=True),
+                "code": models.CharField(max_length=20),
+                "created": models.DateTimeField(),
+                "Meta": type(
+                    "Meta",
+                    (),
+                    {"app_label": "benchapp", "unique_together": [("name", "code")]},
+                ),
+            }
+            if migration_models:
+                attrs["parent"] = models.ForeignKey(
+                    migration_models[-1], models.CASCADE
+                )
+            name = "Bench%d" % (migration * size + i)
+            migration_models.append(type(name, (models.Model,), attrs))
+        result.append(migration_models)
+    return result
+
+
+def migrate(migrations, batch_ddl):
+    connection.settings_dict["OPTIONS"]["batch_ddl"] = batch_ddl
+    connection.features.__dict__.pop("ddl_batch_size", None)
+    statements.clear()
+    start = time.perf_counter()
+    for migration_models in migrations:
+        with connection.schema_editor() as editor:
+            for model in migration_models:
+                editor.create_model(model)
+            # The recording of the migration.
+            with connection.cursor() as cursor:
+                cursor.execute("INSERT INTO django_migrations VALUES (1)")
+    return time.perf_counter() - start, len(statements)
+
+
+def main():
+    if len(sys.argv) > 1:
+        Cursor.rtt = float(sys.argv[1])
+    common.offline_connection(Cursor)
+    bench_migrations = migrations()
+    for batch_ddl in (False, True):
+        elapsed, round_trips = migrate(bench_migrations, batch_ddl)
+        print("batch_ddl=%s: %d round trips, %.2fs" % (batch_ddl, round_trips, elapsed))
+
+
+if __name__ == "__main__":
+    main()
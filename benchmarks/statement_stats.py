@@ -0,0 +1,67 @@
+# Copyright (c) 2025, HuaweiCloudDeveloper
+# Licensed under the BSD 3-Clause License.
+# See LICENSE file in the project root for full license information.
+
+"""
+Time the bookkeeping of OPTIONS["statement_stats"] per query (fingerprint
+lookup, clock reads and histogram updates of an execute and a fetch), by
+comparing the cursor wrapper recording the statements with the plain one
+around a cursor doing nothing.
+
+    python benchmarks/statement_stats.py
+"""
+
+import timeit
+
+import common
+
+common.setup(options={"statement_stats": True})
+
+from django.db import DEFAULT_DB_ALIAS, connections  # noqa: E402
+from django.db.backends.utils import CursorWrapper  # noqa: E402
+
+from gaussdb_django.base import StatementStatsCursorWrapper  # noqa: E402
+from gaussdb_django.monitoring import get_statement_stats  # noqa: E402
+
+SQL = 'SELECT "item"."id", "item"."name" FROM "item" WHERE "item"."id" = %s'
+
+
+class NullCursor:
+    def execute(self, sql, params=None):
+        pass
+
+    def fetchone(self):
+        return (1, "name")
+
+
+def main():
+    common.offline_connection(NullCursor)
+    # The wrapper itself, the connection proxy would add its own lookups.
+    connection = connections[DEFAULT_DB_ALIAS]
+    plain = CursorWrapper(NullCursor(), connection)
+    recording = connection.make_cursor(NullCursor())
+    assert isinstance(recording, StatementStatsCursorWrapper)
+
+    def query(cursor):
+        cursor.execute(SQL, (1,))
+        cursor.fetchone()
+
+    # Alternate the runs of both wrappers to share the noise of the machine.
+    number = 50000
+    timings = {"plain": [], "recording": []}
+    for _ in range(15):
+        for name, cursor in (("plain", plain), ("recording", recording)):
+            timings[name].append(timeit.timeit(lambda: query(cursor), number=number))
+    for name, values in timings.items():
+        timings[name] = min(values) / number * 1e9
+        print("%-11s %5.0f ns per query" % (name, timings[name]))
+    print(
+        "%-11s %5.0f ns per query"
+        % ("bookkeeping", timings["recording"] - timings["plain"])
+    )
+    [stats] = get_statement_stats(connection.alias).values()
+    assert stats[SQL]["execute"]["count"] == stats[SQL]["fetch"]["count"]
+
+
+if __name__ == "__main__":
+    main()
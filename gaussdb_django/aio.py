@@ -0,0 +1,221 @@
+"""
+Async query helpers running on the async connection of the gaussdb backend.
+
+Django's QuerySet.a*() methods run their sync counterpart in a thread
+through sync_to_async(). The helpers below compile the query with the ORM
+and execute it on DatabaseWrapper.aconnection from the event loop:
+
+    item = await aget(Item.objects.filter(active=True), pk=1)
+    total = await acount(Item.objects.all())
+    async for item in aiterator(Item.objects.order_by("pk")):
+        ...
+    await abulk_create(Item, [Item(name="a"), Item(name="b")])
+
+The async connection is independent from the sync one; close it with
+``await connections[alias].aclose()`` when the task is done with it.
+"""
+from django.core.exceptions import EmptyResultSet
+from django.db import NotSupportedError, connections
+from django.db.models import AutoField
+from django.db.models.query import MAX_GET_RESULTS, QuerySet
+from django.db.models.sql import InsertQuery
+from django.db.models.sql.constants import GET_ITERATOR_CHUNK_SIZE
+from django.utils.functional import partition
+
+__all__ = ["abulk_create", "acount", "afetch", "aget", "aiterator"]
+
+
+def _get_queryset(model_or_queryset):
+    if isinstance(model_or_queryset, QuerySet):
+        queryset = model_or_queryset
+    else:
+        queryset = model_or_queryset._default_manager.all()
+    if connections[queryset.db].vendor != "gaussdb":
+        raise NotSupportedError(
+            "The async helpers require a database using the gaussdb_django " "backend."
+        )
+    if queryset._prefetch_related_lookups:
+        raise NotSupportedError(
+            "prefetch_related() is not supported by the async helpers."
+        )
+    return queryset
+
+
+def _iterable(queryset, compiler, results):
+    """
+    Return the queryset's iterable (models, dicts, tuples, ...) built from
+    results already fetched with compiler.
+    """
+    compiler.fetched_results = results
+    clone = queryset._chain()
+    clone.query.get_compiler = lambda *args, **kwargs: compiler
+    return queryset._iterable_class(clone)
+
+
+async def afetch(queryset):
+    """Evaluate queryset and return its results as a list."""
+    queryset = _get_queryset(queryset)
+    compiler = queryset.query.get_compiler(using=queryset.db)
+    results = await compiler.aexecute_sql()
+    return list(_iterable(queryset, compiler, results))
+
+
+async def aiterator(queryset, chunk_size=GET_ITERATOR_CHUNK_SIZE):
+    """
+    Iterate over the results of queryset, fetching them by chunks of
+    chunk_size rows through a server-side cursor.
+    """
+    queryset = _get_queryset(queryset)
+    connection = connections[queryset.db]
+    compiler = queryset.query.get_compiler(using=queryset.db)
+    try:
+        sql, params = compiler.as_sql()
+        if not sql:
+            raise EmptyResultSet
+    except EmptyResultSet:
+        return
+    col_count = compiler.col_count
+    async with connection.atransaction():
+        cursor = await connection.achunked_cursor()
+        if (
+            connection.features.uses_binary_results
+            and compiler.fetches_binary_results()
+        ):
+            connection.set_binary_results(cursor.cursor)
+        async with cursor:
+            await cursor.execute(sql, params)
+            while rows := await cursor.fetchmany(chunk_size):
+                if compiler.has_extra_select:
+                    rows = [row[:col_count] for row in rows]
+                for result in _iterable(queryset, compiler, [rows]):
+                    yield result
+
+
+async def aget(queryset, *args, **kwargs):
+    """Async counterpart of QuerySet.get()."""
+    queryset = _get_queryset(queryset)
+    if queryset.query.combinator and (args or kwargs):
+        raise NotSupportedError(
+            "Calling QuerySet.get(...) with filters after %s() is not "
+            "supported." % queryset.query.combinator
+        )
+    clone = (
+        queryset._chain()
+        if queryset.query.combinator
+        else queryset.filter(*args, **kwargs)
+    )
+    if queryset.query.can_filter() and not queryset.query.distinct_fields:
+        clone = clone.order_by()
+    limit = None
+    if (
+        not clone.query.select_for_update
+        or connections[clone.db].features.supports_select_for_update_with_limit
+    ):
+        limit = MAX_GET_RESULTS
+        clone.query.set_limits(high=limit)
+    results = await afetch(clone)
+    num = len(results)
+    if num == 1:
+        return results[0]
+    if not num:
+        raise queryset.model.DoesNotExist(
+            "%s matching query does not exist." % queryset.model._meta.object_name
+        )
+    raise queryset.model.MultipleObjectsReturned(
+        "get() returned more than one %s -- it returned %s!"
+        % (
+            queryset.model._meta.object_name,
+            num if not limit or num < limit else "more than %s" % (limit - 1),
+        )
+    )
+
+
+async def acount(queryset):
+    """Async counterpart of QuerySet.count()."""
+    queryset = _get_queryset(queryset)
+    if queryset._result_cache is not None:
+        return len(queryset._result_cache)
+    query = queryset.query.chain()
+    if not query.is_sliced:
+        query.clear_ordering(force=True)
+    compiler = query.get_compiler(using=queryset.db)
+    try:
+        sql, params = compiler.as_sql(with_col_aliases=True)
+        if not sql:
+            raise EmptyResultSet
+    except EmptyResultSet:
+        return 0
+    cursor = await connections[queryset.db].acursor()
+    async with cursor:
+        await cursor.execute("SELECT COUNT(*) FROM (%s) subquery" % sql, params)
+        return (await cursor.fetchone())[0]
+
+
+async def _abatched_insert(queryset, objs, fields, batch_size):
+    connection = connections[queryset.db]
+    opts = queryset.model._meta
+    max_batch_size = max(connection.ops.bulk_batch_size(fields, objs), 1)
+    batch_size = min(batch_size, max_batch_size) if batch_size else max_batch_size
+    returning_fields = opts.db_returning_fields
+    returned_rows = []
+    touched_tables = connection.touched_tables
+    if touched_tables is not None:
+        touched_tables.add(opts.db_table)
+    cursor = await connection.acursor()
+    async with cursor:
+        for start in range(0, len(objs), batch_size):
+            query = InsertQuery(queryset.model)
+            query.insert_values(fields, objs[start:][:batch_size])
+            compiler = query.get_compiler(using=queryset.db)
+            compiler.returning_fields = returning_fields
+            for sql, params in compiler.as_sql():
+                await cursor.execute(sql, params)
+            rows = await cursor.fetchall()
+            cols = [field.get_col(opts.db_table) for field in returning_fields]
+            converters = compiler.get_converters(cols)
+            if converters:
+                rows = compiler.apply_converters(rows, converters)
+            returned_rows.extend(rows)
+    return returned_rows
+
+
+async def abulk_create(model_or_queryset, objs, batch_size=None):
+    """
+    Async counterpart of QuerySet.bulk_create() without conflict handling.
+    Set the primary key and other database-generated values on objs.
+    """
+    queryset = _get_queryset(model_or_queryset)
+    if batch_size is not None and batch_size <= 0:
+        raise ValueError("Batch size must be a positive integer.")
+    opts = queryset.model._meta
+    for parent in opts.get_parent_list():
+        if parent._meta.concrete_model is not opts.concrete_model:
+            raise ValueError("Can't bulk create a multi-table inherited model")
+    objs = list(objs)
+    if not objs:
+        return objs
+    queryset._prepare_for_bulk_create(objs)
+    fields = [field for field in opts.concrete_fields if not field.generated]
+    connection = connections[queryset.db]
+    async with connection.atransaction():
+        objs_without_pk, objs_with_pk = partition(lambda o: o._is_pk_set(), objs)
+        if objs_with_pk:
+            returned_rows = await _abatched_insert(
+                queryset, objs_with_pk, fields, batch_size
+            )
+            for obj_with_pk, results in zip(objs_with_pk, returned_rows):
+                for result, field in zip(results, opts.db_returning_fields):
+                    if field != opts.pk:
+                        setattr(obj_with_pk, field.attname, result)
+        if objs_without_pk:
+            fields = [field for field in fields if not isinstance(field, AutoField)]
+            returned_rows = await _abatched_insert(
+                queryset, objs_without_pk, fields, batch_size
+            )
+            for obj_without_pk, results in zip(objs_without_pk, returned_rows):
+                for result, field in zip(results, opts.db_returning_fields):
+                    setattr(obj_without_pk, field.attname, result)
+    for obj in objs:
+        obj._state.adding = False
+        obj._state.db = queryset.db
+    return objs
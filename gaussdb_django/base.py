@@ -4,7 +4,9 @@ Gaussdb database backend for Django.
 Requires gaussdb >= 1.0.3
 """
 import asyncio
+import logging
 import threading
+import time
 import warnings
 from contextlib import contextmanager
 
@@ -14,6 +16,7 @@ from django.db import DatabaseError as WrappedDatabaseError
 from django.db import connections
 from django.db.backends.base.base import NO_DB_ALIAS, BaseDatabaseWrapper
 from django.db.backends.utils import CursorDebugWrapper as BaseCursorDebugWrapper
+from django.db.backends.utils import CursorWrapper
 from django.utils.asyncio import async_unsafe
 from django.utils.functional import cached_property
 from django.utils.version import get_version_tuple
@@ -46,14 +49,23 @@ if gaussdb_version() < (1, 0, 3):
     )
 
 TIMESTAMPTZ_OID = adapters.types["timestamptz"].oid
+# Name of the cursors declared on the connections dedicated to streaming.
+STREAMING_CURSOR_NAME = "_django_stream_curs"
 
 # Some of these import gaussdb, so import them after checking if it's installed.
+from .capabilities import aget_capabilities, get_capabilities  # NOQA isort:skip
 from .client import DatabaseClient  # NOQA isort:skip
 from .creation import DatabaseCreation  # NOQA isort:skip
 from .features import DatabaseFeatures  # NOQA isort:skip
 from .introspection import DatabaseIntrospection  # NOQA isort:skip
+from .monitoring import get_statement_recorder, record_pool_event  # NOQA isort:skip
 from .operations import DatabaseOperations  # NOQA isort:skip
 from .schema import DatabaseSchemaEditor  # NOQA isort:skip
+from .sql_cache import get_compiled_sql_cache  # NOQA isort:skip
+from .signals import pool_checkout, pool_return, pool_timeout  # NOQA isort:skip
+
+
+logger = logging.getLogger("django.db.backends")
 
 
 def _get_varchar_column(data):
@@ -68,6 +80,9 @@ class DatabaseWrapper(BaseDatabaseWrapper):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        # The gaussdb AsyncConnection used by the async code path. It's
+        # independent from self.connection.
+        self.aconnection = None
 
     # This dictionary maps Field objects to their associated Gaussdb column
     # types, as strings. Column-type strings can contain format strings; they'll
@@ -160,7 +175,24 @@ class DatabaseWrapper(BaseDatabaseWrapper):
     ops_class = DatabaseOperations
     # Gaussdb backend-specific attributes.
     _named_cursor_idx = 0
+    # Idle connection of the streaming cursors, see _streaming_cursor().
+    _streaming_connection = None
+    # See composer.
+    _composer = None
+    # See catalog_cache.
+    _catalog_cache = None
+    # See touched_tables.
+    _touched_tables = {}
     _connection_pools = {}
+    _async_connection_pools = {}
+    # Async pools replaced after a time zone change, closed from the event
+    # loop by the next async connection, see ensure_timezone().
+    _retired_async_pools = []
+    # Whether the time zone of the async connection must be set again.
+    _areconfigure_timezone = False
+    # Whether the statements prepared on the async connection must be
+    # deallocated, see clear_prepared_statements().
+    _aclear_prepared_statements = False
 
     @property
     def pool(self):
@@ -193,6 +225,11 @@ class DatabaseWrapper(BaseDatabaseWrapper):
                 open=False,  # Do not open the pool during startup.
                 configure=self._configure_connection,
                 check=ConnectionPool.check_connection if enable_checks else None,
+                reset=(
+                    self._reset_prepared_statements
+                    if self.features.prepared_statements_max
+                    else None
+                ),
                 **pool_options,
             )
             # setdefault() ensures that multiple threads don't set this in
@@ -208,6 +245,101 @@ class DatabaseWrapper(BaseDatabaseWrapper):
             self.pool.close()
             del self._connection_pools[self.alias]
 
+    @property
+    def apool(self):
+        """
+        The gaussdb_pool.AsyncConnectionPool of the async connections,
+        configured from the same OPTIONS["pool"] as the sync pool.
+        """
+        pool_options = self.settings_dict["OPTIONS"].get("pool")
+        if self.alias == NO_DB_ALIAS or not pool_options:
+            return None
+
+        if self.alias not in self._async_connection_pools:
+            if self.settings_dict.get("CONN_MAX_AGE", 0) != 0:
+                raise ImproperlyConfigured(
+                    "Pooling doesn't support persistent connections."
+                )
+            # Set the default options.
+            if pool_options is True:
+                pool_options = {}
+
+            try:
+                from gaussdb_pool import AsyncConnectionPool
+            except ImportError as err:
+                raise ImproperlyConfigured(
+                    "Error loading gaussdb_pool module.\nDid you install gaussdb[pool]?"
+                ) from err
+
+            enable_checks = self.settings_dict["CONN_HEALTH_CHECKS"]
+            pool = AsyncConnectionPool(
+                kwargs=self.get_async_connection_params(),
+                open=False,  # Opened by the first aensure_connection().
+                configure=self._aconfigure_connection,
+                check=AsyncConnectionPool.check_connection if enable_checks else None,
+                reset=(
+                    self._areset_prepared_statements
+                    if self.features.prepared_statements_max
+                    else None
+                ),
+                **pool_options,
+            )
+            self._async_connection_pools.setdefault(self.alias, pool)
+
+        return self._async_connection_pools[self.alias]
+
+    async def aclose_pool(self):
+        """
+        Close the async pool. Call it on shutdown (e.g. from the ASGI
+        lifespan shutdown event) as the pool's workers run on the event loop.
+        """
+        if self.apool:
+            pool = self._async_connection_pools.pop(self.alias)
+            await pool.close()
+        await self._aclose_retired_pools()
+
+    async def _aclose_retired_pools(self):
+        while self._retired_async_pools:
+            await self._retired_async_pools.pop().close()
+
+    def _pool_event(self, pool, kind, event, signal, **kwargs):
+        record_pool_event(self.alias, kind, event)
+        signal.send(
+            sender=self.__class__, connection=self, pool=pool, kind=kind, **kwargs
+        )
+
+    def _pool_getconn(self, pool):
+        from gaussdb_pool import PoolTimeout
+
+        start = time.monotonic()
+        try:
+            connection = pool.getconn()
+        except PoolTimeout:
+            wait_time = time.monotonic() - start
+            self._pool_event(
+                pool, "sync", "timeouts", pool_timeout, wait_time=wait_time
+            )
+            raise
+        wait_time = time.monotonic() - start
+        self._pool_event(pool, "sync", "checkouts", pool_checkout, wait_time=wait_time)
+        return connection
+
+    async def _apool_getconn(self, pool):
+        from gaussdb_pool import PoolTimeout
+
+        start = time.monotonic()
+        try:
+            connection = await pool.getconn()
+        except PoolTimeout:
+            wait_time = time.monotonic() - start
+            self._pool_event(
+                pool, "async", "timeouts", pool_timeout, wait_time=wait_time
+            )
+            raise
+        wait_time = time.monotonic() - start
+        self._pool_event(pool, "async", "checkouts", pool_checkout, wait_time=wait_time)
+        return connection
+
     def get_database_version(self):
         """
         Return a tuple of the database's version.
@@ -249,10 +381,19 @@ class DatabaseWrapper(BaseDatabaseWrapper):
 
         conn_params.pop("assume_role", None)
         conn_params.pop("isolation_level", None)
-
-        pool_options = conn_params.pop("pool", None)
-        if pool_options:
-            raise ImproperlyConfigured("Database pooling requires gaussdb >= 1.0.3")
+        conn_params.pop("copy_bulk_insert", None)
+        conn_params.pop("upsert_syntax", None)
+        conn_params.pop("capabilities_cache", None)
+        conn_params.pop("statement_stats", None)
+        conn_params.pop("prepared_statements", None)
+        conn_params.pop("compiled_sql_cache", None)
+        conn_params.pop("binary_results", None)
+        conn_params.pop("streaming_cursors", None)
+        conn_params.pop("cursor_itersize", None)
+        conn_params.pop("batch_ddl", None)
+        conn_params.pop("flush_touched_tables", None)
+
+        conn_params.pop("pool", None)
 
         server_side_binding = conn_params.pop("server_side_binding", None)
         conn_params.setdefault(
@@ -270,7 +411,11 @@ class DatabaseWrapper(BaseDatabaseWrapper):
         conn_params["context"] = get_adapters_template(settings.USE_TZ, self.timezone)
         # Disable prepared statements by default to keep connection poolers
         # working. Can be reenabled via OPTIONS in the settings dict.
-        conn_params["prepare_threshold"] = conn_params.pop("prepare_threshold", None)
+        prepare_threshold = conn_params.pop("prepare_threshold", None)
+        if prepare_threshold is None and self.features.prepared_statements_max:
+            # Prepare statements executed more than this number of times.
+            prepare_threshold = 5
+        conn_params["prepare_threshold"] = prepare_threshold
         return conn_params
 
     @async_unsafe
@@ -299,7 +444,7 @@ class DatabaseWrapper(BaseDatabaseWrapper):
         if self.pool:
             # If nothing else has opened the pool, open it now.
             self.pool.open()
-            connection = self.pool.getconn()
+            connection = self._pool_getconn(self.pool)
         else:
             connection = self.Database.connect(**conn_params)
         if set_isolation_level:
@@ -309,6 +454,10 @@ class DatabaseWrapper(BaseDatabaseWrapper):
     def ensure_timezone(self):
         # Close the pool so new connections pick up the correct timezone.
         self.close_pool()
+        # The async pool must be closed from the event loop, replace it.
+        if (pool := self._async_connection_pools.pop(self.alias, None)) is not None:
+            self._retired_async_pools.append(pool)
+        self._areconfigure_timezone = self.aconnection is not None
         if self.connection is None:
             return False
         return self._configure_timezone(self.connection)
@@ -324,9 +473,10 @@ class DatabaseWrapper(BaseDatabaseWrapper):
 
     def _configure_role(self, connection):
         if new_role := self.settings_dict["OPTIONS"].get("assume_role"):
+            # connection may not be self.connection, e.g. when the pool
+            # configures a new connection.
             with connection.cursor() as cursor:
-                sql = self.ops.compose_sql("SET ROLE %s", [new_role])
-                cursor.execute(sql)
+                cursor.execute(sql.SQL("SET ROLE {}").format(sql.Literal(new_role)))
             return True
         return False
 
@@ -340,10 +490,79 @@ class DatabaseWrapper(BaseDatabaseWrapper):
         # to login is not the same as the role that owns database resources. As
         # can be the case when using temporary or ephemeral credentials.
         commit_role = self._configure_role(connection)
+        self._configure_prepared_statements(connection)
 
         return commit_role or commit_tz
 
+    def _configure_prepared_statements(self, connection):
+        if prepared_max := self.features.prepared_statements_max:
+            # The driver keeps the prepared statements in a LRU cache of this
+            # size, deallocating the evicted ones on the server.
+            connection.prepared_max = prepared_max
+
+    @staticmethod
+    def _reset_prepared_statements(connection):
+        # The driver forgets the prepared statements and deallocates them on
+        # the server (DEALLOCATE ALL) when a transaction or a savepoint is
+        # rolled back. Also used by the pool when a connection is returned.
+        with connection.transaction(force_rollback=True):
+            pass
+
+    @staticmethod
+    async def _areset_prepared_statements(connection):
+        async with connection.transaction(force_rollback=True):
+            pass
+
+    def clear_prepared_statements(self):
+        """
+        Deallocate the statements prepared on the connections, e.g. after DDL
+        changing the tables they use. The async connection is reset by the
+        next aensure_connection().
+        """
+        if not self.features.prepared_statements_max:
+            return
+        if self.connection is not None:
+            self._reset_prepared_statements(self.connection)
+        self._aclear_prepared_statements = self.aconnection is not None
+
+    @property
+    def composer(self):
+        """
+        A client-side binding cursor of the connection, only used to compose
+        statements with their parameters (see DatabaseOperations.compose_sql())
+        without opening a cursor each time.
+        """
+        self.ensure_connection()
+        if self._composer is None or self._composer.connection is not self.connection:
+            self._composer = Database.ClientCursor(self.connection)
+        return self._composer
+
+    @property
+    def catalog_cache(self):
+        """
+        Results of the catalog lookups of the schema editor on this
+        connection, e.g. the determinism of collations. It's cleared when the
+        connection is closed and by the DDL changing these catalogs.
+        """
+        if self._catalog_cache is None:
+            self._catalog_cache = {}
+        return self._catalog_cache
+
+    @property
+    def touched_tables(self):
+        """
+        The set of tables of this alias inserted into through the ORM since
+        they were last flushed, shared by the threads of the process. None
+        until the first flush or if OPTIONS["flush_touched_tables"] isn't set.
+        """
+        return self._touched_tables.get(self.alias)
+
     def _close(self):
+        self._composer = None
+        self._catalog_cache = None
+        if self._streaming_connection is not None:
+            connection, self._streaming_connection = self._streaming_connection, None
+            connection.close()
         if self.connection is not None:
             # `wrap_database_errors` only works for `putconn` as long as there
             # is no `reset` function set in the pool because it is deferred
@@ -353,9 +572,11 @@ class DatabaseWrapper(BaseDatabaseWrapper):
                     # Ensure the correct pool is returned. This is a workaround
                     # for tests so a pool can be changed on setting changes
                     # (e.g. USE_TZ, TIME_ZONE).
-                    self.connection._pool.putconn(self.connection)
+                    pool = self.connection._pool
+                    pool.putconn(self.connection)
                     # Connection can no longer be used.
                     self.connection = None
+                    self._pool_event(pool, "sync", "returns", pool_return)
                 else:
                     return self.connection.close()
 
@@ -368,35 +589,34 @@ class DatabaseWrapper(BaseDatabaseWrapper):
             if commit and not self.get_autocommit():
                 self.connection.commit()
 
-        if self.supports_identity_columns():
-            # Use identity (for GaussDB)
-            pass
-        else:
-            # Fall back to serial (for openGauss)
-            self.data_types["AutoField"] = "serial"
-            self.data_types["BigAutoField"] = "bigserial"
-            self.data_types["SmallAutoField"] = "smallserial"
+        if not self.supports_identity_columns():
+            # Fall back to serial (for openGauss). Only this instance is
+            # changed as other aliases may point to servers with identity
+            # support.
+            self.data_types = {
+                **self.data_types,
+                "AutoField": "serial",
+                "BigAutoField": "bigserial",
+                "SmallAutoField": "smallserial",
+            }
             self.data_types_suffix = {}
 
+    @property
+    def capabilities(self):
+        return get_capabilities(self)
+
     def supports_identity_columns(self):
-        try:
-            with self.connection.cursor() as cursor:
-                cursor.execute(
-                    """
-                    CREATE TEMPORARY TABLE test_identity_support (
-                        id integer GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY
-                    )
-                """
-                )
-                cursor.execute("DROP TABLE test_identity_support")
-                return True
-        except Exception:
-            # If syntax error or unsupported, assume no identity support
-            return False
+        return self.capabilities.identity_columns
+
+    # The GaussDBSQLCompiler executing a query whose results may be fetched
+    # in binary format by the next cursor, see GaussDBSQLCompiler.execute_sql().
+    binary_results_compiler = None
 
     @async_unsafe
     def create_cursor(self, name=None):
-        if name:
+        if name and self.connection.autocommit and self.features.uses_streaming_cursors:
+            cursor = self._streaming_cursor()
+        elif name:
             if self.settings_dict["OPTIONS"].get("server_side_binding") is not True:
                 # gaussdb >= 1.0.3 forces the usage of server-side bindings for
                 # named cursors so a specialized class that implements
@@ -417,23 +637,93 @@ class DatabaseWrapper(BaseDatabaseWrapper):
         else:
             cursor = self.connection.cursor()
 
+        compiler, self.binary_results_compiler = self.binary_results_compiler, None
+        if compiler is not None and compiler.fetches_binary_results():
+            self.set_binary_results(cursor)
+
         tzloader = self.connection.adapters.get_loader(TIMESTAMPTZ_OID, Format.TEXT)
         if self.timezone != tzloader.timezone:
             register_tzloader(self.timezone, cursor)
 
         return cursor
 
+    def _streaming_cursor(self):
+        """
+        Return a named cursor streaming its results from a dedicated
+        connection. In autocommit mode, cursors must be declared WITH HOLD,
+        which makes the server materialize the whole result before the first
+        fetch. The cursor is declared without hold in the implicit
+        transaction of the dedicated connection instead, so that the
+        statements run on self.connection while iterating aren't part of it.
+        """
+        connection, self._streaming_connection = self._streaming_connection, None
+        if connection is None or connection.closed:
+            connection = self._new_streaming_connection()
+        connection.autocommit = False
+        if self.settings_dict["OPTIONS"].get("server_side_binding") is not True:
+            cursor_class = StreamingServerSideCursor
+        else:
+            cursor_class = StreamingServerBindingCursor
+        # A dedicated connection runs a single cursor at a time.
+        cursor = cursor_class(
+            connection, name=STREAMING_CURSOR_NAME, scrollable=False, withhold=False
+        )
+        cursor.release = self._release_streaming_connection
+        return cursor
+
+    def _new_streaming_connection(self):
+        # Open and configure the connection like self.connection, which is
+        # swapped with it meanwhile.
+        connection = self.get_new_connection(self.get_connection_params())
+        main_connection, self.connection = self.connection, connection
+        try:
+            self.init_connection_state()
+        finally:
+            self.connection = main_connection
+        connection.commit()
+        return connection
+
+    def _release_streaming_connection(self, connection):
+        # End the implicit transaction of the closed streaming cursor and keep
+        # its connection for the next one.
+        try:
+            connection.commit()
+            connection.autocommit = True
+        except Database.Error:
+            connection.close()
+        if self.pool:
+            pool = connection._pool
+            pool.putconn(connection)
+            self._pool_event(pool, "sync", "returns", pool_return)
+        elif (
+            self.connection is None
+            or self._streaming_connection is not None
+            or connection.closed
+        ):
+            connection.close()
+        else:
+            self._streaming_connection = connection
+
+    def set_binary_results(self, cursor):
+        """
+        Fetch the results of the given gaussdb cursor in binary format if it
+        supports it. Client-side binding cursors only fetch text results,
+        named ones are declared with client-side bindings and fetch binary
+        results.
+        """
+        if isinstance(cursor, (ServerSideCursor, AsyncServerSideCursor)):
+            cursor.binary_results = True
+        elif not isinstance(
+            cursor, (Database.ClientCursor, Database.AsyncClientCursor)
+        ):
+            cursor.format = Format.BINARY
+
     def tzinfo_factory(self, offset):
         return self.timezone
 
-    @async_unsafe
-    def chunked_cursor(self):
+    def _named_cursor_name(self):
         self._named_cursor_idx += 1
         # Get the current async task
-        # Note that right now this is behind @async_unsafe, so this is
-        # unreachable, but in future we'll start loosening this restriction.
-        # For now, it's here so that every use of "threading" is
-        # also async-compatible.
         try:
             current_task = asyncio.current_task()
         except RuntimeError:
@@ -444,16 +734,147 @@ class DatabaseWrapper(BaseDatabaseWrapper):
         else:
             task_ident = "sync"
         # Use that and the thread ident to get a unique name
-        return self._cursor(
-            name="_django_curs_%d_%s_%d"
-            % (
-                # Avoid reusing name in other threads / tasks
-                threading.current_thread().ident,
-                task_ident,
-                self._named_cursor_idx,
-            )
+        return "_django_curs_%d_%s_%d" % (
+            # Avoid reusing name in other threads / tasks
+            threading.current_thread().ident,
+            task_ident,
+            self._named_cursor_idx,
         )
 
+    @async_unsafe
+    def chunked_cursor(self):
+        return self._cursor(name=self._named_cursor_name())
+
+    def get_async_connection_params(self):
+        conn_params = self.get_connection_params()
+        server_side_binding = self.settings_dict["OPTIONS"].get("server_side_binding")
+        conn_params["cursor_factory"] = (
+            AsyncServerBindingCursor if server_side_binding is True else AsyncCursor
+        )
+        # The async code path runs in autocommit, use atransaction() to group
+        # statements.
+        conn_params["autocommit"] = True
+        return conn_params
+
+    async def aget_new_connection(self, conn_params):
+        await self._aclose_retired_pools()
+        if self.apool:
+            # If nothing else has opened the pool, open it now.
+            await self.apool.open()
+            connection = await self._apool_getconn(self.apool)
+        else:
+            connection = await self.Database.AsyncConnection.connect(**conn_params)
+        isolation_level_value = self.settings_dict["OPTIONS"].get("isolation_level")
+        if isolation_level_value is not None:
+            try:
+                isolation_level = IsolationLevel(isolation_level_value)
+            except ValueError:
+                raise ImproperlyConfigured(
+                    f"Invalid transaction isolation level {isolation_level_value} "
+                    f"specified. Use one of the gaussdb.IsolationLevel values."
+                )
+            await connection.set_isolation_level(isolation_level)
+        return connection
+
+    async def _aconfigure_connection(self, connection):
+        # Async counterpart of _configure_connection(). Statements are
+        # composed client-side as the async cursor may use server-side
+        # bindings, which SET doesn't support.
+        commit = await self._aconfigure_timezone(connection)
+        if new_role := self.settings_dict["OPTIONS"].get("assume_role"):
+            async with connection.cursor() as cursor:
+                await cursor.execute(
+                    sql.SQL("SET ROLE {}").format(sql.Literal(new_role))
+                )
+            commit = True
+        self._configure_prepared_statements(connection)
+        return commit
+
+    async def _aconfigure_timezone(self, connection):
+        conn_timezone_name = connection.info.parameter_status("TimeZone")
+        timezone_name = self.timezone_name or "UTC"
+        if not conn_timezone_name or conn_timezone_name != timezone_name:
+            async with connection.cursor() as cursor:
+                await cursor.execute(
+                    sql.SQL("SET TIME ZONE {}").format(sql.Literal(timezone_name))
+                )
+            return True
+        return False
+
+    async def aensure_connection(self):
+        """
+        Return the async connection to the database, opening it if needed.
+        """
+        if self.aconnection is None:
+            with self.wrap_database_errors:
+                connection = await self.aget_new_connection(
+                    self.get_async_connection_params()
+                )
+                if not self.apool:
+                    # Pooled connections are configured by the pool.
+                    await self._aconfigure_connection(connection)
+            self.aconnection = connection
+            await aget_capabilities(self)
+        elif self._areconfigure_timezone or self._aclear_prepared_statements:
+            with self.wrap_database_errors:
+                if self._areconfigure_timezone:
+                    # The time zone changed while the connection was open.
+                    await self._aconfigure_timezone(self.aconnection)
+                if self._aclear_prepared_statements:
+                    await self._areset_prepared_statements(self.aconnection)
+        self._areconfigure_timezone = self._aclear_prepared_statements = False
+        return self.aconnection
+
+    def _aprepare_cursor(self, cursor):
+        tzloader = self.aconnection.adapters.get_loader(TIMESTAMPTZ_OID, Format.TEXT)
+        if self.timezone != tzloader.timezone:
+            register_tzloader(self.timezone, cursor)
+        return AsyncCursorWrapper(cursor, self)
+
+    async def acursor(self):
+        """Return an async cursor wrapper on the async connection."""
+        connection = await self.aensure_connection()
+        with self.wrap_database_errors:
+            cursor = connection.cursor()
+        return self._aprepare_cursor(cursor)
+
+    async def achunked_cursor(self):
+        """
+        Return an async server-side cursor. It must be used inside
+        atransaction() as it isn't holdable.
+        """
+        connection = await self.aensure_connection()
+        name = self._named_cursor_name()
+        with self.wrap_database_errors:
+            if self.settings_dict["OPTIONS"].get("server_side_binding") is not True:
+                cursor = AsyncServerSideCursor(connection, name=name, scrollable=False)
+            else:
+                cursor = connection.cursor(name, scrollable=False)
+        return self._aprepare_cursor(cursor)
+
+    def atransaction(self):
+        """
+        Return an async context manager running its block in a transaction
+        (or a savepoint when nested) on the async connection.
+        """
+        return AsyncTransaction(self)
+
+    async def aclose(self):
+        """
+        Close the async connection, if any, or return it to the async pool.
+        """
+        if self.aconnection is None:
+            return
+        connection, self.aconnection = self.aconnection, None
+        with self.wrap_database_errors:
+            if self.apool:
+                # Ensure the connection is returned to the pool it comes from.
+                pool = connection._pool
+                await pool.putconn(connection)
+                self._pool_event(pool, "async", "returns", pool_return)
+            else:
+                await connection.close()
+
     def _set_autocommit(self, autocommit):
         with self.wrap_database_errors:
             self.connection.autocommit = autocommit
@@ -525,29 +946,52 @@ class DatabaseWrapper(BaseDatabaseWrapper):
 
     @cached_property
     def pg_version(self):
-        with self.temporary_connection():
-            return self.connection.info.server_version
+        return self.capabilities.server_version_num
 
     def check_database_version_supported(self):
         """
-        Override Django's version check to support GaussDB.
-        GaussDB reports version like 9.204 but is PostgreSQL-compatible.
+        Detect the server capabilities on the first connection. GaussDB
+        reports a PostgreSQL-compatible version (e.g. 9.204) which is checked
+        against DatabaseFeatures.minimum_database_version.
         """
-        try:
-            with self.temporary_connection() as conn:
-                server_version = conn.execute("select version()").fetchall()[0][0]
-                print(f"Server Version String: {server_version}")
-                if server_version:
-                    self.pg_version = 140000
-                    return
-        except Exception as e:
-            raise Database.Error(
-                f"Unable to determine server version from server_version parameter: {e}"
-            )
+        get_capabilities(self)
+        super().check_database_version_supported()
+
+    @cached_property
+    def statement_stats(self):
+        """
+        The StatementHistograms recording the latency of the statements of
+        this connection when OPTIONS["statement_stats"] is set, None
+        otherwise.
+        """
+        option = self.settings_dict["OPTIONS"].get("statement_stats")
+        if not option:
+            return None
+        max_statements = 1000 if option is True else option
+        return get_statement_recorder(self, max_statements)
+
+    @cached_property
+    def compiled_sql_cache(self):
+        """
+        The CompiledSQLCache of this alias when OPTIONS["compiled_sql_cache"]
+        is set, None otherwise.
+        """
+        option = self.settings_dict["OPTIONS"].get("compiled_sql_cache")
+        if not option:
+            return None
+        max_size = 500 if option is True else option
+        return get_compiled_sql_cache(self.alias, max_size)
 
     def make_debug_cursor(self, cursor):
+        if self.statement_stats is not None:
+            return StatementStatsCursorDebugWrapper(cursor, self)
         return CursorDebugWrapper(cursor, self)
 
+    def make_cursor(self, cursor):
+        if self.statement_stats is not None:
+            return StatementStatsCursorWrapper(cursor, self)
+        return super().make_cursor(cursor)
+
 
 class CursorMixin:
     """
@@ -596,8 +1040,222 @@ class ServerSideCursor(
     would inherit, but that's not the case.
     """
 
+    # Whether to fetch the results in binary format, the DECLARE statement
+    # being sent in text format.
+    binary_results = False
+
+    def execute(self, query, params=None, *, binary=None, **kwargs):
+        if binary is None:
+            binary = self.binary_results
+        return super().execute(query, params, binary=binary, **kwargs)
+
+
+class StreamingCursorMixin:
+    """
+    A named cursor declared without hold on a dedicated connection. Closing
+    it releases the connection.
+    """
+
+    release = None
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            if self.release is not None:
+                release, self.release = self.release, None
+                release(self.connection)
+
+
+class StreamingServerSideCursor(StreamingCursorMixin, ServerSideCursor):
+    pass
+
+
+class StreamingServerBindingCursor(
+    StreamingCursorMixin, CursorMixin, Database.ServerCursor
+):
+    pass
+
+
+class AsyncServerBindingCursor(Database.AsyncCursor):
+    pass
+
+
+class AsyncCursor(Database.AsyncClientCursor):
+    pass
+
+
+class AsyncServerSideCursor(
+    Database.client_cursor.ClientCursorMixin, Database.AsyncServerCursor
+):
+    """
+    Async counterpart of ServerSideCursor: an async named cursor performing
+    client-side bindings.
+    """
+
+    binary_results = False
+
+    async def execute(self, query, params=None, *, binary=None, **kwargs):
+        if binary is None:
+            binary = self.binary_results
+        return await super().execute(query, params, binary=binary, **kwargs)
+
+
+class AsyncCursorWrapper:
+    """
+    Wrap a gaussdb async cursor to translate database errors into Django's
+    and to log queries like CursorDebugWrapper does when queries are logged.
+    """
+
+    def __init__(self, cursor, db):
+        self.cursor = cursor
+        self.db = db
+
+    def __getattr__(self, attr):
+        return getattr(self.cursor, attr)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def __aiter__(self):
+        return self.cursor.__aiter__()
+
+    async def _execute(self, method, sql, params):
+        start = time.monotonic()
+        try:
+            with self.db.wrap_database_errors:
+                return await method(sql, params)
+        finally:
+            if self.db.queries_logged:
+                duration = time.monotonic() - start
+                self.db.queries_log.append({"sql": str(sql), "time": "%.3f" % duration})
+                logger.debug(
+                    "(%.3f) %s; args=%s; alias=%s",
+                    duration,
+                    sql,
+                    params,
+                    self.db.alias,
+                    extra={
+                        "duration": duration,
+                        "sql": sql,
+                        "params": params,
+                        "alias": self.db.alias,
+                    },
+                )
+
+    async def execute(self, sql, params=None):
+        return await self._execute(self.cursor.execute, sql, params)
+
+    async def executemany(self, sql, param_list):
+        return await self._execute(self.cursor.executemany, sql, param_list)
+
+    async def fetchone(self):
+        with self.db.wrap_database_errors:
+            return await self.cursor.fetchone()
+
+    async def fetchmany(self, size=0):
+        with self.db.wrap_database_errors:
+            return await self.cursor.fetchmany(size)
+
+    async def fetchall(self):
+        with self.db.wrap_database_errors:
+            return await self.cursor.fetchall()
+
+    async def close(self):
+        with self.db.wrap_database_errors:
+            await self.cursor.close()
+
+
+class AsyncTransaction:
+    """
+    Async context manager returned by DatabaseWrapper.atransaction().
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.transaction = None
+
+    async def __aenter__(self):
+        connection = await self.db.aensure_connection()
+        with self.db.wrap_database_errors:
+            self.transaction = connection.transaction()
+            await self.transaction.__aenter__()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        with self.db.wrap_database_errors:
+            return await self.transaction.__aexit__(exc_type, exc_value, traceback)
+
 
 class CursorDebugWrapper(BaseCursorDebugWrapper):
     def copy(self, statement):
         with self.debug_sql(statement):
             return self.cursor.copy(statement)
+
+
+class StatementStatsMixin:
+    """
+    Record the execute and fetch latency of the statements in the
+    StatementHistograms of the connection, keyed by the SQL fingerprint.
+    """
+
+    fingerprint = None
+
+    def _fingerprint(self, stats, sql):
+        if not isinstance(sql, str):
+            # Composed statements.
+            sql = sql.as_string(self.cursor)
+        fingerprint = stats.fingerprints.get(sql)
+        if fingerprint is None:
+            fingerprint = stats.fingerprint(sql)
+        self.fingerprint = fingerprint
+        return fingerprint
+
+    def execute(self, sql, params=None):
+        stats = self.db.statement_stats
+        fingerprint = self._fingerprint(stats, sql)
+        start = time.perf_counter_ns()
+        try:
+            return super().execute(sql, params)
+        finally:
+            stats.record(stats.execute, fingerprint, time.perf_counter_ns() - start)
+
+    def executemany(self, sql, param_list):
+        stats = self.db.statement_stats
+        fingerprint = self._fingerprint(stats, sql)
+        start = time.perf_counter_ns()
+        try:
+            return super().executemany(sql, param_list)
+        finally:
+            stats.record(stats.execute, fingerprint, time.perf_counter_ns() - start)
+
+    def _fetch(self, method, *args):
+        start = time.perf_counter_ns()
+        try:
+            with self.db.wrap_database_errors:
+                return method(*args)
+        finally:
+            if self.fingerprint is not None:
+                stats = self.db.statement_stats
+                duration = time.perf_counter_ns() - start
+                stats.record(stats.fetch, self.fingerprint, duration)
+
+    def fetchone(self):
+        return self._fetch(self.cursor.fetchone)
+
+    def fetchmany(self, *args):
+        return self._fetch(self.cursor.fetchmany, *args)
+
+    def fetchall(self):
+        return self._fetch(self.cursor.fetchall)
+
+
+class StatementStatsCursorWrapper(StatementStatsMixin, CursorWrapper):
+    pass
+
+
+class StatementStatsCursorDebugWrapper(StatementStatsMixin, CursorDebugWrapper):
+    pass
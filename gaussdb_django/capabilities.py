@@ -0,0 +1,258 @@
+"""
+Detection of the server flavour, version and capabilities.
+
+The capabilities are detected once per database and process on the first
+connection, and can be persisted across processes to the JSON file set in
+OPTIONS["capabilities_cache"].
+"""
+import json
+import os
+import re
+from collections import namedtuple
+
+from .gaussdb_any import errors
+
+GAUSSDB_CENTRALIZED = "gaussdb_centralized"
+GAUSSDB_DISTRIBUTED = "gaussdb_distributed"
+OPENGAUSS = "opengauss"
+POSTGRESQL = "postgresql"
+
+_product_version_re = re.compile(
+    r"(?:GaussDB Kernel|openGauss)\s+V?(\d+(?:\.\d+)*)", re.IGNORECASE
+)
+
+# Detected capabilities by server and database, see _cache_key().
+_capabilities = {}
+
+
+class ServerCapabilities(
+    namedtuple(
+        "ServerCapabilities",
+        [
+            "flavour",
+            "version",
+            "server_version_num",
+            "compatibility",
+            "identity_columns",
+        ],
+    )
+):
+    """
+    flavour is one of GAUSSDB_CENTRALIZED, GAUSSDB_DISTRIBUTED, OPENGAUSS or
+    POSTGRESQL and version the product version as a tuple, while
+    server_version_num is the PostgreSQL-compatible version number reported
+    by the server. compatibility is the sql_compatibility mode (A, B, C or
+    PG), or None for servers without compatibility modes.
+    """
+
+    @property
+    def is_gaussdb(self):
+        return self.flavour in (GAUSSDB_CENTRALIZED, GAUSSDB_DISTRIBUTED)
+
+    @property
+    def upsert_syntax(self):
+        if self.flavour == POSTGRESQL:
+            return "on_conflict"
+        return "on_duplicate_key"
+
+    @property
+    def supports_covering_indexes(self):
+        return self.flavour == POSTGRESQL and self.server_version_num >= 110000
+
+
+def _load_cache(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(path, key, capabilities):
+    cache = _load_cache(path)
+    cache[key] = capabilities._asdict()
+    # Write to a temporary file first so that concurrent processes never
+    # read a partially written cache.
+    tmp_path = "%s.%d.tmp" % (path, os.getpid())
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def _cache_key(settings_dict):
+    return "%s:%s/%s" % (
+        settings_dict["HOST"],
+        settings_dict["PORT"],
+        settings_dict["NAME"],
+    )
+
+
+def _from_cache(cached):
+    if set(cached) != set(ServerCapabilities._fields):
+        # Written by another version of the backend.
+        return None
+    return ServerCapabilities(**{**cached, "version": tuple(cached["version"])})
+
+
+_detect_sql = """
+    SELECT
+        version(),
+        current_setting('server_version_num'),
+        (SELECT setting FROM pg_catalog.pg_settings
+         WHERE name = 'sql_compatibility'),
+        EXISTS(
+            SELECT 1
+            FROM pg_catalog.pg_class c
+            JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = 'pg_catalog' AND c.relname = 'pgxc_node'
+        )
+"""
+
+# pgxc_node only exists on GaussDB and openGauss, where distributed instances
+# register their datanodes in it.
+_datanodes_sql = "SELECT count(*) FROM pg_catalog.pgxc_node WHERE node_type = 'D'"
+
+# Run in a savepoint rolled back afterwards, so that the table is never
+# created and a failure doesn't abort the current transaction.
+_identity_probe_sql = """
+    CREATE TEMPORARY TABLE test_identity_support (
+        id integer GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY
+    )
+"""
+
+
+def _build_capabilities(row, datanodes, identity_columns):
+    version_string, version_num, compatibility = row[:3]
+    server_version_num = int(version_num)
+    lowered = version_string.lower()
+    if "opengauss" in lowered:
+        flavour = OPENGAUSS
+    elif "gaussdb" in lowered:
+        flavour = GAUSSDB_DISTRIBUTED if datanodes else GAUSSDB_CENTRALIZED
+    else:
+        flavour = POSTGRESQL
+    match = _product_version_re.search(version_string)
+    if flavour != POSTGRESQL and match:
+        version = tuple(int(part) for part in match[1].split("."))
+    else:
+        major, minor = divmod(server_version_num, 10000)
+        version = (major, minor)
+    return ServerCapabilities(
+        flavour=flavour,
+        version=version,
+        server_version_num=server_version_num,
+        compatibility=compatibility,
+        identity_columns=identity_columns,
+    )
+
+
+def detect_capabilities(connection):
+    """
+    Detect the capabilities of the server of the given gaussdb connection.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(_detect_sql)
+        row = cursor.fetchone()
+        datanodes = 0
+        if row[3]:
+            cursor.execute(_datanodes_sql)
+            datanodes = cursor.fetchone()[0]
+        try:
+            with connection.transaction(force_rollback=True):
+                cursor.execute(_identity_probe_sql)
+        except errors.Error:
+            # A syntax error if identity columns aren't supported.
+            identity_columns = False
+        else:
+            identity_columns = True
+    return _build_capabilities(row, datanodes, identity_columns)
+
+
+async def adetect_capabilities(connection):
+    """
+    Detect the capabilities of the server of the given gaussdb async
+    connection.
+    """
+    async with connection.cursor() as cursor:
+        await cursor.execute(_detect_sql)
+        row = await cursor.fetchone()
+        datanodes = 0
+        if row[3]:
+            await cursor.execute(_datanodes_sql)
+            datanodes = (await cursor.fetchone())[0]
+        try:
+            async with connection.transaction(force_rollback=True):
+                await cursor.execute(_identity_probe_sql)
+        except errors.Error:
+            identity_columns = False
+        else:
+            identity_columns = True
+    return _build_capabilities(row, datanodes, identity_columns)
+
+
+def _cached_capabilities(wrapper):
+    cache_path = wrapper.settings_dict["OPTIONS"].get("capabilities_cache")
+    if cache_path:
+        cached = _load_cache(cache_path).get(_cache_key(wrapper.settings_dict))
+        if cached:
+            return _from_cache(cached)
+    return None
+
+
+def _persist_capabilities(wrapper, capabilities):
+    cache_path = wrapper.settings_dict["OPTIONS"].get("capabilities_cache")
+    if cache_path:
+        _save_cache(cache_path, _cache_key(wrapper.settings_dict), capabilities)
+
+
+def get_capabilities(wrapper):
+    """
+    Return the ServerCapabilities of the given DatabaseWrapper, detecting
+    them on its connection if they aren't cached yet.
+    """
+    key = _cache_key(wrapper.settings_dict)
+    try:
+        return _capabilities[key]
+    except KeyError:
+        pass
+    if wrapper.connection is None:
+        # Capabilities are detected when the connection is initialized.
+        with wrapper.temporary_connection():
+            return get_capabilities(wrapper)
+    capabilities = _cached_capabilities(wrapper)
+    if capabilities is None:
+        capabilities = detect_capabilities(wrapper.connection)
+        _persist_capabilities(wrapper, capabilities)
+    return _capabilities.setdefault(key, capabilities)
+
+
+async def aget_capabilities(wrapper):
+    """
+    Return the ServerCapabilities of the given DatabaseWrapper, detecting
+    them on its async connection if they aren't cached yet.
+    """
+    key = _cache_key(wrapper.settings_dict)
+    try:
+        return _capabilities[key]
+    except KeyError:
+        pass
+    capabilities = _cached_capabilities(wrapper)
+    if capabilities is None:
+        connection = await wrapper.aensure_connection()
+        capabilities = await adetect_capabilities(connection)
+        _persist_capabilities(wrapper, capabilities)
+    return _capabilities.setdefault(key, capabilities)
+
+
+def clear_capabilities(settings_dict=None):
+    """
+    Forget the detected capabilities of the server and database of
+    settings_dict, or of all of them.
+    """
+    if settings_dict is None:
+        _capabilities.clear()
+    else:
+        _capabilities.pop(_cache_key(settings_dict), None)
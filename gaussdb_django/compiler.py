@@ -1,3 +1,8 @@
+import copy
+import datetime
+import zoneinfo
+from itertools import chain
+
 from django.db.models.sql.compiler import (
     SQLAggregateCompiler,
     SQLCompiler,
@@ -6,9 +11,58 @@ from django.db.models.sql.compiler import (
 from django.db.models.sql.compiler import SQLInsertCompiler as BaseSQLInsertCompiler
 from django.db.models.sql.compiler import SQLUpdateCompiler
 from django.db.models.sql.compiler import SQLCompiler as BaseSQLCompiler
+from django.db.models.sql.constants import (
+    GET_ITERATOR_CHUNK_SIZE,
+    MULTI,
+    NO_RESULTS,
+    ROW_COUNT,
+    SINGLE,
+)
+from django.core.exceptions import EmptyResultSet, FullResultSet
 from django.db.models.functions import JSONArray, JSONObject
 from django.db.models import IntegerField, FloatField, Func
+from django.db.models.expressions import RawSQL, Value
+
+from gaussdb import pq
 
+from .gaussdb_any import adapters
+from .sql_cache import (
+    COMPILER_STATE,
+    UNCACHEABLE,
+    CompiledQuery,
+    Uncacheable,
+    query_fingerprint,
+)
+
+# Column types whose binary loaders return the same values as the text ones
+# (jsonb and inet are loaded as strings in text format only).
+BINARY_DB_TYPES = frozenset(
+    [
+        "smallint",
+        "integer",
+        "bigint",
+        "smallserial",
+        "serial",
+        "bigserial",
+        "numeric",
+        "real",
+        "double precision",
+        "boolean",
+        "uuid",
+        "bytea",
+        "date",
+        "time",
+        "timestamp",
+        "timestamp with time zone",
+        "interval",
+        "varchar",
+        "text",
+    ]
+)
+# The pure Python implementation of the driver parses these types faster in
+# text format.
+if pq.__impl__ == "python":
+    BINARY_DB_TYPES -= {"numeric", "uuid"}
 
 __all__ = [
     "SQLAggregateCompiler",
@@ -27,52 +81,458 @@ class InsertUnnest(list):
     """
 
     def __str__(self):
-        return "UNNEST(%s)" % ", ".join(self)
+        # openGauss only provides the single-array form of UNNEST(), arrays
+        # are unnested in lockstep when used side by side in a SELECT list.
+        return ", ".join("UNNEST(%s)" % placeholder for placeholder in self)
 
 
 class SQLInsertCompiler(BaseSQLInsertCompiler):
     def assemble_as_sql(self, fields, value_rows):
-        return super().assemble_as_sql(fields, value_rows)
+        # Specialize bulk-insertion of literal values through UNNEST to
+        # reduce the time spent planning the query and to keep the SQL
+        # identical whatever the number of rows.
+        if (
+            not self.connection.features.supports_bulk_insert_unnest
+            # The optimization is not worth doing if there is a single
+            # row as it will result in the same number of placeholders.
+            or len(value_rows) <= 1
+            # Lack of fields denote the usage of the DEFAULT keyword
+            # for the insertion of empty rows.
+            or any(field is None for field in fields)
+            # Field.get_placeholder takes value as an argument, so the
+            # resulting placeholder might be dependent on the value.
+            # in UNNEST requires a single placeholder to "fit all values" in
+            # the array.
+            or any(hasattr(field, "get_placeholder") for field in fields)
+            # Fields that don't use standard internal types might not be
+            # unnest'able (e.g. array and geometry types are known to be
+            # problematic).
+            or any(
+                (field.target_field if field.is_relation else field).get_internal_type()
+                not in self.connection.data_types
+                for field in fields
+            )
+            # Compilable cannot be combined in an array of literal values.
+            or any(any(hasattr(value, "as_sql") for value in row) for row in value_rows)
+            # ON DUPLICATE KEY UPDATE requires a VALUES list.
+            or (
+                self.query.on_conflict is not None
+                and self.connection.features.upsert_syntax == "on_duplicate_key"
+            )
+        ):
+            return super().assemble_as_sql(fields, value_rows)
+        # Use cast_db_type() as serial types can't be used in casts and
+        # manually remove parameters from the type to ensure no data
+        # truncation takes place (e.g. varchar[] instead of varchar(50)[]).
+        db_types = [
+            field.cast_db_type(self.connection).split("(")[0] for field in fields
+        ]
+        return InsertUnnest(["(%%s)::%s[]" % db_type for db_type in db_types]), [
+            list(map(list, zip(*value_rows)))
+        ]
 
     def as_sql(self):
         return super().as_sql()
 
+    def copy_db_types(self, fields):
+        """
+        Return the type names used to dump the values of fields in binary
+        COPY format, or None if any of the fields can't be copied.
+        """
+        db_types = []
+        for field in fields:
+            if (
+                # Field.get_placeholder() may wrap the value in SQL which
+                # COPY can't evaluate.
+                hasattr(field, "get_placeholder")
+                # Fields that don't use standard internal types might not
+                # have a binary dumper (e.g. array and geometry types).
+                or (
+                    field.target_field if field.is_relation else field
+                ).get_internal_type()
+                not in self.connection.data_types
+            ):
+                return None
+            # cast_db_type() maps serial types to their base integer type and
+            # the parameters are dropped (e.g. varchar(50) -> varchar).
+            db_type = field.cast_db_type(self.connection).split("(")[0]
+            if adapters.types.get(db_type) is None:
+                return None
+            db_types.append(db_type)
+        return db_types
+
+    def can_copy(self, returning_fields):
+        threshold = self.connection.features.copy_bulk_insert_threshold
+        if (
+            threshold is None
+            or len(self.query.objs) < threshold
+            # Conflict handling is only available through INSERT.
+            or self.query.on_conflict is not None
+            # Lack of fields denote the usage of the DEFAULT keyword for the
+            # insertion of empty rows.
+            or not self.query.fields
+        ):
+            return False
+        # COPY can't return rows. Values of returning fields that are part of
+        # the inserted fields (e.g. explicitly set primary keys) are already
+        # known, anything else must be fetched with INSERT ... RETURNING.
+        if returning_fields and any(
+            field not in self.query.fields for field in returning_fields
+        ):
+            return False
+        # Expressions can't be evaluated by COPY.
+        return not any(
+            hasattr(getattr(obj, field.attname), "resolve_expression")
+            for obj in self.query.objs
+            for field in self.query.fields
+        )
+
+    def execute_copy(self, returning_fields=None):
+        """
+        Stream the rows through COPY FROM STDIN in binary format. Return None
+        if the rows can't be copied, leaving the insertion to execute_sql().
+        """
+        fields = self.query.fields
+        db_types = self.copy_db_types(fields)
+        if db_types is None:
+            return None
+        value_rows = [
+            [
+                self.prepare_value(field, self.pre_save_val(field, obj))
+                for field in fields
+            ]
+            for obj in self.query.objs
+        ]
+        if any(hasattr(value, "as_sql") for row in value_rows for value in row):
+            return None
+        # Naive datetimes are interpreted in the connection's time zone by
+        # INSERT, the binary timestamptz dumper requires an explicit one.
+        tz_columns = [
+            index
+            for index, db_type in enumerate(db_types)
+            if db_type == "timestamp with time zone"
+        ]
+        if tz_columns:
+            tzinfo = self.connection.timezone or zoneinfo.ZoneInfo(
+                self.connection.timezone_name
+            )
+            for row in value_rows:
+                for index in tz_columns:
+                    value = row[index]
+                    if isinstance(value, datetime.datetime) and value.tzinfo is None:
+                        row[index] = value.replace(tzinfo=tzinfo)
+        opts = self.query.get_meta()
+        sql = self.connection.ops.copy_from_sql(
+            opts.db_table, [field.column for field in fields], format="binary"
+        )
+        with self.connection.cursor() as cursor:
+            with cursor.copy(sql) as copy:
+                copy.set_types(db_types)
+                for row in value_rows:
+                    copy.write_row(row)
+        if not returning_fields:
+            return []
+        indexes = [fields.index(field) for field in returning_fields]
+        rows = [[row[index] for index in indexes] for row in value_rows]
+        cols = [field.get_col(opts.db_table) for field in returning_fields]
+        converters = self.get_converters(cols)
+        if converters:
+            rows = self.apply_converters(rows, converters)
+        return list(rows)
+
+    def execute_sql(self, returning_fields=None):
+        touched_tables = self.connection.touched_tables
+        if touched_tables is not None:
+            touched_tables.add(self.query.get_meta().db_table)
+        if (
+            self.query.on_conflict is not None
+            and self.connection.features.upsert_syntax == "on_duplicate_key"
+        ):
+            # RETURNING isn't relied on after ON DUPLICATE KEY UPDATE, the
+            # rows it returns can't be matched to the objects (rows left
+            # unchanged by a conflict aren't returned), so the primary keys
+            # of the upserted objects aren't set.
+            returning_fields = None
+        if self.can_copy(returning_fields):
+            rows = self.execute_copy(returning_fields)
+            if rows is not None:
+                return rows
+        return super().execute_sql(returning_fields)
+
 
 class GaussDBSQLCompiler(BaseSQLCompiler):
+    # Results fetched by aexecute_sql() to be returned by the next
+    # execute_sql() call, so that Django's iterables can turn them into
+    # model instances, dicts or tuples.
+    fetched_results = None
+
     def __repr__(self):
         base = super().__repr__()
         return base.replace("GaussDBSQLCompiler", "SQLCompiler")
 
+    def execute_sql(
+        self, result_type=MULTI, chunked_fetch=False, chunk_size=GET_ITERATOR_CHUNK_SIZE
+    ):
+        if self.fetched_results is not None:
+            results, self.fetched_results = self.fetched_results, None
+            return results
+        connection = self.connection
+        if chunked_fetch and connection.features.cursor_itersize:
+            chunk_size = connection.features.cursor_itersize
+        if result_type in (MULTI, SINGLE) and connection.features.uses_binary_results:
+            # SQLCompiler.execute_sql() creates the cursor once as_sql() has
+            # set up the selected columns, create_cursor() then asks
+            # fetches_binary_results().
+            connection.ensure_connection()
+            connection.binary_results_compiler = self
+            try:
+                return super().execute_sql(result_type, chunked_fetch, chunk_size)
+            finally:
+                connection.binary_results_compiler = None
+        return super().execute_sql(result_type, chunked_fetch, chunk_size)
+
+    def fetches_binary_results(self):
+        """
+        Return whether the results of the query can be fetched in binary
+        format: the binary loaders of the types of all the selected columns
+        must return the same values as the text ones.
+        """
+        if not self.select:
+            return False
+        for expression, _, _ in self.select:
+            # Their SQL type depends on the parameters.
+            if isinstance(expression, (RawSQL, Value)):
+                return False
+            db_type = expression.output_field.db_type(self.connection)
+            if db_type is None or db_type.partition("(")[0] not in BINARY_DB_TYPES:
+                return False
+        return True
+
+    def results_iter(
+        self,
+        results=None,
+        tuple_expected=False,
+        chunked_fetch=False,
+        chunk_size=GET_ITERATOR_CHUNK_SIZE,
+    ):
+        """
+        Return an iterator over the results from executing this query,
+        converting the values column by column for each chunk of rows.
+        """
+        if results is None:
+            results = self.execute_sql(
+                MULTI, chunked_fetch=chunked_fetch, chunk_size=chunk_size
+            )
+        col_count = self.col_count
+        fields = [s[0] for s in self.select[:col_count]]
+        converters = self.get_converters(fields)
+        if converters:
+            rows = chain.from_iterable(
+                self.apply_batch_converters(chunk, converters) for chunk in results
+            )
+        else:
+            rows = chain.from_iterable(results)
+        if self.has_composite_fields(fields):
+            rows = self.composite_fields_to_tuples(rows, fields)
+        if tuple_expected:
+            rows = map(tuple, rows)
+        return rows
+
+    def apply_batch_converters(self, rows, converters):
+        """
+        Apply converters to a chunk of rows and return them as lists. The
+        backend converters having a batch counterpart convert a column at
+        once, the others are called for each value.
+        """
+        connection = self.connection
+        batch_converters = connection.ops.batch_converters
+        rows = list(map(list, rows))
+        for pos, (convs, expression) in converters.items():
+            values = [row[pos] for row in rows]
+            for converter in convs:
+                batch_converter = batch_converters.get(converter)
+                if batch_converter is not None:
+                    values = batch_converter(values, expression, connection)
+                else:
+                    values = [
+                        converter(value, expression, connection) for value in values
+                    ]
+            for row, value in zip(rows, values):
+                row[pos] = value
+        return rows
+
+    def as_sql(self, with_limits=True, with_col_aliases=False):
+        cache = self.connection.compiled_sql_cache
+        if cache is None or self.query.subquery:
+            return super().as_sql(with_limits, with_col_aliases)
+        try:
+            key, lookups = query_fingerprint(self.query)
+        except Uncacheable:
+            return super().as_sql(with_limits, with_col_aliases)
+        key = (key, with_limits, with_col_aliases, self.elide_empty)
+        compiled = cache.get(key)
+        if compiled is UNCACHEABLE:
+            return super().as_sql(with_limits, with_col_aliases)
+        if compiled is not None:
+            params = self._lookups_params(lookups, compiled.lookups_sql)
+            if params is not None:
+                for attr, value in compiled.state.items():
+                    setattr(self, attr, value)
+                self.where, self.having, self.qualify = self.query.where, None, None
+                return compiled.sql, params
+            return super().as_sql(with_limits, with_col_aliases)
+        sql, params = super().as_sql(with_limits, with_col_aliases)
+        cache.set(key, self._compiled_query(sql, params, lookups))
+        return sql, params
+
+    def _lookups_params(self, lookups, lookups_sql):
+        # Compile the WHERE lookups of a query of a cached shape. Return their
+        # parameters if they compile to the cached SQL, None otherwise.
+        params = []
+        for lookup, cached_sql in zip(lookups, lookups_sql):
+            try:
+                lookup_sql, lookup_params = self.compile(lookup)
+            except (EmptyResultSet, FullResultSet):
+                return None
+            if lookup_sql != cached_sql:
+                return None
+            params.extend(lookup_params)
+        return tuple(params)
+
+    def _compiled_query(self, sql, params, lookups):
+        # The shape can be cached if its parameters are exactly the ones of
+        # its WHERE lookups.
+        if (
+            self.where is not self.query.where
+            or self.having is not None
+            or self.qualify is not None
+        ):
+            return UNCACHEABLE
+        lookups_sql = []
+        lookups_params = []
+        for lookup in lookups:
+            try:
+                lookup_sql, lookup_params = self.compile(lookup)
+            except (EmptyResultSet, FullResultSet):
+                return UNCACHEABLE
+            lookups_sql.append(lookup_sql)
+            lookups_params.extend(lookup_params)
+        try:
+            where_params = list(self.compile(self.where)[1])
+        except FullResultSet:
+            where_params = []
+        except EmptyResultSet:
+            return UNCACHEABLE
+        # Compare the values wrapped by adapters (e.g. Jsonb) rather than the
+        # wrappers, which are created on each compilation.
+        params, where_params, lookups_params = (
+            [getattr(param, "obj", param) for param in values]
+            for values in (params, where_params, lookups_params)
+        )
+        if not (params == where_params == lookups_params):
+            return UNCACHEABLE
+        return CompiledQuery(
+            sql,
+            lookups_sql,
+            {attr: getattr(self, attr) for attr in COMPILER_STATE},
+        )
+
+    async def aexecute_sql(self, result_type=MULTI):
+        """
+        Async counterpart of execute_sql() running on the async connection.
+        MULTI results are returned as a list holding a single chunk.
+        """
+        result_type = result_type or NO_RESULTS
+        try:
+            sql, params = self.as_sql()
+            if not sql:
+                raise EmptyResultSet
+        except EmptyResultSet:
+            if result_type == MULTI:
+                return []
+            return
+        col_count = self.col_count
+        cursor = await self.connection.acursor()
+        if (
+            result_type in (MULTI, SINGLE)
+            and self.connection.features.uses_binary_results
+            and self.fetches_binary_results()
+        ):
+            self.connection.set_binary_results(cursor.cursor)
+        async with cursor:
+            await cursor.execute(sql, params)
+            if result_type == ROW_COUNT:
+                return cursor.rowcount
+            if result_type == SINGLE:
+                val = await cursor.fetchone()
+                if val:
+                    return val[:col_count]
+                return val
+            if result_type == NO_RESULTS:
+                return
+            rows = await cursor.fetchall()
+        if self.has_extra_select:
+            rows = [row[:col_count] for row in rows]
+        return [rows]
+
+    # Compile handlers by node class, resolved on the first compilation of
+    # a node of the class.
+    _compile_handlers = {}
+    # The expression of the OrderBy being compiled.
+    _ordering_expression = None
+
     def compile(self, node, force_text=False):
-        if isinstance(node, Func):
-            func_name = getattr(node, "function", None)
-            if func_name is None:
-                node.function = "json_build_object"
-        if node.__class__.__name__ == "OrderBy":
-            node.expression.is_ordering = True
-
-        if isinstance(node, JSONArray):
-            return self._compile_json_array(node)
-
-        elif isinstance(node, JSONObject):
-            return self._compile_json_object(node)
-
-        elif node.__class__.__name__ == "KeyTransform":
-            if getattr(node, "function", None) is None:
-                node.function = "json_extract_path_text"
-            return self._compile_key_transform(node, force_text=force_text)
-        elif node.__class__.__name__ == "Cast":
-            return self._compile_cast(node)
-        elif node.__class__.__name__ == "HasKey":
-            return self._compile_has_key(node)
-        elif node.__class__.__name__ == "HasKeys":
-            return self._compile_has_keys(node)
-        elif node.__class__.__name__ == "HasAnyKeys":
-            return self._compile_has_any_keys(node)
+        try:
+            handler = self._compile_handlers[node.__class__]
+        except KeyError:
+            handler = self._compile_handlers.setdefault(
+                node.__class__, self._get_compile_handler(node.__class__)
+            )
+        return handler(self, node, force_text)
+
+    @classmethod
+    def _get_compile_handler(cls, node_class):
+        if issubclass(node_class, JSONArray):
+            return cls._compile_json_array
+        if issubclass(node_class, JSONObject):
+            return cls._compile_json_object
+        handler = {
+            "OrderBy": cls._compile_order_by,
+            "KeyTransform": cls._compile_key_transform,
+            "Cast": cls._compile_cast,
+            "HasKey": cls._compile_has_key,
+            "HasKeys": cls._compile_has_keys,
+            "HasAnyKeys": cls._compile_has_any_keys,
+        }.get(node_class.__name__)
+        if handler is not None:
+            return handler
+        if issubclass(node_class, Func):
+            return cls._compile_func
+        return cls._compile_node
+
+    def _compile_node(self, node, force_text=False):
+        return super().compile(node)
 
+    def _compile_func(self, node, force_text=False):
+        if (
+            node.function is None
+            and "function" not in node.extra
+            and "%(function)s" in node.extra.get("template", node.template)
+        ):
+            # Functions without a name default to json_build_object(). Set it
+            # on a copy as expressions are shared between queries.
+            node = copy.copy(node)
+            node.function = "json_build_object"
         return super().compile(node)
 
-    def _compile_json_array(self, node):
+    def _compile_order_by(self, node, force_text=False):
+        previous, self._ordering_expression = self._ordering_expression, node.expression
+        try:
+            return super().compile(node)
+        finally:
+            self._ordering_expression = previous
+
+    def _compile_json_array(self, node, force_text=False):
         if not getattr(node, "source_expressions", None):
             return "'[]'::json", []
         params = []
@@ -87,7 +547,7 @@ class GaussDBSQLCompiler(BaseSQLCompiler):
         sql = f"json_build_array({', '.join(sql_parts)})"
         return sql, params
 
-    def _compile_json_object(self, node):
+    def _compile_json_object(self, node, force_text=False):
         expressions = getattr(node, "source_expressions", []) or []
         if not expressions:
             return "'{}'::json", []
@@ -153,7 +613,7 @@ class GaussDBSQLCompiler(BaseSQLCompiler):
             lhs_sql, lhs_params = self._compile_json_array(base_lhs)
             current_type = "array"
         elif isinstance(base_lhs, Func):
-            return super().compile(node)
+            return self._compile_func(node)
         else:
             lhs_sql, lhs_params = super().compile(base_lhs)
             current_type = "scalar"
@@ -167,7 +627,7 @@ class GaussDBSQLCompiler(BaseSQLCompiler):
                 if is_last and (
                     force_text
                     or getattr(node, "_function_context", False)
-                    or getattr(node, "is_ordering", False)
+                    or node is self._ordering_expression
                     or isinstance(getattr(node, "output_field", None), numeric_fields)
                 ):
                     cast = (
@@ -194,7 +654,7 @@ class GaussDBSQLCompiler(BaseSQLCompiler):
         if not path and (
             force_text
             or getattr(node, "_function_context", False)
-            or getattr(node, "is_ordering", False)
+            or node is self._ordering_expression
         ):
             sql = f"({sql})::text"
         if getattr(node, "_is_boolean_context", False):
@@ -205,7 +665,7 @@ class GaussDBSQLCompiler(BaseSQLCompiler):
             )
         return sql, lhs_params
 
-    def _compile_cast(self, node):
+    def _compile_cast(self, node, force_text=False):
         try:
             inner_expr = getattr(node, "expression", None)
             if inner_expr is None:
@@ -234,7 +694,7 @@ class GaussDBSQLCompiler(BaseSQLCompiler):
         sql = f"{expr_sql}::{db_type}"
         return sql, expr_params
 
-    def _compile_has_key(self, node):
+    def _compile_has_key(self, node, force_text=False):
         lhs_sql, lhs_params = self.compile(node.lhs)
         params = lhs_params[:]
 
@@ -258,7 +718,7 @@ class GaussDBSQLCompiler(BaseSQLCompiler):
 
         return sql, params
 
-    def _compile_has_keys(self, node):
+    def _compile_has_keys(self, node, force_text=False):
         lhs_sql, lhs_params = self.compile(node.lhs)
         params = lhs_params[:]
 
@@ -280,7 +740,7 @@ class GaussDBSQLCompiler(BaseSQLCompiler):
         sql = f"{lhs_sql} ?& array[{keys_sql}]"
         return sql, params
 
-    def _compile_has_any_keys(self, node):
+    def _compile_has_any_keys(self, node, force_text=False):
         lhs_sql, lhs_params = self.compile(node.lhs)
         params = lhs_params[:]
 
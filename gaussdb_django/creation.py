@@ -1,4 +1,5 @@
 import sys
+import time
 
 from django.core.exceptions import ImproperlyConfigured
 from django.db.backends.base.creation import BaseDatabaseCreation
@@ -7,6 +8,11 @@ from django.db.backends.utils import strip_quotes
 
 
 class DatabaseCreation(BaseDatabaseCreation):
+    # Attempts to clone the test database while other sessions are connected
+    # to it, waiting clone_retry_delay times the attempt number in between.
+    clone_attempts = 10
+    clone_retry_delay = 0.5
+
     def _quote_name(self, name):
         return self.connection.ops.quote_name(name)
 
@@ -54,6 +60,44 @@ class DatabaseCreation(BaseDatabaseCreation):
                 # exists".
                 raise
 
+    def _drain_connections(self, cursor, database_name):
+        """
+        Terminate the other sessions connected to database_name, e.g. left
+        open by the test database setup, which prevent using it as a
+        template.
+        """
+        try:
+            cursor.execute(
+                "SELECT pg_terminate_backend(pid) FROM pg_stat_activity "
+                "WHERE datname = %s AND pid <> pg_backend_pid()",
+                [strip_quotes(database_name)],
+            )
+            cursor.fetchall()
+        except Exception as e:
+            # Requires the privileges of the sessions' roles. The clone is
+            # retried if sessions remain.
+            self.log(
+                "Got an error terminating the sessions of %s: %s" % (database_name, e)
+            )
+
+    def _execute_clone_test_db(self, cursor, parameters, source_database_name):
+        """
+        Create the clone, retrying while the template database is accessed by
+        other sessions.
+        """
+        for attempt in range(1, self.clone_attempts + 1):
+            self._drain_connections(cursor, source_database_name)
+            try:
+                cursor.execute("CREATE DATABASE %(dbname)s %(suffix)s" % parameters)
+                return
+            except Exception as e:
+                if (
+                    not isinstance(e.__cause__, errors.ObjectInUse)
+                    or attempt == self.clone_attempts
+                ):
+                    raise
+            time.sleep(self.clone_retry_delay * attempt)
+
     def _clone_test_db(self, suffix, verbosity, keepdb=False):
         # CREATE DATABASE ... WITH TEMPLATE ... requires closing connections
         # to the template database.
@@ -67,9 +111,17 @@ class DatabaseCreation(BaseDatabaseCreation):
             "suffix": self._get_database_create_suffix(template=source_database_name),
         }
         with self._nodb_cursor() as cursor:
+            if keepdb and self._database_exists(cursor, target_database_name):
+                # Reuse the clone kept by a previous run.
+                return
             try:
-                self._execute_create_test_db(cursor, test_db_params, keepdb)
-            except Exception:
+                self._execute_clone_test_db(
+                    cursor, test_db_params, source_database_name
+                )
+            except Exception as e:
+                if not isinstance(e.__cause__, errors.DuplicateDatabase):
+                    self.log("Got an error cloning the test database: %s" % e)
+                    sys.exit(2)
                 try:
                     if verbosity >= 1:
                         self.log(
@@ -81,7 +133,9 @@ class DatabaseCreation(BaseDatabaseCreation):
                             )
                         )
                     cursor.execute("DROP DATABASE %(dbname)s" % test_db_params)
-                    self._execute_create_test_db(cursor, test_db_params, keepdb)
+                    self._execute_clone_test_db(
+                        cursor, test_db_params, source_database_name
+                    )
                 except Exception as e:
                     self.log("Got an error cloning the test database: %s" % e)
                     sys.exit(2)
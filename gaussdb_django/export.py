@@ -0,0 +1,90 @@
+"""
+Streaming export of querysets through COPY TO STDOUT.
+
+The query compiled by the ORM is wrapped in ``COPY (...) TO STDOUT`` and its
+output is yielded as chunks of bytes, without building model instances:
+
+    response = StreamingHttpResponse(
+        export_copy(Item.objects.values_list("name", "price"), header=True),
+        content_type="text/csv",
+    )
+
+    with open("items.bin", "wb") as f:
+        for chunk in export_copy(Item.objects.all(), format="binary"):
+            f.write(chunk)
+
+The connection of the queryset's database is busy until the generator is
+exhausted or closed.
+"""
+from django.core.exceptions import EmptyResultSet
+from django.db import NotSupportedError, connections
+
+__all__ = ["export_copy"]
+
+COPY_FORMATS = ("csv", "text", "binary")
+
+
+def export_copy(queryset, format="csv", header=False, chunk_size=64 * 1024):
+    """
+    Return a generator of the rows selected by queryset in the given COPY
+    format ("csv", "text" or "binary"), as chunks of about chunk_size bytes.
+    If header is True, the csv output starts with the column names of the
+    query.
+    """
+    if format not in COPY_FORMATS:
+        raise ValueError(
+            "Unsupported COPY format %r, use one of %s."
+            % (format, ", ".join(COPY_FORMATS))
+        )
+    if header and format != "csv":
+        raise ValueError("Only the csv format supports header.")
+    connection = connections[queryset.db]
+    if connection.vendor != "gaussdb":
+        raise NotSupportedError(
+            "export_copy() requires a database using the gaussdb_django backend."
+        )
+    return _export_copy(queryset, connection, format, header, chunk_size)
+
+
+def _export_copy(queryset, connection, format, header, chunk_size):
+    compiler = queryset.query.get_compiler(using=queryset.db)
+    try:
+        sql, params = compiler.as_sql()
+        if not sql:
+            raise EmptyResultSet
+    except EmptyResultSet:
+        return
+    if compiler.has_extra_select:
+        # Leave out the columns only selected for the ordering, keeping the
+        # names of the others for the header.
+        names = [
+            alias or getattr(expression, "target", expression).column
+            for expression, _, alias in compiler.select[: compiler.col_count]
+        ]
+        compiler = queryset.query.get_compiler(using=queryset.db)
+        sql, params = compiler.as_sql(with_col_aliases=True)
+        quote_name = connection.ops.quote_name
+        sql = "SELECT %s FROM (%s) subquery" % (
+            ", ".join(
+                "%s AS %s" % (quote_name(alias), quote_name(name))
+                for (_, _, alias), name in zip(compiler.select, names)
+            ),
+            sql,
+        )
+    # COPY doesn't take parameters.
+    sql = connection.ops.compose_sql(sql, params)
+    options = ["FORMAT %s" % format]
+    if header:
+        options.append("HEADER")
+    sql = "COPY (%s) TO STDOUT WITH (%s)" % (sql, ", ".join(options))
+    buffer = bytearray()
+    with connection.cursor() as cursor:
+        with cursor.copy(sql) as copy:
+            # The server sends a message per row.
+            for data in copy:
+                buffer += data
+                if len(buffer) >= chunk_size:
+                    yield bytes(buffer)
+                    buffer.clear()
+    if buffer:
+        yield bytes(buffer)
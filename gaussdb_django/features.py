@@ -1,7 +1,7 @@
+from django.core.exceptions import ImproperlyConfigured
 from django.db import DataError, InterfaceError
 from django.db.backends.base.features import BaseDatabaseFeatures
 from django.utils.functional import cached_property
-from django.db import connections
 
 
 class DatabaseFeatures(BaseDatabaseFeatures):
@@ -9,6 +9,7 @@ class DatabaseFeatures(BaseDatabaseFeatures):
     allows_group_by_selected_pks = True
     can_return_columns_from_insert = True
     can_return_rows_from_bulk_insert = True
+    supports_bulk_insert_unnest = True
     has_real_datatype = True
     has_native_uuid_field = True
     has_native_duration_field = True
@@ -32,7 +33,7 @@ class DatabaseFeatures(BaseDatabaseFeatures):
     nulls_order_largest = True
     closed_cursor_error_class = InterfaceError
     greatest_least_ignores_nulls = True
-    can_clone_databases = False
+    can_clone_databases = True
     supports_temporal_subtraction = True
     requires_literal_defaults = False
     supports_slicing_ordering_in_compound = True
@@ -68,8 +69,6 @@ class DatabaseFeatures(BaseDatabaseFeatures):
     has_json_operators = True
     json_key_contains_list_matching_requires_list = True
     supports_update_conflicts = True
-    supports_update_conflicts_with_target = True
-    supports_covering_indexes = False
     supports_stored_generated_columns = True
     supports_stored_generated_columns_with_like = False
     supports_virtual_generated_columns = False
@@ -100,7 +99,7 @@ class DatabaseFeatures(BaseDatabaseFeatures):
     supports_admin_deleted_objects = False
     supports_explaining_query_execution = False
     supports_column_check_constraints = False
-    supports_partial_indexes = False
+    supports_partial_indexes = True
     supports_collation_on_charfield = True
     supports_collation_on_textfield = True
     supports_non_deterministic_collations = False
@@ -108,12 +107,9 @@ class DatabaseFeatures(BaseDatabaseFeatures):
     supports_boolean_exists_lhs = False
     supports_jsonfield_check_constraints = False
 
-    # supports_json_field_contains = True
-    @property
+    @cached_property
     def supports_json_field_contains(self):
-        with connections["default"].cursor() as cursor:
-            version_str = cursor.execute("SELECT version()").fetchall()[0][0]
-        return "gaussdb" in version_str
+        return self.connection.capabilities.is_gaussdb
 
     supports_json_field_in_subquery = False
     supports_json_field_filter_clause = False
@@ -223,6 +219,101 @@ class DatabaseFeatures(BaseDatabaseFeatures):
         options = self.connection.settings_dict["OPTIONS"]
         return options.get("server_side_binding") is True
 
+    @cached_property
+    def copy_bulk_insert_threshold(self):
+        # Minimum number of rows for bulk inserts to be streamed through
+        # COPY FROM STDIN, or None if the COPY fast path is disabled.
+        option = self.connection.settings_dict["OPTIONS"].get("copy_bulk_insert")
+        if option is True:
+            return 100
+        if not option:
+            return None
+        return int(option)
+
+    @cached_property
+    def ddl_batch_size(self):
+        # Maximum number of DDL statements sent in one round trip by the
+        # schema editor in atomic migrations, or None if batching is disabled.
+        option = self.connection.settings_dict["OPTIONS"].get("batch_ddl")
+        if option is True:
+            return 100
+        if not option:
+            return None
+        return int(option)
+
+    @cached_property
+    def flushes_touched_tables_only(self):
+        # Track the tables inserted into through the ORM to only truncate
+        # them on flush, see DatabaseOperations.sql_flush().
+        options = self.connection.settings_dict["OPTIONS"]
+        return bool(options.get("flush_touched_tables"))
+
+    @cached_property
+    def uses_binary_results(self):
+        # Fetch the results of queries selecting only columns of types with a
+        # binary loader in binary format. Client-side binding cursors only
+        # fetch text, so this applies to server-side cursors (iterator())
+        # unless server_side_binding is enabled.
+        return bool(self.connection.settings_dict["OPTIONS"].get("binary_results"))
+
+    @cached_property
+    def uses_streaming_cursors(self):
+        # Declare the server-side cursors of iterator() without hold on a
+        # dedicated connection in autocommit mode, see
+        # DatabaseWrapper.create_cursor().
+        options = self.connection.settings_dict["OPTIONS"]
+        return bool(options.get("streaming_cursors"))
+
+    @cached_property
+    def cursor_itersize(self):
+        # Number of rows fetched at once from server-side cursors, or None to
+        # use the chunk_size of iterator().
+        option = self.connection.settings_dict["OPTIONS"].get("cursor_itersize")
+        if not option:
+            return None
+        return int(option)
+
+    @cached_property
+    def prepared_statements_max(self):
+        # Size of the per-connection LRU cache of prepared statements, or None
+        # if prepared statements are disabled.
+        option = self.connection.settings_dict["OPTIONS"].get("prepared_statements")
+        if not option:
+            return None
+        if not self.uses_server_side_binding:
+            raise ImproperlyConfigured(
+                "OPTIONS['prepared_statements'] requires "
+                "OPTIONS['server_side_binding'] = True, client-side binding "
+                "cursors don't prepare statements."
+            )
+        if option is True:
+            return 100
+        return int(option)
+
+    @cached_property
+    def supports_covering_indexes(self):
+        return self.connection.capabilities.supports_covering_indexes
+
+    @cached_property
+    def upsert_syntax(self):
+        # GaussDB and openGauss implement upserts through ON DUPLICATE KEY
+        # UPDATE, other PostgreSQL-compatible servers through ON CONFLICT.
+        syntax = self.connection.settings_dict["OPTIONS"].get("upsert_syntax")
+        if syntax is not None:
+            if syntax not in ("on_conflict", "on_duplicate_key"):
+                raise ImproperlyConfigured(
+                    f"Invalid upsert syntax {syntax!r} specified. Use one of "
+                    f"'on_conflict' or 'on_duplicate_key'."
+                )
+            return syntax
+        return self.connection.capabilities.upsert_syntax
+
+    @cached_property
+    def supports_update_conflicts_with_target(self):
+        # ON DUPLICATE KEY UPDATE doesn't accept a conflict target, reject
+        # unique_fields rather than reacting to any unique constraint.
+        return self.upsert_syntax == "on_conflict"
+
     @cached_property
     def prohibits_null_characters_in_text_exception(self):
         return DataError, "GaussDB text fields cannot contain NUL (0x00) bytes"
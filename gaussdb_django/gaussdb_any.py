@@ -4,7 +4,7 @@ from functools import lru_cache
 try:
     from gaussdb import ClientCursor, IsolationLevel, adapt, adapters, errors, sql
     from gaussdb import types
-    from gaussdb.types.datetime import TimestamptzLoader
+    from gaussdb.types.datetime import TimestamptzBinaryLoader, TimestamptzLoader
     from gaussdb.types.json import Jsonb
     from gaussdb.types.range import Range, RangeDumper
     from gaussdb.types.string import TextLoader
@@ -18,8 +18,7 @@ try:
     TSTZRANGE_OID = "tstzrange"
 
     def mogrify(sql, params, connection):
-        with connection.cursor() as cursor:
-            return ClientCursor(cursor.connection).mogrify(sql, params)
+        return connection.composer.mogrify(sql, params)
 
     # Adapters.
     class BaseTzLoader(TimestamptzLoader):
@@ -34,11 +33,28 @@ try:
             res = super().load(data)
             return res.replace(tzinfo=self.timezone)
 
+    class BaseTzBinaryLoader(TimestamptzBinaryLoader):
+        """
+        Binary counterpart of BaseTzLoader. The value is converted to the
+        session time zone, as in the text format, before its timezone is
+        replaced.
+        """
+
+        timezone = None
+
+        def load(self, data):
+            res = super().load(data)
+            return res.replace(tzinfo=self.timezone)
+
     def register_tzloader(tz, context):
         class SpecificTzLoader(BaseTzLoader):
             timezone = tz
 
+        class SpecificTzBinaryLoader(BaseTzBinaryLoader):
+            timezone = tz
+
         context.adapters.register_loader("timestamptz", SpecificTzLoader)
+        context.adapters.register_loader("timestamptz", SpecificTzBinaryLoader)
 
     class DjangoRangeDumper(RangeDumper):
         """A Range dumper customized for Django."""
@@ -1,5 +1,7 @@
+import copy
 import re
-from collections import namedtuple
+from collections import defaultdict, namedtuple
+from contextlib import contextmanager
 
 from django.db.backends.base.introspection import BaseDatabaseIntrospection
 from django.db.backends.base.introspection import FieldInfo as BaseFieldInfo
@@ -9,6 +11,29 @@ from django.db.models import Index
 FieldInfo = namedtuple("FieldInfo", BaseFieldInfo._fields + ("is_autofield", "comment"))
 TableInfo = namedtuple("TableInfo", BaseTableInfo._fields + ("comment",))
 
+# Keys of DatabaseWrapper.catalog_cache depending on the tables.
+TABLE_CATALOG_KEYS = ("sequence_list", "referencing_tables")
+
+
+class IntrospectionSnapshot:
+    """
+    Catalog of the visible tables of the database, loaded by a few queries
+    on the whole schema and served to the per-table introspection methods.
+    Each part (columns, sequences, relations, constraints) is loaded on first
+    use and forgotten by clear().
+    """
+
+    def __init__(self):
+        self.parts = {}
+
+    def clear(self):
+        self.parts.clear()
+
+    def get(self, name, cursor, load):
+        if name not in self.parts:
+            self.parts[name] = load(cursor)
+        return self.parts[name]
+
 
 class DatabaseIntrospection(BaseDatabaseIntrospection):
     # Maps type codes to Django Field types.
@@ -78,11 +103,81 @@ class DatabaseIntrospection(BaseDatabaseIntrospection):
             if row[0] not in self.ignored_tables
         ]
 
+    # See snapshot().
+    _snapshot = None
+
+    @contextmanager
+    def snapshot(self):
+        """
+        Serve get_table_description(), get_sequences(), get_relations() and
+        get_constraints() from a snapshot of the catalog of all the visible
+        tables, loaded by a single query per method instead of queries per
+        table. The snapshot is reloaded after the DDL run by the schema
+        editor.
+        """
+        if self._snapshot is not None:
+            yield self._snapshot
+            return
+        self._snapshot = IntrospectionSnapshot()
+        try:
+            yield self._snapshot
+        finally:
+            self._snapshot = None
+
+    def clear_table_catalog(self):
+        """
+        Forget what's known about the tables (the active snapshot, the cached
+        sequences and foreign keys), e.g. after DDL.
+        """
+        if self._snapshot is not None:
+            self._snapshot.clear()
+        for key in TABLE_CATALOG_KEYS:
+            self.connection.catalog_cache.pop(key, None)
+
+    def _from_snapshot(self, name, cursor, table_name):
+        """
+        Return the part of the active snapshot about table_name, or None if
+        there's no active snapshot or the table isn't in it.
+        """
+        if self._snapshot is None:
+            return None
+        part = self._snapshot.get(name, cursor, getattr(self, "_load_%s" % name))
+        # Callers may alter the returned list or dict.
+        return copy.copy(part.get(table_name))
+
+    def sequence_list(self):
+        # Unlike the snapshot, the list stays cached by the connection after
+        # the snapshot exits, until clear_table_catalog() (e.g. after DDL).
+        cache = self.connection.catalog_cache
+        if "sequence_list" not in cache:
+            with self.snapshot():
+                cache["sequence_list"] = super().sequence_list()
+        return list(cache["sequence_list"])
+
+    def get_referencing_tables(self):
+        """
+        Return a dictionary of {table_name: set of the tables with a foreign key
+        to it} for the visible tables.
+        """
+        cache = self.connection.catalog_cache
+        if "referencing_tables" not in cache:
+            referencing_tables = defaultdict(set)
+            with self.connection.cursor() as cursor, self.snapshot() as snapshot:
+                relations = snapshot.get("relations", cursor, self._load_relations)
+            for table_name, table_relations in relations.items():
+                for _, other_table in table_relations.values():
+                    referencing_tables[other_table].add(table_name)
+            cache["referencing_tables"] = referencing_tables
+        return cache["referencing_tables"]
+
     def get_table_description(self, cursor, table_name):
         """
         Return a description of the table with the DB-API cursor.description
         interface.
         """
+        description = self._from_snapshot("columns", cursor, table_name)
+        if description is not None:
+            return description
         # Query the pg_catalog tables as cursor.description does not reliably
         # return the nullable property and information_schema.columns does not
         # contain details of materialized views.、
@@ -130,7 +225,64 @@ class DatabaseIntrospection(BaseDatabaseIntrospection):
             for line in cursor.description
         ]
 
+    def _load_columns(self, cursor):
+        # The type of domain columns is reported as their base type in
+        # cursor.description.
+        cursor.execute(
+            """
+            SELECT
+                c.relname,
+                a.attname,
+                CASE WHEN t.typtype = 'd' THEN t.typbasetype ELSE a.atttypid END,
+                CASE WHEN t.typtype = 'd' THEN t.typtypmod ELSE a.atttypmod END,
+                t.typlen,
+                NOT (a.attnotnull OR (t.typtype = 'd' AND t.typnotnull)) AS is_nullable,
+                pg_get_expr(ad.adbin, ad.adrelid) AS column_default,
+                CASE WHEN collname = 'default' THEN NULL ELSE collname END AS collation,
+                CASE
+                    WHEN pg_get_expr(ad.adbin, ad.adrelid) LIKE 'nextval(%'
+                    THEN true
+                    ELSE false
+                END AS is_autofield,
+                col_description(a.attrelid, a.attnum) AS column_comment
+            FROM pg_attribute a
+            LEFT JOIN pg_attrdef ad ON a.attrelid = ad.adrelid AND a.attnum = ad.adnum
+            LEFT JOIN pg_collation co ON a.attcollation = co.oid
+            JOIN pg_type t ON a.atttypid = t.oid
+            JOIN pg_class c ON a.attrelid = c.oid
+            JOIN pg_namespace n ON c.relnamespace = n.oid
+            WHERE c.relkind IN ('f', 'm', 'r', 'v')
+                AND a.attnum > 0
+                AND NOT a.attisdropped
+                AND n.nspname NOT IN ('pg_catalog', 'pg_toast')
+                AND pg_catalog.pg_table_is_visible(c.oid)
+            ORDER BY c.relname, a.attnum
+        """
+        )
+        types = self.connection.connection.adapters.types
+        columns = defaultdict(list)
+        for table_name, name, type_code, fmod, size, *info in cursor.fetchall():
+            # Computed like the attributes of cursor.description.
+            type_info = types.get(type_code)
+            internal_size = size if size >= 0 else None
+            display_size = type_info.get_display_size(fmod) if type_info else None
+            columns[table_name].append(
+                FieldInfo(
+                    name,
+                    type_code,
+                    internal_size if display_size is None else display_size,
+                    internal_size,
+                    type_info.get_precision(fmod) if type_info else None,
+                    type_info.get_scale(fmod) if type_info else None,
+                    *info,
+                )
+            )
+        return columns
+
     def get_sequences(self, cursor, table_name, table_fields=()):
+        sequences = self._from_snapshot("sequences", cursor, table_name)
+        if sequences is not None:
+            return sequences
         cursor.execute(
             """
             SELECT
@@ -156,11 +308,44 @@ class DatabaseIntrospection(BaseDatabaseIntrospection):
             for row in cursor.fetchall()
         ]
 
+    def _load_sequences(self, cursor):
+        cursor.execute(
+            """
+            SELECT
+                tbl.relname,
+                s.relname AS sequence_name,
+                a.attname AS colname
+            FROM
+                pg_class s
+                JOIN pg_depend d ON d.objid = s.oid
+                    AND d.classid = 'pg_class'::regclass
+                    AND d.refclassid = 'pg_class'::regclass
+                JOIN pg_attribute a ON d.refobjid = a.attrelid
+                    AND d.refobjsubid = a.attnum
+                JOIN pg_class tbl ON tbl.oid = d.refobjid
+                    AND pg_catalog.pg_table_is_visible(tbl.oid)
+            WHERE
+                s.relkind = 'S';
+        """
+        )
+        sequences = defaultdict(list)
+        for table_name, name, column in cursor.fetchall():
+            sequences[table_name].append(
+                {"name": name, "table": table_name, "column": column}
+            )
+        # Tables without sequences.
+        for table_name in self._snapshot.get("columns", cursor, self._load_columns):
+            sequences.setdefault(table_name, [])
+        return sequences
+
     def get_relations(self, cursor, table_name):
         """
         Return a dictionary of {field_name: (field_name_other_table, other_table)}
         representing all foreign keys in the given table.
         """
+        relations = self._from_snapshot("relations", cursor, table_name)
+        if relations is not None:
+            return relations
         cursor.execute(
             """
             SELECT a1.attname, c2.relname, a2.attname
@@ -181,6 +366,31 @@ class DatabaseIntrospection(BaseDatabaseIntrospection):
         )
         return {row[0]: (row[2], row[1]) for row in cursor.fetchall()}
 
+    def _load_relations(self, cursor):
+        cursor.execute(
+            """
+            SELECT c1.relname, a1.attname, c2.relname, a2.attname
+            FROM pg_constraint con
+            LEFT JOIN pg_class c1 ON con.conrelid = c1.oid
+            LEFT JOIN pg_class c2 ON con.confrelid = c2.oid
+            LEFT JOIN
+                pg_attribute a1 ON c1.oid = a1.attrelid AND a1.attnum = con.conkey[1]
+            LEFT JOIN
+                pg_attribute a2 ON c2.oid = a2.attrelid AND a2.attnum = con.confkey[1]
+            WHERE
+                con.contype = 'f' AND
+                c1.relnamespace = c2.relnamespace AND
+                pg_catalog.pg_table_is_visible(c1.oid)
+        """
+        )
+        relations = defaultdict(dict)
+        for table_name, column, other_table, other_column in cursor.fetchall():
+            relations[table_name][column] = (other_column, other_table)
+        # Tables without foreign keys.
+        for table_name in self._snapshot.get("columns", cursor, self._load_columns):
+            relations.setdefault(table_name, {})
+        return relations
+
     def parse_indexdef(self, defn: str):
         """
         从 pg_get_indexdef() 解析列名和排序 (ASC/DESC)。
@@ -211,7 +421,9 @@ class DatabaseIntrospection(BaseDatabaseIntrospection):
         one or more columns. Also retrieve the definition of expression-based
         indexes.
         """
-        constraints = {}
+        constraints = self._from_snapshot("constraints", cursor, table_name)
+        if constraints is not None:
+            return constraints
         # Loop over the key table, collecting things as constraints. The column
         # array must return column names in the same order in which they were
         # created.
@@ -239,17 +451,7 @@ class DatabaseIntrospection(BaseDatabaseIntrospection):
         """,
             [table_name],
         )
-        for constraint, columns, kind, used_cols, options in cursor.fetchall():
-            constraints[constraint] = {
-                "columns": columns,
-                "primary_key": kind == "p",
-                "unique": kind in ["p", "u"],
-                "foreign_key": tuple(used_cols.split(".", 1)) if kind == "f" else None,
-                "check": kind == "c",
-                "index": False,
-                "definition": None,
-                "options": options,
-            }
+        key_rows = cursor.fetchall()
         # Now get indexes
         cursor.execute(
             """
@@ -259,7 +461,8 @@ class DatabaseIntrospection(BaseDatabaseIntrospection):
                 i.indisprimary,
                 pg_get_indexdef(i.indexrelid) as definition,
                 c2.reloptions,
-                am.amname
+                am.amname,
+                pg_get_expr(i.indpred, i.indrelid) as condition
             FROM pg_index i
             LEFT JOIN pg_class c ON i.indrelid = c.oid
             LEFT JOIN pg_class c2 ON i.indexrelid = c2.oid
@@ -269,7 +472,30 @@ class DatabaseIntrospection(BaseDatabaseIntrospection):
             """,
             [table_name],
         )
-        for index, unique, primary, definition, options, amname in cursor.fetchall():
+        return self._build_constraints(key_rows, cursor.fetchall())
+
+    def _build_constraints(self, key_rows, index_rows):
+        constraints = {}
+        for constraint, columns, kind, used_cols, options in key_rows:
+            constraints[constraint] = {
+                "columns": columns,
+                "primary_key": kind == "p",
+                "unique": kind in ["p", "u"],
+                "foreign_key": tuple(used_cols.split(".", 1)) if kind == "f" else None,
+                "check": kind == "c",
+                "index": False,
+                "definition": None,
+                "options": options,
+            }
+        for (
+            index,
+            unique,
+            primary,
+            definition,
+            options,
+            amname,
+            condition,
+        ) in index_rows:
             if index not in constraints:
                 columns, orders = self.parse_indexdef(definition)
                 basic_index = (
@@ -288,5 +514,64 @@ class DatabaseIntrospection(BaseDatabaseIntrospection):
                     "type": Index.suffix if basic_index else amname,
                     "definition": definition,
                     "options": options,
+                    # The WHERE clause of partial indexes.
+                    "condition": condition,
                 }
         return constraints
+
+    def _load_constraints(self, cursor):
+        cursor.execute(
+            """
+            SELECT
+                cl.relname,
+                c.conname,
+                array(
+                    SELECT ca.attname
+                    FROM generate_series(1, array_length(c.conkey, 1)) AS arridx
+                    JOIN pg_attribute AS ca
+                        ON ca.attnum = c.conkey[arridx]
+                    WHERE ca.attrelid = c.conrelid
+                    ORDER BY arridx
+                ),
+                c.contype,
+                (SELECT fkc.relname || '.' || fka.attname
+                FROM pg_attribute AS fka
+                JOIN pg_class AS fkc ON fka.attrelid = fkc.oid
+                WHERE fka.attrelid = c.confrelid AND fka.attnum = c.confkey[1]),
+                cl.reloptions
+            FROM pg_constraint AS c
+            JOIN pg_class AS cl ON c.conrelid = cl.oid
+            WHERE pg_catalog.pg_table_is_visible(cl.oid)
+        """
+        )
+        key_rows = defaultdict(list)
+        for table_name, *row in cursor.fetchall():
+            key_rows[table_name].append(row)
+        cursor.execute(
+            """
+            SELECT
+                c.relname,
+                c2.relname as indexname,
+                i.indisunique,
+                i.indisprimary,
+                pg_get_indexdef(i.indexrelid) as definition,
+                c2.reloptions,
+                am.amname,
+                pg_get_expr(i.indpred, i.indrelid) as condition
+            FROM pg_index i
+            LEFT JOIN pg_class c ON i.indrelid = c.oid
+            LEFT JOIN pg_class c2 ON i.indexrelid = c2.oid
+            LEFT JOIN pg_am am ON c2.relam = am.oid
+            WHERE pg_catalog.pg_table_is_visible(c.oid)
+            """
+        )
+        index_rows = defaultdict(list)
+        for table_name, *row in cursor.fetchall():
+            index_rows[table_name].append(row)
+        tables = self._snapshot.get("columns", cursor, self._load_columns)
+        return {
+            table_name: self._build_constraints(
+                key_rows.get(table_name, ()), index_rows.get(table_name, ())
+            )
+            for table_name in {*tables, *key_rows, *index_rows}
+        }
@@ -0,0 +1,344 @@
+import csv
+import json
+import os
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from itertools import chain
+
+from django.apps import apps
+from django.core.exceptions import FieldDoesNotExist
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+FORMATS = ("csv", "jsonl")
+
+
+def _init_worker():
+    # Child processes started with the spawn method don't inherit the app
+    # registry.
+    if not apps.ready:
+        import django
+
+        django.setup()
+
+
+def _csv_records(lines):
+    """
+    Group the lines of a csv file by record, a quoted value can contain
+    line breaks. Quotes inside quoted values are doubled, so a record is
+    complete when it holds an even number of quotes.
+    """
+    record = b""
+    for line in lines:
+        record += line
+        if record.count(b'"') % 2 == 0:
+            yield record
+            record = b""
+    if record:
+        yield record
+
+
+def _copy_chunk(alias, model_label, format, names, delimiter, chunk):
+    """
+    Load a chunk of csv records or JSON lines through COPY FROM STDIN on a
+    connection of this worker and return the number of rows copied.
+    """
+    model = apps.get_model(model_label)
+    connection = connections[alias]
+    fields = [model._meta.get_field(name) for name in names]
+    columns = [field.column for field in fields]
+    try:
+        with connection.cursor() as cursor:
+            if format == "csv":
+                sql = connection.ops.copy_from_sql(
+                    model._meta.db_table, columns, format="csv", delimiter=delimiter
+                )
+                with cursor.copy(sql) as copy:
+                    copy.write(b"".join(chunk))
+            else:
+                sql = connection.ops.copy_from_sql(model._meta.db_table, columns)
+                with cursor.copy(sql) as copy:
+                    for line in chunk:
+                        obj = json.loads(line)
+                        copy.write_row(
+                            [
+                                field.get_db_prep_save(
+                                    field.to_python(
+                                        # Absent keys take the field's default.
+                                        obj[name]
+                                        if name in obj
+                                        else field.get_default()
+                                    ),
+                                    connection,
+                                )
+                                for name, field in zip(names, fields)
+                            ]
+                        )
+            return cursor.rowcount if cursor.rowcount >= 0 else len(chunk)
+    finally:
+        # Return the connection to the pool, if any, between chunks.
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = (
+        "Load csv or JSON lines files into the table of a model through "
+        "COPY FROM STDIN, splitting them into chunks copied in parallel."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "model", help="The model to load the rows into, as app_label.ModelName."
+        )
+        parser.add_argument("files", nargs="+", help="The csv or .jsonl files.")
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help='Nominates a database to load into. Defaults to the "default" '
+            "database.",
+        )
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="Format of the files, guessed from their extension by default.",
+        )
+        parser.add_argument(
+            "--fields",
+            help="Comma-separated names of the fields loaded, in the order of the "
+            "csv columns. Defaults to the csv header or to the keys of the first "
+            "JSON line.",
+        )
+        parser.add_argument(
+            "--no-header",
+            action="store_false",
+            dest="header",
+            help="The csv files don't start with a header (requires --fields).",
+        )
+        parser.add_argument(
+            "--delimiter", default=",", help="The csv delimiter. Defaults to ','."
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=100000,
+            help="Number of rows copied by each COPY statement. Defaults to 100000.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Number of chunks copied in parallel. Defaults to 4.",
+        )
+        parser.add_argument(
+            "--processes",
+            action="store_true",
+            help="Use worker processes instead of threads, e.g. to parse JSON "
+            "lines on several CPUs.",
+        )
+        parser.add_argument(
+            "--rebuild-indexes",
+            action="store_true",
+            help="Drop the non-unique indexes of the table before loading and "
+            "create them again afterward.",
+        )
+        parser.add_argument(
+            "--analyze",
+            action="store_true",
+            help="Run ANALYZE on the table after loading.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            model = apps.get_model(options["model"])
+        except (LookupError, ValueError) as e:
+            raise CommandError(str(e))
+        alias = options["database"]
+        connection = connections[alias]
+        if connection.vendor != "gaussdb":
+            raise CommandError(
+                "gaussdb_copy_import requires a database using the gaussdb_django "
+                "backend."
+            )
+        if options["chunk_size"] <= 0 or options["workers"] <= 0:
+            raise CommandError("--chunk-size and --workers must be positive.")
+        if not options["header"] and not options["fields"]:
+            raise CommandError("--no-header requires --fields.")
+        self.model = model
+        self.options = options
+        self.verbosity = options["verbosity"]
+        table = model._meta.db_table
+
+        dropped = []
+        start = time.monotonic()
+        total = 0
+        try:
+            if options["rebuild_indexes"]:
+                self.drop_indexes(connection, table, dropped)
+            for path in options["files"]:
+                total += self.load_file(alias, path)
+        finally:
+            # Executed even if dropping the indexes or the load failed, not
+            # to leave the table without the indexes dropped so far.
+            elapsed = time.monotonic() - start
+            if dropped:
+                self.create_indexes(connections[alias], dropped)
+        if options["analyze"]:
+            with connections[alias].cursor() as cursor:
+                cursor.execute("ANALYZE %s" % connection.ops.quote_name(table))
+        self.stdout.write(
+            "Loaded %d rows into %s in %.1fs (%d rows/s)."
+            % (total, table, elapsed, total / elapsed if elapsed else total)
+        )
+
+    def get_format(self, path):
+        if self.options["format"]:
+            return self.options["format"]
+        extension = os.path.splitext(path)[1].lower()
+        if extension in (".jsonl", ".ndjson"):
+            return "jsonl"
+        if extension == ".csv":
+            return "csv"
+        raise CommandError("Can't guess the format of %s, use --format." % path)
+
+    def get_names(self, format, first_record):
+        """
+        Return the names of the fields loaded, checking that they're concrete
+        fields of the model.
+        """
+        if self.options["fields"]:
+            names = [name.strip() for name in self.options["fields"].split(",")]
+        elif format == "csv":
+            header = first_record.decode().splitlines()
+            names = next(csv.reader(header, delimiter=self.options["delimiter"]))
+        else:
+            names = list(json.loads(first_record))
+        for name in names:
+            try:
+                field = self.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                raise CommandError(
+                    "%s has no field named %r." % (self.model._meta.label, name)
+                )
+            if not field.concrete or field.generated:
+                raise CommandError("%r isn't a concrete field." % name)
+        return names
+
+    def read_chunks(self, records):
+        chunk_size = self.options["chunk_size"]
+        chunk = []
+        for record in records:
+            chunk.append(record)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def load_file(self, alias, path):
+        format = self.get_format(path)
+        with open(path, "rb") as f:
+            if format == "csv":
+                records = _csv_records(f)
+            else:
+                # Blank lines aren't records, nor counted as rows copied.
+                records = (line for line in f if line.strip())
+            first_record = next(records, None)
+            if first_record is None:
+                return 0
+            names = self.get_names(format, first_record)
+            if format == "jsonl" or not self.options["header"]:
+                # The first record holds data.
+                records = chain([first_record], records)
+            return self.copy_chunks(
+                alias, path, format, names, self.read_chunks(records)
+            )
+
+    def copy_chunks(self, alias, path, format, names, chunks):
+        workers = self.options["workers"]
+        if self.options["processes"]:
+            # The processes open their own connections and pools.
+            connections[alias].close()
+            connections[alias].close_pool()
+            executor = ProcessPoolExecutor(workers, initializer=_init_worker)
+        else:
+            executor = ThreadPoolExecutor(workers)
+        args = (
+            alias,
+            self.model._meta.label,
+            format,
+            names,
+            self.options["delimiter"],
+        )
+        start = time.monotonic()
+        total = 0
+        pending = set()
+        with executor:
+            try:
+                for chunk in chunks:
+                    # Bound the number of chunks held in memory.
+                    if len(pending) >= 2 * workers:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        total += self.collect(done, path, start, total)
+                    pending.add(executor.submit(_copy_chunk, *args, chunk))
+                done, pending = wait(pending)
+                total += self.collect(done, path, start, total)
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
+        return total
+
+    def collect(self, done, path, start, total):
+        rows = 0
+        for future in done:
+            rows += future.result()
+        if self.verbosity >= 2:
+            elapsed = time.monotonic() - start
+            self.stdout.write(
+                "%s: %d rows (%d rows/s)"
+                % (path, total + rows, (total + rows) / elapsed if elapsed else 0)
+            )
+        return rows
+
+    def drop_indexes(self, connection, table, dropped):
+        """
+        Drop the indexes of table which don't enforce a primary key or a
+        uniqueness constraint, appending the (name, definition) of each one to
+        dropped once it's dropped.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT c.relname, pg_get_indexdef(i.indexrelid)
+                FROM pg_index i
+                JOIN pg_class c ON c.oid = i.indexrelid
+                WHERE i.indrelid = %s::regclass
+                    AND NOT i.indisprimary
+                    AND NOT i.indisunique
+                """,
+                [connection.ops.quote_name(table)],
+            )
+            indexes = cursor.fetchall()
+            for name, definition in indexes:
+                cursor.execute("DROP INDEX %s" % connection.ops.quote_name(name))
+                dropped.append((name, definition))
+        if self.verbosity >= 1 and indexes:
+            self.stdout.write(
+                "Dropped indexes %s." % ", ".join(name for name, _ in indexes)
+            )
+
+    def create_indexes(self, connection, indexes):
+        start = time.monotonic()
+        with connection.cursor() as cursor:
+            for _, definition in indexes:
+                cursor.execute(definition)
+        if self.verbosity >= 1:
+            self.stdout.write(
+                "Created %d indexes in %.1fs."
+                % (len(indexes), time.monotonic() - start)
+            )
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from gaussdb_django.monitoring import prometheus_metrics, reset_pool_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Dump the statistics of the gaussdb connection pools of this process "
+        "in the Prometheus text format."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            help="Only dump the pools of this database alias.",
+        )
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Reset the counters after dumping them.",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(prometheus_metrics(options["database"]), ending="")
+        if options["reset"]:
+            reset_pool_stats(options["database"])
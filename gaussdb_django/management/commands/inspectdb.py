@@ -0,0 +1,14 @@
+from django.core.management.commands.inspectdb import Command as InspectDBCommand
+from django.db import connections
+
+
+class Command(InspectDBCommand):
+    def handle_inspection(self, options):
+        connection = connections[options["database"]]
+        if connection.vendor != "gaussdb":
+            yield from super().handle_inspection(options)
+            return
+        # Introspect all the tables with a few catalog queries rather than
+        # queries per table.
+        with connection.introspection.snapshot():
+            yield from super().handle_inspection(options)
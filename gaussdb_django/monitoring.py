@@ -0,0 +1,324 @@
+"""
+Statistics of the connection pools and statements of the gaussdb backend.
+
+The statistics are kept per process: expose prometheus_metrics() from a
+view (or run the gaussdb_pool_metrics management command through
+call_command()) in the processes serving the requests.
+"""
+import re
+import threading
+import weakref
+from bisect import bisect_left
+from collections import Counter, defaultdict
+
+from django.db import connections
+
+# Counters measured by the backend, by (alias, kind) where kind is "sync"
+# or "async". The pools count the requests, waits and errors themselves.
+_pool_counters = defaultdict(Counter)
+_lock = threading.Lock()
+
+# (key, type, help) of the pool statistics.
+POOL_METRICS = [
+    ("pool_min", "gauge", "Minimum number of connections of the pool."),
+    ("pool_max", "gauge", "Maximum number of connections of the pool."),
+    (
+        "pool_size",
+        "gauge",
+        "Number of connections managed by the pool (in use, idle or being "
+        "prepared).",
+    ),
+    ("pool_available", "gauge", "Number of idle connections in the pool."),
+    ("pool_in_use", "gauge", "Number of connections checked out of the pool."),
+    ("requests_waiting", "gauge", "Number of requests waiting for a connection."),
+    ("requests_num", "counter", "Number of connection requests."),
+    (
+        "requests_queued",
+        "counter",
+        "Number of requests queued because no connection was available.",
+    ),
+    (
+        "requests_wait_ms",
+        "counter",
+        "Total time spent by the requests waiting for a connection, in ms.",
+    ),
+    (
+        "requests_errors",
+        "counter",
+        "Number of connection requests failed (timeout or too many requests).",
+    ),
+    ("usage_ms", "counter", "Total time connections were checked out, in ms."),
+    ("returns_bad", "counter", "Number of connections returned in a bad state."),
+    ("connections_num", "counter", "Number of connections opened to the server."),
+    (
+        "connections_ms",
+        "counter",
+        "Total time spent opening connections to the server, in ms.",
+    ),
+    ("connections_errors", "counter", "Number of failed connection attempts."),
+    ("connections_lost", "counter", "Number of connections found broken."),
+    ("checkouts", "counter", "Number of connections checked out by the backend."),
+    ("returns", "counter", "Number of connections returned by the backend."),
+    ("timeouts", "counter", "Number of checkouts that timed out."),
+]
+
+
+def record_pool_event(alias, kind, event):
+    """Count a checkout, return or timeout of a connection of a pool."""
+    with _lock:
+        _pool_counters[alias, kind][event] += 1
+
+
+def _pools(alias=None):
+    """
+    Yield (alias, kind, pool) for the pools of alias, or of all the aliases,
+    created in this process.
+    """
+    for name in connections if alias is None else [alias]:
+        connection = connections[name]
+        if connection.vendor != "gaussdb":
+            continue
+        for kind, pools in (
+            ("sync", connection._connection_pools),
+            ("async", connection._async_connection_pools),
+        ):
+            if name in pools:
+                yield name, kind, pools[name]
+
+
+def get_pool_stats(alias=None):
+    """
+    Return the statistics of the connection pools of alias (or of all the
+    aliases) as a dict {alias: {kind: stats}} where kind is "sync" or
+    "async".
+    """
+    result = {}
+    for name, kind, pool in _pools(alias):
+        stats = pool.get_stats()
+        if pool.closed:
+            # Not opened yet, the size is the number of connections to open.
+            stats["pool_in_use"] = 0
+        else:
+            stats["pool_in_use"] = stats["pool_size"] - stats["pool_available"]
+        with _lock:
+            stats.update(_pool_counters[name, kind])
+        result.setdefault(name, {})[kind] = stats
+    return result
+
+
+def reset_pool_stats(alias=None):
+    """Reset the counters of the pools of alias, or of all the aliases."""
+    for name, kind, pool in _pools(alias):
+        pool.pop_stats()
+        with _lock:
+            _pool_counters.pop((name, kind), None)
+
+
+def _escape_label(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def prometheus_metrics(alias=None):
+    """
+    Return the pool statistics in the Prometheus text exposition format.
+    """
+    stats = get_pool_stats(alias)
+    lines = []
+    for key, metric_type, help_text in POOL_METRICS:
+        name = "gaussdb_django_pool_%s" % key.removeprefix("pool_")
+        if metric_type == "counter":
+            name += "_total"
+        lines.append("# HELP %s %s" % (name, help_text))
+        lines.append("# TYPE %s %s" % (name, metric_type))
+        for pool_alias, pools in stats.items():
+            for kind, values in pools.items():
+                lines.append(
+                    '%s{alias="%s",kind="%s"} %s'
+                    % (name, _escape_label(pool_alias), kind, values.get(key, 0))
+                )
+    return "\n".join(lines) + "\n"
+
+
+# Upper bounds of the latency histogram buckets in nanoseconds, from 16µs to
+# about 67s. Durations above the last bound fall in an overflow bucket.
+LATENCY_BUCKETS = tuple(2**i * 1000 for i in range(4, 27))
+# Key of the statements recorded once max_statements is reached.
+OTHER_STATEMENTS = "<other>"
+
+_literal_re = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_placeholders_re = re.compile(r"%s(?:\s*,\s*%s)+")
+_rows_re = re.compile(r"\(%s(?:, \.\.\.)?\)(?:\s*,\s*\(%s(?:, \.\.\.)?\))+")
+
+# StatementStats by alias.
+_statement_stats = {}
+
+
+def fingerprint_sql(sql):
+    """
+    Normalize sql so that statements differing only by their literals or
+    the number of their placeholders (e.g. IN lists, multi-row inserts)
+    share the same fingerprint.
+    """
+    sql = _literal_re.sub("?", sql)
+    sql = _placeholders_re.sub("%s, ...", sql)
+    return _rows_re.sub("(%s, ...), ...", sql)
+
+
+def _new_histogram():
+    return [0, 0, 0] + [0] * (len(LATENCY_BUCKETS) + 1)
+
+
+def _merge_histograms(histograms, into, max_statements):
+    for fingerprint, histogram in list(histograms.items()):
+        histogram = list(histogram)
+        if fingerprint not in into and len(into) >= max_statements:
+            fingerprint = OTHER_STATEMENTS
+        target = into.setdefault(fingerprint, _new_histogram())
+        target[0] += histogram[0]
+        target[1] += histogram[1]
+        target[2] = max(target[2], histogram[2])
+        for index in range(3, len(target)):
+            target[index] += histogram[index]
+
+
+class StatementHistograms:
+    """
+    Latency histograms recorded by a single connection, keyed by the SQL
+    fingerprint in the execute and fetch dicts. Each histogram is a list
+    holding the count, total and max durations (in nanoseconds) followed by
+    the count of each bucket of LATENCY_BUCKETS and the overflow bucket.
+
+    Django connections are thread-local, so recording doesn't lock.
+    """
+
+    def __init__(self, stats):
+        self.max_statements = stats.max_statements
+        self.fingerprints = stats.fingerprints
+        self.fingerprint = stats.fingerprint
+        self.execute = {}
+        self.fetch = {}
+
+    def record(self, histograms, fingerprint, duration):
+        try:
+            histogram = histograms[fingerprint]
+        except KeyError:
+            if len(histograms) >= self.max_statements:
+                fingerprint = OTHER_STATEMENTS
+            histogram = histograms.setdefault(fingerprint, _new_histogram())
+        histogram[0] += 1
+        histogram[1] += duration
+        if duration > histogram[2]:
+            histogram[2] = duration
+        histogram[3 + bisect_left(LATENCY_BUCKETS, duration)] += 1
+
+    def clear(self):
+        self.execute.clear()
+        self.fetch.clear()
+
+
+class StatementStats:
+    """
+    Latency histograms of the statements executed on an alias, merged from
+    the StatementHistograms of its connections.
+    """
+
+    # Bound of the cache of the fingerprints by SQL string.
+    max_cached_fingerprints = 4096
+
+    def __init__(self, max_statements):
+        self.max_statements = max_statements
+        self.lock = threading.Lock()
+        self.fingerprints = {}
+        self.connections = []
+        # Histograms of the closed connections.
+        self.retired = {"execute": {}, "fetch": {}}
+
+    def fingerprint(self, sql):
+        if len(self.fingerprints) >= self.max_cached_fingerprints:
+            self.fingerprints.clear()
+        fingerprint = self.fingerprints[sql] = fingerprint_sql(sql)
+        return fingerprint
+
+    def connection_histograms(self, connection):
+        """
+        Return the StatementHistograms recording the statements of the given
+        DatabaseWrapper, merged into the retired ones when it's collected.
+        """
+        histograms = StatementHistograms(self)
+        with self.lock:
+            self.connections.append(histograms)
+        weakref.finalize(connection, self._retire, histograms)
+        return histograms
+
+    def _retire(self, histograms):
+        with self.lock:
+            self.connections.remove(histograms)
+            for phase, into in self.retired.items():
+                _merge_histograms(getattr(histograms, phase), into, self.max_statements)
+
+    def snapshot(self):
+        merged = {"execute": {}, "fetch": {}}
+        with self.lock:
+            for phase, into in merged.items():
+                _merge_histograms(self.retired[phase], into, self.max_statements)
+                for histograms in self.connections:
+                    _merge_histograms(
+                        getattr(histograms, phase), into, self.max_statements
+                    )
+        result = {}
+        for phase, by_fingerprint in merged.items():
+            for fingerprint, histogram in by_fingerprint.items():
+                count, total, maximum, *buckets = histogram
+                result.setdefault(fingerprint, {})[phase] = {
+                    "count": count,
+                    "total": total / 1e9,
+                    "max": maximum / 1e9,
+                    # (upper bound in seconds, count), None for the overflow.
+                    "buckets": [
+                        (bound / 1e9 if bound is not None else None, bucket_count)
+                        for bound, bucket_count in zip(
+                            LATENCY_BUCKETS + (None,), buckets
+                        )
+                    ],
+                }
+        return result
+
+    def reset(self):
+        with self.lock:
+            for histograms in self.connections:
+                histograms.clear()
+            for into in self.retired.values():
+                into.clear()
+
+
+def get_statement_recorder(connection, max_statements):
+    """
+    Return the StatementHistograms recording the statements of the given
+    DatabaseWrapper.
+    """
+    with _lock:
+        stats = _statement_stats.get(connection.alias)
+        if stats is None:
+            stats = _statement_stats[connection.alias] = StatementStats(max_statements)
+    return stats.connection_histograms(connection)
+
+
+def get_statement_stats(alias=None):
+    """
+    Return a snapshot of the latency histograms of the statements of alias
+    (or of all the aliases) as a dict {alias: {fingerprint: {phase: stats}}}
+    where phase is "execute" or "fetch" and stats a dict with the count,
+    total and max durations in seconds and the buckets of the histogram.
+    """
+    return {
+        name: stats.snapshot()
+        for name, stats in list(_statement_stats.items())
+        if alias is None or name == alias
+    }
+
+
+def reset_statement_stats(alias=None):
+    """Reset the statement histograms of alias, or of all the aliases."""
+    for name, stats in list(_statement_stats.items()):
+        if alias is None or name == alias:
+            stats.reset()
@@ -14,6 +14,15 @@ from django.db.models.constants import OnConflict
 from django.db.models.functions import Cast
 from django.utils.regex_helper import _lazy_re_compile
 from django.db.models import JSONField, IntegerField
+from django.db.models.expressions import Col
+
+# Column types loaded as int by the driver.
+INTEGER_DB_TYPES = frozenset(
+    ["smallint", "integer", "bigint", "smallserial", "serial", "bigserial"]
+)
+# Number of sequences reset by a SELECT of sequence_reset_by_name_sql(), the
+# target list of a query being limited to 1664 entries.
+SEQUENCE_RESET_BATCH_SIZE = 500
 
 
 @lru_cache
@@ -23,11 +32,47 @@ def get_json_dumps(encoder):
     return partial(json.dumps, cls=encoder)
 
 
+def convert_json_value(value, expression, connection):
+    # JSONField.from_db_value() decodes strings.
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+def convert_json_values(values, expression, connection):
+    dumps = json.dumps
+    return [
+        dumps(value) if isinstance(value, (dict, list)) else value for value in values
+    ]
+
+
+def convert_int_value(value, expression, connection):
+    if value is None or isinstance(value, (list, dict, bytes, bytearray)):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def convert_int_values(values, expression, connection):
+    return [
+        value if value.__class__ is int else convert_int_value(value, None, None)
+        for value in values
+    ]
+
+
 class DatabaseOperations(BaseDatabaseOperations):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
     compiler_module = "gaussdb_django.compiler"
+    # Backend converters and their counterparts converting a list of values,
+    # applied by GaussDBSQLCompiler to each chunk of rows.
+    batch_converters = {
+        convert_json_value: convert_json_values,
+        convert_int_value: convert_int_values,
+    }
     cast_char_field_without_max_length = "varchar"
     explain_prefix = "EXPLAIN"
     explain_options = frozenset(
@@ -154,9 +199,19 @@ class DatabaseOperations(BaseDatabaseOperations):
 
     def bulk_insert_sql(self, fields, placeholder_rows):
         if isinstance(placeholder_rows, InsertUnnest):
-            return f"SELECT * FROM {placeholder_rows}"
+            return f"SELECT {placeholder_rows}"
         return super().bulk_insert_sql(fields, placeholder_rows)
 
+    def copy_from_sql(self, table, columns, format="text", delimiter=None):
+        options = "FORMAT %s" % format
+        if delimiter is not None:
+            options += ", DELIMITER '%s'" % delimiter.replace("'", "''")
+        return "COPY %s (%s) FROM STDIN WITH (%s)" % (
+            self.quote_name(table),
+            ", ".join(map(self.quote_name, columns)),
+            options,
+        )
+
     def fetch_returned_insert_rows(self, cursor):
         """
         Given a cursor object that has just performed an INSERT...RETURNING
@@ -205,8 +260,15 @@ class DatabaseOperations(BaseDatabaseOperations):
     def set_time_zone_sql(self):
         return "SET TIME ZONE %s"
 
+    # Tables truncated by the last statements returned by sql_flush(), see
+    # execute_sql_flush().
+    _pending_flush = None
+
     def sql_flush(self, style, tables, *, reset_sequences=False, allow_cascade=False):
+        if tables and self.connection.features.flushes_touched_tables_only:
+            tables = self._touched_tables_to_flush(tables, allow_cascade)
         if not tables:
+            self._pending_flush = None
             return []
 
         # Perform a single SQL 'TRUNCATE x, y, z...;' statement. It allows us
@@ -226,25 +288,70 @@ class DatabaseOperations(BaseDatabaseOperations):
                 if sequence["table"].upper() in truncated_tables
             ]
             sql.extend(self.sequence_reset_by_name_sql(style, sequences))
+        self._pending_flush = (sql, tables)
         return sql
 
+    def _touched_tables_to_flush(self, tables, allow_cascade):
+        """
+        Return the tables to truncate among tables: all of them on the first
+        flush, then only the tables inserted into since they were flushed.
+        Without CASCADE, the tables with a foreign key to a truncated table
+        must be truncated with it.
+        """
+        touched_tables = self.connection.touched_tables
+        if touched_tables is None:
+            return tables
+        flushed_tables = set(tables)
+        to_flush = touched_tables & flushed_tables
+        if not allow_cascade:
+            referencing_tables = self.connection.introspection.get_referencing_tables()
+            pending = list(to_flush)
+            while pending:
+                for table in referencing_tables.get(pending.pop(), ()):
+                    if table in flushed_tables and table not in to_flush:
+                        to_flush.add(table)
+                        pending.append(table)
+        return [table for table in tables if table in to_flush]
+
+    def execute_sql_flush(self, sql_list):
+        # Send the statements in one round trip.
+        super().execute_sql_flush(["\n".join(sql_list)] if sql_list else [])
+        if not self.connection.features.flushes_touched_tables_only:
+            return
+        pending, self._pending_flush = self._pending_flush, None
+        if pending is None or pending[0] != sql_list:
+            return
+        touched_tables = self.connection.touched_tables
+        if touched_tables is None:
+            # Start tracking the inserted tables, the ones that weren't
+            # truncated may contain rows.
+            touched_tables = set(self.connection.introspection.table_names())
+            self.connection._touched_tables[self.connection.alias] = touched_tables
+        touched_tables.difference_update(pending[1])
+
     def sequence_reset_by_name_sql(self, style, sequences):
-        # 'ALTER SEQUENCE sequence_name RESTART WITH 1;'... style SQL statements
-        # to reset sequence indices
-        sql = []
+        # 'SELECT setval(...), setval(...);' style SQL statements resetting
+        # up to SEQUENCE_RESET_BATCH_SIZE sequences at once.
+        if not sequences:
+            return []
+        setvals = []
         for sequence_info in sequences:
             table_name = sequence_info["table"]
             # 'id' will be the case if it's an m2m using an autogenerated
             # intermediate table (see BaseDatabaseIntrospection.sequence_list).
             column_name = sequence_info["column"] or "id"
-            sql.append(
-                "%s setval(pg_get_serial_sequence('%s','%s'), 1, false);"
+            setvals.append(
+                "setval(pg_get_serial_sequence('%s','%s'), 1, false)"
                 % (
-                    style.SQL_KEYWORD("SELECT"),
                     style.SQL_TABLE(self.quote_name(table_name)),
                     style.SQL_FIELD(column_name),
                 )
             )
+        sql = []
+        while setvals:
+            batch = setvals[:SEQUENCE_RESET_BATCH_SIZE]
+            del setvals[:SEQUENCE_RESET_BATCH_SIZE]
+            sql.append("%s %s;" % (style.SQL_KEYWORD("SELECT"), ", ".join(batch)))
         return sql
 
     def tablespace_sql(self, tablespace, inline=False):
@@ -387,8 +494,26 @@ class DatabaseOperations(BaseDatabaseOperations):
         return prefix
 
     def on_conflict_suffix_sql(self, fields, on_conflict, update_fields, unique_fields):
-        if self.connection.vendor == "gaussdb":
-            return ""
+        if self.connection.features.upsert_syntax == "on_duplicate_key":
+            if on_conflict == OnConflict.IGNORE:
+                return "ON DUPLICATE KEY UPDATE NOTHING"
+            if on_conflict == OnConflict.UPDATE:
+                # ON DUPLICATE KEY doesn't accept a conflict target (hence
+                # unique_fields are rejected, see
+                # supports_update_conflicts_with_target), a violation of any
+                # unique constraint triggers the update.
+                return "ON DUPLICATE KEY UPDATE %s" % ", ".join(
+                    [
+                        f"{field} = EXCLUDED.{field}"
+                        for field in map(self.quote_name, update_fields)
+                    ]
+                )
+            return super().on_conflict_suffix_sql(
+                fields,
+                on_conflict,
+                update_fields,
+                unique_fields,
+            )
         if on_conflict == OnConflict.IGNORE:
             return "ON CONFLICT DO NOTHING"
         if on_conflict == OnConflict.UPDATE:
@@ -426,37 +551,13 @@ class DatabaseOperations(BaseDatabaseOperations):
     def get_db_converters(self, expression):
         converters = super().get_db_converters(expression)
         if isinstance(expression.output_field, JSONField):
-
-            def converter(value, expression, connection):
-                if value is None:
-                    return None
-                if isinstance(value, (dict, list)):
-                    return json.dumps(value)
-
-                if isinstance(value, (str, bytes, bytearray)):
-                    try:
-                        return value
-                    except (TypeError, ValueError):
-                        return value
-
-                try:
-                    return json.loads(value)
-                except (TypeError, ValueError):
-                    return value
-
-            return [converter] + converters
+            return [convert_json_value] + converters
         if isinstance(expression.output_field, IntegerField):
-
-            def int_safe_converter(value, expression, connection):
-                if value is None:
-                    return None
-                if isinstance(value, (list, dict, bytes, bytearray)):
-                    return None
-                try:
-                    return int(value)
-                except (TypeError, ValueError):
-                    return None
-
-            return [int_safe_converter] + converters
-
+            # The driver already loads integer columns as int.
+            if (
+                isinstance(expression, Col)
+                and expression.target.db_type(self.connection) in INTEGER_DB_TYPES
+            ):
+                return converters
+            return [convert_int_value] + converters
         return converters
@@ -1,9 +1,17 @@
+import logging
+import re
+
 from django.db.backends.base.schema import BaseDatabaseSchemaEditor
 from django.db.backends.ddl_references import IndexColumns
 from .gaussdb_any import sql
 from django.db.backends.utils import strip_quotes
 from django.db.models import ForeignKey, OneToOneField, NOT_PROVIDED
 
+logger = logging.getLogger("django.db.backends.schema")
+
+# DDL invalidating the catalog cache of the connection.
+CATALOG_DDL_RE = re.compile(r"^\s*(CREATE|ALTER|DROP)\s+COLLATION\b", re.I)
+
 
 class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
     # Setting all constraints to IMMEDIATE to allow changing data in the same
@@ -39,13 +47,86 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
     )
     sql_delete_procedure = "DROP FUNCTION %(procedure)s(%(param_types)s)"
 
+    def __init__(self, connection, collect_sql=False, atomic=True):
+        super().__init__(connection, collect_sql=collect_sql, atomic=atomic)
+        # Statements are only batched inside the migration transaction, which
+        # rolls them all back if one fails.
+        self.ddl_batch_size = (
+            connection.features.ddl_batch_size
+            if self.atomic_migration and not collect_sql
+            else None
+        )
+        self.ddl_batch = None
+
+    def __enter__(self):
+        super().__enter__()
+        if self.ddl_batch_size:
+            self.ddl_batch = []
+            # Send the pending statements before any other query run on the
+            # connection, e.g. introspection, RunPython or the recording of
+            # the migration, so that it sees the schema changes.
+            self.connection.execute_wrappers.append(self._flush_ddl_wrapper)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.ddl_batch is not None:
+            self.connection.execute_wrappers.remove(self._flush_ddl_wrapper)
+            if exc_type is None:
+                try:
+                    for statement in self.deferred_sql:
+                        self.execute(statement, None)
+                    self.deferred_sql = []
+                    self.flush_ddl()
+                except Exception as e:
+                    # Roll back the migration transaction.
+                    self.ddl_batch = None
+                    self.__exit__(type(e), e, e.__traceback__)
+                    raise
+            self.ddl_batch = None
+        if exc_type is not None:
+            # The rolled back DDL may have changed the cached catalogs.
+            self.connection.catalog_cache.clear()
+        super().__exit__(exc_type, exc_value, traceback)
+
     def execute(self, sql, params=()):
         # Merge the query client-side, as GaussDB won't do it server-side.
-        if params is None:
-            return super().execute(sql, params)
-        sql = self.connection.ops.compose_sql(str(sql), params)
-        # Don't let the superclass touch anything.
-        return super().execute(sql, None)
+        if params is not None:
+            sql = self.connection.ops.compose_sql(str(sql), params)
+            # Don't let the superclass touch anything.
+            params = None
+        sql = str(sql)
+        if CATALOG_DDL_RE.match(sql):
+            self.connection.catalog_cache.clear()
+        if not self.collect_sql:
+            self.connection.introspection.clear_table_catalog()
+        if self.ddl_batch is not None:
+            logger.debug(
+                "%s; (params %r)", sql, params, extra={"params": params, "sql": sql}
+            )
+            self.ddl_batch.append(sql.rstrip().rstrip(";"))
+            if len(self.ddl_batch) >= self.ddl_batch_size:
+                self.flush_ddl()
+            return
+        super().execute(sql, params)
+        # Statements prepared before the DDL may no longer match the schema.
+        self.connection.clear_prepared_statements()
+
+    def flush_ddl(self):
+        """
+        Send the DDL statements batched by execute() in one round trip, as a
+        multi-statement query.
+        """
+        if not self.ddl_batch:
+            return
+        statements, self.ddl_batch = self.ddl_batch, []
+        with self.connection.cursor() as cursor:
+            cursor.execute(";\n".join(statements))
+        self.connection.clear_prepared_statements()
+
+    def _flush_ddl_wrapper(self, execute, sql, params, many, context):
+        if self.ddl_batch:
+            self.flush_ddl()
+        return execute(sql, params, many, context)
 
     sql_add_sequence = "CREATE SEQUENCE %(sequence)s INCREMENT 1 MINVALUE 1 MAXVALUE 9223372036854775807 START 1 NOCYCLE"
     sql_alter_column_default_sequence = "ALTER TABLE %(table)s ALTER COLUMN %(column)s SET DEFAULT nextval('%(sequence)s')"
@@ -395,18 +476,28 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
         )
 
     def _is_collation_deterministic(self, collation_name):
+        cache = self.connection.catalog_cache
+        key = ("collisdeterministic", collation_name)
+        if key not in cache:
+            cache[key] = self._fetch_collation_deterministic(collation_name)
+        return cache[key]
+
+    def _fetch_collation_deterministic(self, collation_name):
+        cache = self.connection.catalog_cache
         with self.connection.cursor() as cursor:
-            cursor.execute(
+            if "has_collisdeterministic" not in cache:
+                cursor.execute(
+                    """
+                    SELECT COUNT(*)
+                    FROM pg_attribute a
+                    JOIN pg_class c ON a.attrelid = c.oid
+                    WHERE c.relname = 'pg_collation'
+                        AND a.attname = 'collisdeterministic'
                 """
-                SELECT COUNT(*)
-                FROM pg_attribute a
-                JOIN pg_class c ON a.attrelid = c.oid
-                WHERE c.relname = 'pg_collation' AND a.attname = 'collisdeterministic'
-            """
-            )
-            has_column = cursor.fetchone()[0] > 0
+                )
+                cache["has_collisdeterministic"] = cursor.fetchone()[0] > 0
 
-            if not has_column:
+            if not cache["has_collisdeterministic"]:
                 return None
 
             cursor.execute(
@@ -0,0 +1,12 @@
+from django.dispatch import Signal
+
+# Sent by the DatabaseWrapper class with the connection (the wrapper), the
+# pool, kind ("sync" or "async") and wait_time (in seconds) arguments when a
+# connection is checked out of a pool.
+pool_checkout = Signal()
+# Sent with the connection, pool and kind arguments when a connection is
+# returned to its pool.
+pool_return = Signal()
+# Sent with the connection, pool, kind and wait_time arguments when no
+# connection could be checked out of a pool in time.
+pool_timeout = Signal()
@@ -0,0 +1,240 @@
+"""
+Cache of the SQL compiled for the queries of a given shape.
+
+Queries are keyed by a structural fingerprint of their Query: everything
+affecting the generated SQL except the values compared by the lookups of
+their WHERE clause. On a hit, only these lookups are compiled again: their
+SQL must match the cached one and their parameters form the parameters of
+the query. Shapes whose parameters don't all come from the WHERE lookups
+are remembered as uncacheable.
+"""
+import threading
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+from django.db.models.expressions import Col
+from django.db.models.lookups import Lookup
+from django.db.models.sql.datastructures import Join
+from django.db.models.sql.query import Query
+from django.db.models.sql.where import WhereNode
+from django.utils import timezone
+from django.utils.hashable import make_hashable
+
+# Compiled SQL, SQL of the WHERE lookups and compiler attributes set by
+# SQLCompiler.as_sql() and used to read the results.
+CompiledQuery = namedtuple("CompiledQuery", ["sql", "lookups_sql", "state"])
+
+# Cache value of the shapes that can't be cached.
+UNCACHEABLE = object()
+
+# SQLCompiler attributes restored on a hit.
+COMPILER_STATE = [
+    "select",
+    "klass_info",
+    "annotation_col_map",
+    "col_count",
+    "has_extra_select",
+]
+
+# Query attributes affecting the generated SQL, besides the joins, the
+# annotations, the ordering and the WHERE clause.
+QUERY_ATTRS = [
+    "model",
+    "alias_cols",
+    "default_cols",
+    "default_ordering",
+    "standard_ordering",
+    "distinct",
+    "distinct_fields",
+    "low_mark",
+    "high_mark",
+    "select_for_update",
+    "select_for_update_nowait",
+    "select_for_update_skip_locked",
+    "select_for_update_of",
+    "select_for_no_key_update",
+    "select_related",
+    "max_depth",
+    "values_select",
+    "selected",
+    "annotation_select_mask",
+    "extra",
+    "extra_select_mask",
+    "extra_tables",
+    "extra_order_by",
+    "deferred_loading",
+]
+
+# CompiledSQLCache by alias.
+_caches = {}
+_lock = threading.Lock()
+
+
+class Uncacheable(Exception):
+    pass
+
+
+def _contains_query(value):
+    if isinstance(value, Query) or hasattr(value, "query"):
+        return True
+    if hasattr(value, "flatten"):
+        return any(
+            isinstance(node, Query) or hasattr(node, "query")
+            for node in value.flatten()
+        )
+    return False
+
+
+def _expression_key(expression):
+    if isinstance(expression, Col):
+        return (Col, expression.alias, expression.target)
+    if not hasattr(expression, "resolve_expression"):
+        return expression
+    if _contains_query(expression):
+        raise Uncacheable
+    try:
+        identity = expression.identity
+    except AttributeError:
+        raise Uncacheable
+    # identity is built from the constructor arguments, the resolved source
+    # expressions tell which joins are used.
+    return (
+        identity,
+        tuple(_expression_key(e) for e in expression.get_source_expressions()),
+    )
+
+
+def _where_key(node, lookups):
+    if isinstance(node, WhereNode):
+        return (
+            node.connector,
+            node.negated,
+            tuple(_where_key(child, lookups) for child in node.children),
+        )
+    if (
+        isinstance(node, Lookup)
+        and not _contains_query(node.lhs)
+        and not _contains_query(node.rhs)
+    ):
+        lookups.append(node)
+        # The compared values are left out, the compared expressions aren't.
+        return (
+            node.__class__,
+            _expression_key(node.lhs),
+            (
+                _expression_key(node.rhs)
+                if hasattr(node.rhs, "resolve_expression")
+                else None
+            ),
+        )
+    raise Uncacheable
+
+
+def query_fingerprint(query):
+    """
+    Return the structural fingerprint of query and the lookups of its WHERE
+    clause. Raise Uncacheable if the query can't be cached.
+    """
+    if (
+        query.combinator
+        or query._filtered_relations
+        or getattr(query, "explain_info", None)
+    ):
+        raise Uncacheable
+    joins = tuple(
+        (
+            alias,
+            join.identity,
+            join.join_type if isinstance(join, Join) else None,
+            join.nullable if isinstance(join, Join) else None,
+            bool(query.alias_refcount.get(alias)),
+        )
+        for alias, join in query.alias_map.items()
+    )
+    lookups = []
+    key = (
+        query.__class__,
+        joins,
+        tuple(_expression_key(col) for col in query.select),
+        tuple(
+            (alias, _expression_key(annotation))
+            for alias, annotation in query.annotations.items()
+        ),
+        tuple(
+            item if isinstance(item, str) else _expression_key(item)
+            for item in query.order_by
+        ),
+        (
+            query.group_by
+            if not isinstance(query.group_by, tuple)
+            else tuple(_expression_key(item) for item in query.group_by)
+        ),
+        make_hashable([getattr(query, attr, None) for attr in QUERY_ATTRS]),
+        _where_key(query.where, lookups),
+        # Datetime functions use the current time zone.
+        settings.USE_TZ,
+        timezone.get_current_timezone_name() if settings.USE_TZ else None,
+    )
+    try:
+        hash(key)
+    except TypeError:
+        raise Uncacheable
+    return key, lookups
+
+
+class CompiledSQLCache:
+    """
+    LRU cache of CompiledQuery, shared by the connections of an alias.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            try:
+                self.entries.move_to_end(key)
+            except KeyError:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return self.entries[key]
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = 0
+
+    def info(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self.entries),
+            "max_size": self.max_size,
+        }
+
+
+def get_compiled_sql_cache(alias, max_size):
+    """Return the CompiledSQLCache of alias, creating it if needed."""
+    with _lock:
+        cache = _caches.get(alias)
+        if cache is None:
+            cache = _caches[alias] = CompiledSQLCache(max_size)
+        return cache
+
+
+def clear_compiled_sql_cache(alias=None):
+    """Clear the compiled SQL cache of alias, or of all the aliases."""
+    for name, cache in list(_caches.items()):
+        if alias is None or name == alias:
+            cache.clear()
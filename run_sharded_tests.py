@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2025, HuaweiCloudDeveloper
+# Licensed under the BSD 3-Clause License.
+# See LICENSE file in the project root for full license information.
+
+"""
+Run the Django test apps of django_test_apps.txt in parallel shards.
+
+Each worker runs the apps of its shard one at a time with runtests.py, against
+its own pair of test databases (the default and other databases of
+gaussdb_settings.py with a per-worker suffix). The shards are balanced with
+the durations recorded by previous runs, which are updated at the end, and the
+results of all the apps are merged into a single report.
+
+    DJANGO_VERSION=stable/5.2.x python run_sharded_tests.py --workers 8
+    python run_sharded_tests.py --workers 4 --skip-setup basic queries -- --keepdb
+"""
+
+import argparse
+import heapq
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+
+DJANGO_TESTS_DIR = os.path.join("django_tests_dir", "django", "tests")
+# Duration assumed for the apps without recorded timings.
+DEFAULT_DURATION = 60.0
+
+SHARD_SETTINGS = """\
+# Generated by run_sharded_tests.py.
+from gaussdb_settings import *  # noqa
+
+for _alias, _database in DATABASES.items():
+    _database["TEST"] = {{
+        **_database.get("TEST", {{}}),
+        "NAME": "test_%s_w{worker}" % _alias,
+    }}
+CACHES["default"]["LOCATION"] = "/tmp/gaussdb_cache_w{worker}"
+LOGGING["handlers"]["file"]["filename"] = "/tmp/django_debug_w{worker}.log"
+"""
+
+RAN_RE = re.compile(r"^Ran (\d+) tests? in ([\d.]+)s", re.M)
+RESULT_RE = re.compile(r"^(OK|FAILED)(?: \((.*)\))?$", re.M)
+
+
+def read_apps(path):
+    with open(path) as f:
+        return [app.strip() for app in f.read().split("\n") if app.strip()]
+
+
+def load_timings(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def balance(apps, timings, workers):
+    """
+    Split apps into shards of about the same recorded duration, assigning the
+    longest apps first to the least loaded shard.
+    """
+    known = [timings[app] for app in apps if app in timings]
+    default = sum(known) / len(known) if known else DEFAULT_DURATION
+    shards = [(0.0, worker, []) for worker in range(workers)]
+    for app in sorted(apps, key=lambda app: timings.get(app, default), reverse=True):
+        duration, worker, shard = heapq.heappop(shards)
+        shard.append(app)
+        heapq.heappush(shards, (duration + timings.get(app, default), worker, shard))
+    return [
+        (worker, shard, duration)
+        for duration, worker, shard in sorted(shards, key=lambda item: item[1])
+        if shard
+    ]
+
+
+def parse_result(output):
+    """Return the counts of the unittest summary of output."""
+    result = {"tests": 0, "failures": 0, "errors": 0, "skipped": 0}
+    if match := RAN_RE.search(output):
+        result["tests"] = int(match[1])
+    if match := RESULT_RE.search(output):
+        for item in (match[2] or "").split(","):
+            name, _, count = item.strip().partition("=")
+            if count:
+                result[name.replace(" ", "_")] = int(count)
+    return result
+
+
+def run_shard(worker, apps, args, results, lock):
+    settings = "gaussdb_settings_w%d" % worker
+    with open(os.path.join(args.tests_dir, settings + ".py"), "w") as f:
+        f.write(SHARD_SETTINGS.format(worker=worker))
+    for app in apps:
+        start = time.monotonic()
+        process = subprocess.run(
+            [
+                sys.executable,
+                os.path.join(args.tests_dir, "runtests.py"),
+                app,
+                "--noinput",
+                "--settings",
+                settings,
+                "--parallel=1",
+                *args.runtests_args,
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            errors="replace",
+        )
+        duration = time.monotonic() - start
+        with open(os.path.join(args.log_dir, app + ".log"), "w") as f:
+            f.write(process.stdout)
+        result = {
+            "worker": worker,
+            "returncode": process.returncode,
+            "duration": round(duration, 2),
+            **parse_result(process.stdout),
+        }
+        with lock:
+            results[app] = result
+            print(
+                "[w%d] %s: %s in %.1fs (%d/%d apps)"
+                % (
+                    worker,
+                    app,
+                    "ok" if process.returncode == 0 else "FAILED",
+                    duration,
+                    len(results),
+                    args.total,
+                ),
+                flush=True,
+            )
+
+
+def report(results):
+    """Print the merged results and return the failed apps."""
+    totals = {
+        name: sum(result.get(name, 0) for result in results.values())
+        for name in ("tests", "failures", "errors", "skipped")
+    }
+    print(
+        "\nRan %(tests)d tests: %(failures)d failures, %(errors)d errors, "
+        "%(skipped)d skipped." % totals
+    )
+    failed = sorted(app for app, result in results.items() if result["returncode"])
+    if failed:
+        print("Failed apps (see their logs):")
+        for app in failed:
+            result = results[app]
+            print(
+                "  %s: exit status %d, %d failures, %d errors"
+                % (
+                    app,
+                    result["returncode"],
+                    result.get("failures", 0),
+                    result.get("errors", 0),
+                )
+            )
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("apps", nargs="*", help="Apps to run, defaults to all.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of shards run in parallel. Defaults to the number of CPUs.",
+    )
+    parser.add_argument("--apps-file", default="django_test_apps.txt")
+    parser.add_argument(
+        "--timings",
+        default="django_test_timings.json",
+        help="JSON file of the durations of the apps, read to balance the "
+        "shards and updated with the durations of this run.",
+    )
+    parser.add_argument("--results", default="django_test_results.json")
+    parser.add_argument("--log-dir", default="django_test_logs")
+    parser.add_argument("--tests-dir", default=DJANGO_TESTS_DIR)
+    parser.add_argument(
+        "--skip-setup",
+        action="store_true",
+        help="Don't install the packages and copy the settings through "
+        "django_test_suite.sh first.",
+    )
+    argv = sys.argv[1:]
+    runtests_args = []
+    if "--" in argv:
+        # Arguments passed to runtests.py.
+        index = argv.index("--")
+        runtests_args = argv[index:][1:]
+        argv = argv[:index]
+    args = parser.parse_args(argv)
+    args.runtests_args = runtests_args
+
+    apps = args.apps or read_apps(args.apps_file)
+    if not apps or args.workers <= 0:
+        exit()
+    if not args.skip_setup:
+        # Runs the setup part of the script, without apps.
+        subprocess.run(
+            ["bash", "./django_test_suite.sh"],
+            env={**os.environ, "DJANGO_TEST_APPS": ""},
+            check=True,
+        )
+    os.makedirs(args.log_dir, exist_ok=True)
+
+    timings = load_timings(args.timings)
+    shards = balance(apps, timings, args.workers)
+    for worker, shard, duration in shards:
+        print("[w%d] %d apps, about %.0fs" % (worker, len(shard), duration))
+
+    start_time = time.time()
+    args.total = len(apps)
+    results = {}
+    lock = threading.Lock()
+    threads = [
+        threading.Thread(target=run_shard, args=(worker, shard, args, results, lock))
+        for worker, shard, _ in shards
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    timings.update({app: result["duration"] for app, result in results.items()})
+    with open(args.timings, "w") as f:
+        json.dump(timings, f, indent=2, sort_keys=True)
+    with open(args.results, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+    failed = report(results)
+
+    elapsed_time = time.time() - start_time
+    print(f"\nTotal elapsed time: {elapsed_time:.2f} seconds")
+    exit(1 if failed or len(results) < len(apps) else 0)
+
+
+if __name__ == "__main__":
+    main()
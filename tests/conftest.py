@@ -0,0 +1,301 @@
+# Copyright (c) 2025, HuaweiCloudDeveloper
+# Licensed under the BSD 3-Clause License.
+# See LICENSE file in the project root for full license information.
+
+"""
+The tests run without a database server: the default connection wraps a
+driver connection that is never opened and whose cursors record the
+statements sent to a FakeServer.
+"""
+
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import django
+import pytest
+from django.conf import settings
+
+# Connection attributes computed from OPTIONS.
+OPTIONS_PROPERTIES = ["compiled_sql_cache"]
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "options(**options): OPTIONS of the default database."
+    )
+    settings.configure(
+        DATABASES={
+            "default": {
+                "ENGINE": "gaussdb_django",
+                "NAME": "test",
+                "HOST": "127.0.0.1",
+                "PORT": 8000,
+                "USER": "test",
+                "PASSWORD": "test",
+                "OPTIONS": {},
+            }
+        },
+        INSTALLED_APPS=["testapp", "gaussdb_django"],
+        USE_TZ=True,
+        TIME_ZONE="UTC",
+    )
+    django.setup()
+
+    from django.db import connection
+
+    from gaussdb_django import capabilities
+
+    # The capabilities of the server assumed by the tests.
+    capabilities._capabilities[
+        capabilities._cache_key(connection.settings_dict)
+    ] = capabilities.ServerCapabilities(
+        flavour=capabilities.GAUSSDB_CENTRALIZED,
+        version=(505, 2, 0),
+        server_version_num=90204,
+        compatibility="A",
+        identity_columns=True,
+    )
+
+
+class FakeCopy:
+    def __init__(self, server, sql):
+        self.server = server
+        self.sql = sql
+        self.types = None
+        self.rows = []
+        self.data = b""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.copies.append(self)
+
+    def set_types(self, types):
+        self.types = types
+
+    def write_row(self, row):
+        self.rows.append(row)
+
+    def write(self, data):
+        self.data += data
+
+    def __iter__(self):
+        return iter(self.server.copy_output)
+
+
+class FakeCursor:
+    def __init__(self, server):
+        self.server = server
+        self.rowcount = -1
+        self.description = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def execute(self, sql, params=None):
+        self.server.execute(sql, params)
+        self.description = self.server.descriptions.get(str(sql))
+
+    def executemany(self, sql, param_list):
+        for params in param_list:
+            self.server.execute(sql, params)
+
+    def fetchone(self):
+        rows = self.fetchall()
+        return rows[0] if rows else None
+
+    def fetchmany(self, size=None):
+        return self.fetchall()
+
+    def fetchall(self):
+        return self.server.results.pop(0) if self.server.results else []
+
+    def copy(self, sql):
+        return FakeCopy(self.server, sql)
+
+    def close(self):
+        pass
+
+
+class FakeAsyncCursor:
+    def __init__(self, server, adapters):
+        self.cursor = FakeCursor(server)
+        self.adapters = adapters
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def execute(self, sql, params=None):
+        self.cursor.execute(sql, params)
+
+    async def executemany(self, sql, param_list):
+        self.cursor.executemany(sql, param_list)
+
+    async def fetchone(self):
+        return self.cursor.fetchone()
+
+    async def fetchmany(self, size=0):
+        return self.cursor.fetchmany(size)
+
+    async def fetchall(self):
+        return self.cursor.fetchall()
+
+    async def close(self):
+        self.cursor.close()
+
+
+class FakeAsyncConnection:
+    """
+    An async driver connection whose cursors send the statements to server,
+    recording the transactions as BEGIN, COMMIT and ROLLBACK statements.
+    """
+
+    def __init__(self, server):
+        from gaussdb.adapt import AdaptersMap
+
+        from gaussdb_django.gaussdb_any import get_adapters_template
+
+        self.server = server
+        self.adapters = AdaptersMap(get_adapters_template(settings.USE_TZ, None))
+        self.info = SimpleNamespace(parameter_status={"TimeZone": "UTC"}.get)
+        self.closed = False
+
+    def cursor(self):
+        from gaussdb.adapt import AdaptersMap
+
+        return FakeAsyncCursor(self.server, AdaptersMap(self.adapters))
+
+    @asynccontextmanager
+    async def transaction(self):
+        self.server.execute("BEGIN", None)
+        try:
+            yield
+        except BaseException:
+            self.server.execute("ROLLBACK", None)
+            raise
+        self.server.execute("COMMIT", None)
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeServer:
+    """
+    Record the statements and COPY operations sent by the connection. The
+    rows fetched after each statement are taken from results, in order, the
+    cursor description from descriptions, by statement, and the data read
+    by COPY TO from copy_output.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.statements = []
+        self.copies = []
+        self.results = []
+        self.descriptions = {}
+        self.copy_output = []
+        self.errors = []
+
+    def fail(self, prefix, *errors):
+        """Raise errors, in order, on the statements starting with prefix."""
+        self.errors.extend((prefix, error) for error in errors)
+
+    def execute(self, sql, params):
+        self.statements.append((sql, params))
+        for index, (prefix, error) in enumerate(self.errors):
+            if sql.startswith(prefix):
+                del self.errors[index]
+                raise error
+
+
+def offline_connection(connection_class=None):
+    """Return a driver connection that is never opened."""
+    import gaussdb
+    from gaussdb import pq
+    from gaussdb.adapt import AdaptersMap
+
+    from gaussdb_django.gaussdb_any import get_adapters_template
+
+    connection_class = connection_class or gaussdb.Connection
+    conn = connection_class(pq.PGconn.connect_start(b"host=/nonexistent"))
+    conn._check_connection_ok = lambda: None
+    conn._adapters = AdaptersMap(get_adapters_template(settings.USE_TZ, None))
+    return conn
+
+
+@pytest.fixture
+def server():
+    from django.db import connection
+
+    server = FakeServer(connection)
+    conn = offline_connection()
+    # Detached at the end of the test, before the teardown of the fixtures it
+    # depends on.
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(connection, "connection", conn)
+        monkeypatch.setattr(connection, "autocommit", True)
+        for name in ("_set_autocommit", "_commit", "_rollback"):
+            monkeypatch.setattr(connection, name, lambda *args: None)
+        monkeypatch.setattr(connection, "_savepoint_allowed", lambda: False)
+        monkeypatch.setattr(
+            connection, "create_cursor", lambda name=None: FakeCursor(server)
+        )
+        yield server
+
+
+@pytest.fixture
+def aserver(monkeypatch):
+    """
+    Return the FakeServer of the async connections opened during the test.
+    Each event loop has its own DatabaseWrapper, connected on first use.
+    """
+    from django.db import connection
+
+    from gaussdb_django.base import DatabaseWrapper
+
+    server = FakeServer(connection)
+
+    async def aget_new_connection(self, conn_params):
+        return FakeAsyncConnection(server)
+
+    monkeypatch.setattr(DatabaseWrapper, "aget_new_connection", aget_new_connection)
+    return server
+
+
+@pytest.fixture(autouse=True)
+def options(request, monkeypatch):
+    """
+    Return a function setting OPTIONS of the default database, the features
+    and connection attributes depending on them being computed again. The
+    options of the options markers are set before the test, those of the test
+    overriding those of its module.
+    """
+    from django.db import DEFAULT_DB_ALIAS, connection, connections
+
+    def set_options(**options):
+        for name, value in options.items():
+            monkeypatch.setitem(connection.settings_dict["OPTIONS"], name, value)
+        clear_options_properties()
+
+    def clear_options_properties():
+        for name in list(vars(connection.features)):
+            if name != "connection":
+                delattr(connection.features, name)
+        # The cached properties are stored on the wrapper, not on the proxy.
+        wrapper = connections[DEFAULT_DB_ALIAS]
+        for name in OPTIONS_PROPERTIES:
+            wrapper.__dict__.pop(name, None)
+
+    # The markers closest to the test are applied last.
+    for marker in reversed(list(request.node.iter_markers("options"))):
+        set_options(**marker.kwargs)
+    yield set_options
+    monkeypatch.undo()
+    clear_options_properties()
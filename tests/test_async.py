@@ -0,0 +1,101 @@
+# Copyright (c) 2025, HuaweiCloudDeveloper
+# Licensed under the BSD 3-Clause License.
+# See LICENSE file in the project root for full license information.
+
+import asyncio
+
+import pytest
+from django.db import IntegrityError, connection
+from testapp.models import Child, Item
+
+from gaussdb_django.aio import abulk_create, acount, afetch
+from gaussdb_django.gaussdb_any import errors
+
+
+def test_acursor(aserver):
+    async def query():
+        cursor = await connection.acursor()
+        async with cursor:
+            await cursor.execute("SELECT %s, %s", [1, "a"])
+            return await cursor.fetchall()
+
+    aserver.results.append([(1, "a")])
+    assert asyncio.run(query()) == [(1, "a")]
+    assert aserver.statements == [("SELECT %s, %s", [1, "a"])]
+
+
+def test_atransaction(aserver):
+    async def insert():
+        async with connection.atransaction():
+            cursor = await connection.acursor()
+            async with cursor:
+                await cursor.execute("INSERT INTO t VALUES (1)")
+
+    asyncio.run(insert())
+    assert [sql for sql, params in aserver.statements] == [
+        "BEGIN",
+        "INSERT INTO t VALUES (1)",
+        "COMMIT",
+    ]
+
+
+def test_atransaction_rollback(aserver):
+    async def insert():
+        async with connection.atransaction():
+            cursor = await connection.acursor()
+            async with cursor:
+                await cursor.execute("INSERT INTO t VALUES (1)")
+            raise ValueError
+
+    with pytest.raises(ValueError):
+        asyncio.run(insert())
+    assert [sql for sql, params in aserver.statements] == [
+        "BEGIN",
+        "INSERT INTO t VALUES (1)",
+        "ROLLBACK",
+    ]
+
+
+def test_database_error(aserver):
+    async def insert():
+        async with connection.atransaction():
+            cursor = await connection.acursor()
+            async with cursor:
+                await cursor.execute("INSERT INTO t VALUES (1)")
+
+    aserver.fail("INSERT", errors.UniqueViolation("duplicate key"))
+    with pytest.raises(IntegrityError) as ctx:
+        asyncio.run(insert())
+    assert isinstance(ctx.value.__cause__, errors.UniqueViolation)
+    assert aserver.statements[-1] == ("ROLLBACK", None)
+
+
+def test_afetch(aserver):
+    aserver.results.append([(1, "a"), (2, "b")])
+    queryset = Item.objects.filter(count__gt=0).values_list("pk", "name")
+    assert asyncio.run(afetch(queryset)) == [(1, "a"), (2, "b")]
+    ((sql, params),) = aserver.statements
+    assert sql == (
+        'SELECT "testapp_item"."id" AS "pk", "testapp_item"."name" AS "name" '
+        'FROM "testapp_item" WHERE "testapp_item"."count" > %s'
+    )
+    assert params == (0,)
+
+
+def test_acount(aserver):
+    aserver.results.append([(3,)])
+    assert asyncio.run(acount(Item.objects.filter(name="a"))) == 3
+    ((sql, params),) = aserver.statements
+    assert sql.startswith("SELECT COUNT(*) FROM (SELECT ")
+
+
+def test_abulk_create(aserver):
+    aserver.results.append([(1,), (2,)])
+    objs = [Child(item_id=1, label="a"), Child(item_id=1, label="b")]
+    asyncio.run(abulk_create(Child, objs))
+    assert [obj.pk for obj in objs] == [1, 2]
+    assert [sql.split(" (")[0] for sql, params in aserver.statements] == [
+        "BEGIN",
+        'INSERT INTO "testapp_child"',
+        "COMMIT",
+    ]
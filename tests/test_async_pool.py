@@ -0,0 +1,93 @@
+# Copyright (c) 2025, HuaweiCloudDeveloper
+# Licensed under the BSD 3-Clause License.
+# See LICENSE file in the project root for full license information.
+
+import asyncio
+
+import pytest
+from conftest import FakeAsyncConnection, FakeServer
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import override_settings
+from gaussdb_pool import AsyncConnectionPool
+
+pytestmark = pytest.mark.options(pool={"min_size": 1, "max_size": 2})
+
+
+@pytest.fixture
+def wrapper(monkeypatch):
+    """The default DatabaseWrapper, with its own pools."""
+    wrapper = connections[DEFAULT_DB_ALIAS]
+    monkeypatch.setattr(wrapper, "_connection_pools", {})
+    monkeypatch.setattr(wrapper, "_async_connection_pools", {})
+    monkeypatch.setattr(wrapper, "_retired_async_pools", [])
+    return wrapper
+
+
+def record_close(monkeypatch, pool, closed):
+    async def close():
+        closed.append(pool)
+
+    monkeypatch.setattr(pool, "close", close)
+
+
+def test_apool(wrapper):
+    pool = wrapper.apool
+    assert isinstance(pool, AsyncConnectionPool)
+    assert wrapper.apool is pool
+    assert (pool.min_size, pool.max_size) == (1, 2)
+    assert pool.kwargs["autocommit"] is True
+    # Opened by the first async connection.
+    assert pool.closed
+
+
+@pytest.mark.options(pool=None)
+def test_no_apool(wrapper):
+    assert wrapper.apool is None
+
+
+def test_apool_persistent_connections(wrapper, monkeypatch):
+    monkeypatch.setitem(wrapper.settings_dict, "CONN_MAX_AGE", 60)
+    with pytest.raises(ImproperlyConfigured, match="persistent connections"):
+        wrapper.apool
+
+
+def test_retired_on_time_zone_change(wrapper, monkeypatch):
+    pool = wrapper.apool
+    with override_settings(TIME_ZONE="Asia/Shanghai"):
+        assert wrapper._retired_async_pools == [pool]
+        assert wrapper.apool is not pool
+    retired = list(wrapper._retired_async_pools)
+    assert len(retired) == 2
+    current = wrapper.apool
+    closed = []
+    for pool in [*retired, current]:
+        record_close(monkeypatch, pool, closed)
+    asyncio.run(wrapper.aclose_pool())
+    assert closed == [current, *reversed(retired)]
+    assert wrapper._retired_async_pools == []
+    assert wrapper._async_connection_pools == {}
+
+
+def test_aclose_pool(wrapper, monkeypatch):
+    closed = []
+    pool = wrapper.apool
+    record_close(monkeypatch, pool, closed)
+    asyncio.run(wrapper.aclose_pool())
+    assert closed == [pool]
+    assert wrapper._async_connection_pools == {}
+    # Nothing to close anymore.
+    asyncio.run(wrapper.aclose_pool())
+    assert wrapper.apool is not pool
+
+
+def test_time_zone_reconfigured(wrapper, monkeypatch):
+    server = FakeServer(wrapper)
+    monkeypatch.setattr(wrapper, "aconnection", FakeAsyncConnection(server))
+    # The connection's time zone is TIME_ZONE when USE_TZ is False.
+    with override_settings(USE_TZ=False, TIME_ZONE="Asia/Shanghai"):
+        assert wrapper._areconfigure_timezone
+        asyncio.run(wrapper.aensure_connection())
+        assert not wrapper._areconfigure_timezone
+    ((sql, params),) = server.statements
+    assert sql.as_string(None) == "SET TIME ZONE 'Asia/Shanghai'"
@@ -0,0 +1,104 @@
+# Copyright (c) 2025, HuaweiCloudDeveloper
+# Licensed under the BSD 3-Clause License.
+# See LICENSE file in the project root for full license information.
+
+import pytest
+from django.db import connection
+
+pytestmark = pytest.mark.options(batch_ddl=2)
+
+
+@pytest.fixture
+def catalog_cache(server, monkeypatch):
+    monkeypatch.setattr(connection, "_catalog_cache", None)
+    cache = connection.catalog_cache
+    cache.update(
+        {
+            "sequence_list": [],
+            "referencing_tables": {},
+            ("collisdeterministic", "nd"): False,
+        }
+    )
+    return cache
+
+
+def test_batch_size(server):
+    with connection.schema_editor() as editor:
+        assert editor.ddl_batch_size == 2
+        editor.execute("CREATE TABLE a (x int);")
+        assert server.statements == []
+        editor.execute("CREATE TABLE b (x int)")
+        assert server.statements == [
+            ("CREATE TABLE a (x int);\nCREATE TABLE b (x int)", None)
+        ]
+        editor.execute("CREATE TABLE c (x int)")
+        assert len(server.statements) == 1
+    # The remaining statements are sent when the editor exits.
+    assert server.statements[1:] == [("CREATE TABLE c (x int)", None)]
+
+
+def test_query_flushes(server):
+    with connection.schema_editor() as editor:
+        editor.execute("CREATE TABLE a (x int)")
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    assert server.statements == [("CREATE TABLE a (x int)", None), ("SELECT 1", None)]
+
+
+def test_error_discards_batch(server):
+    with pytest.raises(ValueError):
+        with connection.schema_editor() as editor:
+            editor.execute("CREATE TABLE a (x int)")
+            editor.execute("CREATE TABLE b (x int)")
+            editor.execute("CREATE TABLE c (x int)")
+            raise ValueError
+    # The last statement isn't executed, the transaction is rolled back.
+    assert server.statements == [
+        ("CREATE TABLE a (x int);\nCREATE TABLE b (x int)", None)
+    ]
+    assert editor.ddl_batch is None
+
+
+@pytest.mark.options(batch_ddl=False)
+def test_disabled(server):
+    with connection.schema_editor() as editor:
+        assert editor.ddl_batch_size is None
+        editor.execute("CREATE TABLE a (x int)")
+        assert server.statements == [("CREATE TABLE a (x int)", None)]
+
+
+def test_not_atomic(server):
+    with connection.schema_editor(atomic=False) as editor:
+        assert editor.ddl_batch_size is None
+
+
+def test_ddl_clears_table_catalog(catalog_cache):
+    with connection.schema_editor() as editor:
+        editor.execute("ALTER TABLE a ADD COLUMN y int")
+        assert catalog_cache == {("collisdeterministic", "nd"): False}
+
+
+@pytest.mark.parametrize(
+    "sql",
+    [
+        "CREATE COLLATION nd (provider = icu, deterministic = false)",
+        "  alter collation nd REFRESH VERSION",
+        "DROP COLLATION nd",
+    ],
+)
+def test_collation_ddl_clears_catalog(catalog_cache, sql):
+    with connection.schema_editor() as editor:
+        editor.execute(sql)
+        assert catalog_cache == {}
+
+
+def test_rollback_clears_catalog(catalog_cache):
+    with pytest.raises(ValueError):
+        with connection.schema_editor():
+            raise ValueError
+    assert catalog_cache == {}
+
+
+def test_clear_table_catalog(catalog_cache):
+    connection.introspection.clear_table_catalog()
+    assert catalog_cache == {("collisdeterministic", "nd"): False}
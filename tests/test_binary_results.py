@@ -0,0 +1,130 @@
+# Copyright (c) 2025, HuaweiCloudDeveloper
+# Licensed under the BSD 3-Clause License.
+# See LICENSE file in the project root for full license information.
+
+import gaussdb
+import pytest
+from conftest import FakeCursor, offline_connection
+from django.db import connection
+from django.db.models import Value
+from django.db.models.functions import Lower
+from gaussdb.pq import Format
+from testapp.models import Item
+
+from gaussdb_django.base import ServerSideCursor
+
+pytestmark = pytest.mark.options(binary_results=True)
+
+
+def compiler(queryset):
+    compiler = queryset.query.get_compiler(connection=connection)
+    compiler.as_sql()
+    return compiler
+
+
+# The querysets are built by the tests, their repr would evaluate them.
+@pytest.mark.parametrize(
+    "queryset",
+    [
+        # numeric is fetched in text format by the pure Python driver.
+        lambda: Item.objects.all().defer("data", "price"),
+        lambda: Item.objects.values_list("id", "name", "body", "created", "count"),
+        lambda: Item.objects.annotate(lower=Lower("name")).values_list("lower"),
+    ],
+)
+def test_fetches_binary_results(queryset):
+    fetches_binary_results = compiler(queryset()).fetches_binary_results()
+    assert fetches_binary_results is True
+
+
+@pytest.mark.parametrize(
+    "queryset",
+    [
+        # The jsonb values are loaded as strings in text format only.
+        lambda: Item.objects.all(),
+        lambda: Item.objects.values_list("data"),
+        # Their SQL type depends on the parameters.
+        lambda: Item.objects.annotate(value=Value(1)).values_list("id", "value"),
+        lambda: Item.objects.extra(select={"one": "1"}).values_list("id", "one"),
+    ],
+)
+def test_fetches_text_results(queryset):
+    fetches_binary_results = compiler(queryset()).fetches_binary_results()
+    assert fetches_binary_results is False
+
+
+def test_set_binary_results():
+    conn = offline_connection()
+    cursor = gaussdb.Cursor(conn)
+    connection.set_binary_results(cursor)
+    assert cursor.format == Format.BINARY
+    # Client-side binding cursors only fetch text results.
+    client_cursor = gaussdb.ClientCursor(conn)
+    connection.set_binary_results(client_cursor)
+    assert client_cursor.format == Format.TEXT
+    # Declared with client-side bindings.
+    server_cursor = ServerSideCursor(conn, name="c")
+    connection.set_binary_results(server_cursor)
+    assert server_cursor.binary_results is True
+
+
+@pytest.fixture
+def cursors(server):
+    """
+    Return the driver cursors created by the queries, with the format set on
+    them by the binary_results_compiler of the connection.
+    """
+    cursors = []
+    # Detached before the server fixture restores create_cursor.
+    monkeypatch = pytest.MonkeyPatch()
+
+    def create_cursor(name=None):
+        cursor = FakeCursor(server)
+        cursor.format = Format.TEXT
+        compiler = connection.binary_results_compiler
+        connection.binary_results_compiler = None
+        if compiler is not None and compiler.fetches_binary_results():
+            cursor.format = Format.BINARY
+        cursors.append(cursor)
+        return cursor
+
+    monkeypatch.setattr(connection, "create_cursor", create_cursor)
+    yield cursors
+    monkeypatch.undo()
+
+
+def test_binary_query(cursors):
+    list(Item.objects.values_list("id", "name"))
+    assert [cursor.format for cursor in cursors] == [Format.BINARY]
+    assert connection.binary_results_compiler is None
+
+
+def test_text_query(cursors):
+    list(Item.objects.values_list("id", "data"))
+    list(Item.objects.annotate(value=Value(1)).values_list("value"))
+    assert [cursor.format for cursor in cursors] == [Format.TEXT, Format.TEXT]
+
+
+def test_no_results(cursors):
+    Item.objects.filter(pk=1).update(name="a")
+    assert [cursor.format for cursor in cursors] == [Format.TEXT]
+
+
+@pytest.mark.options(binary_results=False)
+def test_disabled(cursors):
+    list(Item.objects.values_list("id", "name"))
+    assert [cursor.format for cursor in cursors] == [Format.TEXT]
+
+
+def test_create_cursor(monkeypatch):
+    """The cursor created for a compiler fetches binary results."""
+    monkeypatch.setattr(connection, "connection", offline_connection())
+    monkeypatch.setattr(connection, "binary_results_compiler", None)
+    for queryset, format in [
+        (Item.objects.values_list("id"), Format.BINARY),
+        (Item.objects.values_list("data"), Format.TEXT),
+    ]:
+        connection.binary_results_compiler = compiler(queryset)
+        cursor = connection.create_cursor()
+        assert cursor.format == format
+        assert connection.binary_results_compiler is None
@@ -0,0 +1,77 @@
+# Copyright (c) 2025, HuaweiCloudDeveloper
+# Licensed under the BSD 3-Clause License.
+# See LICENSE file in the project root for full license information.
+
+import datetime
+
+from django.db import connection
+from django.db.models import Value
+from django.db.models.constants import OnConflict
+from django.db.models.sql import InsertQuery
+from testapp.models import Child, Item
+
+
+def insert_sql(model, objs, fields=None, returning_fields=None, **kwargs):
+    if fields is None:
+        fields = [
+            field for field in model._meta.concrete_fields if not field.primary_key
+        ]
+    query = InsertQuery(model, **kwargs)
+    query.insert_values(fields, objs)
+    compiler = query.get_compiler(connection=connection)
+    compiler.returning_fields = returning_fields
+    return compiler.as_sql()
+
+
+def test_unnest():
+    created = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+    objs = [Item(name="n%d" % i, count=i, created=created) for i in range(3)]
+    ((sql, params),) = insert_sql(Item, objs, returning_fields=[Item._meta.pk])
+    assert sql == (
+        'INSERT INTO "testapp_item" ("name", "body", "price", "data", "created", '
+        '"count") SELECT UNNEST((%s)::varchar[]), UNNEST((%s)::text[]), '
+        "UNNEST((%s)::numeric[]), UNNEST((%s)::jsonb[]), "
+        "UNNEST((%s)::timestamp with time zone[]), UNNEST((%s)::integer[]) "
+        'RETURNING "testapp_item"."id"'
+    )
+    # An array of the values of each column.
+    assert len(params) == 6
+    assert params[0] == ["n0", "n1", "n2"]
+    assert params[4] == [created] * 3
+    assert params[5] == [0, 1, 2]
+
+
+def test_unnest_sql_independent_of_batch_size():
+    sql = [
+        insert_sql(Child, [Child(item_id=i, label=str(i)) for i in range(size)])[0][0]
+        for size in (2, 50)
+    ]
+    assert sql[0] == sql[1]
+    assert sql[0] == (
+        'INSERT INTO "testapp_child" ("item_id", "label") '
+        "SELECT UNNEST((%s)::integer[]), UNNEST((%s)::varchar[])"
+    )
+
+
+def test_single_row_uses_values():
+    ((sql, params),) = insert_sql(Child, [Child(item_id=1, label="a")])
+    assert sql == 'INSERT INTO "testapp_child" ("item_id", "label") VALUES (%s, %s)'
+    assert params == (1, "a")
+
+
+def test_expressions_use_values():
+    objs = [Child(item_id=1, label=Value("a")), Child(item_id=2, label="b")]
+    ((sql, params),) = insert_sql(Child, objs)
+    assert "UNNEST" not in sql
+    assert "VALUES" in sql
+
+
+def test_on_duplicate_key_uses_values(options):
+    options(upsert_syntax="on_duplicate_key")
+    objs = [Child(item_id=1, label="a"), Child(item_id=2, label="b")]
+    field = Child._meta.get_field("item")
+    ((sql, params),) = insert_sql(
+        Child, objs, on_conflict=OnConflict.UPDATE, update_fields=[field]
+    )
+    assert "UNNEST" not in sql
+    assert "ON DUPLICATE KEY UPDATE" in sql
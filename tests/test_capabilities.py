@@ -0,0 +1,158 @@
+# Copyright (c) 2025, HuaweiCloudDeveloper
+# Licensed under the BSD 3-Clause License.
+# See LICENSE file in the project root for full license information.
+
+from contextlib import contextmanager
+
+import pytest
+from conftest import FakeCursor, FakeServer
+from django.db import DEFAULT_DB_ALIAS, NotSupportedError, connection, connections
+
+from gaussdb_django import capabilities
+from gaussdb_django.gaussdb_any import errors
+
+
+class FakeConnection:
+    """A driver connection whose cursors send the statements to server."""
+
+    def __init__(self, server):
+        self.server = server
+
+    def cursor(self):
+        return FakeCursor(self.server)
+
+    @contextmanager
+    def transaction(self, force_rollback=False):
+        self.server.execute("SAVEPOINT", None)
+        try:
+            yield
+        finally:
+            self.server.execute("ROLLBACK TO SAVEPOINT", None)
+
+
+@pytest.fixture
+def fake_server():
+    return FakeServer(connection)
+
+
+def detect(server, *results):
+    server.results.extend(results)
+    return capabilities.detect_capabilities(FakeConnection(server))
+
+
+def test_postgresql(fake_server):
+    detected = detect(
+        fake_server, [("PostgreSQL 16.2 on x86_64-pc-linux-gnu", "160002", None, False)]
+    )
+    assert detected == capabilities.ServerCapabilities(
+        flavour=capabilities.POSTGRESQL,
+        version=(16, 2),
+        server_version_num=160002,
+        compatibility=None,
+        identity_columns=True,
+    )
+    assert detected.upsert_syntax == "on_conflict"
+    # pgxc_node isn't queried.
+    assert [sql for sql, params in fake_server.statements] == [
+        capabilities._detect_sql,
+        "SAVEPOINT",
+        capabilities._identity_probe_sql,
+        "ROLLBACK TO SAVEPOINT",
+    ]
+
+
+@pytest.mark.parametrize(
+    "datanodes, flavour",
+    [
+        (0, capabilities.GAUSSDB_CENTRALIZED),
+        (3, capabilities.GAUSSDB_DISTRIBUTED),
+    ],
+)
+def test_gaussdb(fake_server, datanodes, flavour):
+    detected = detect(
+        fake_server,
+        [
+            (
+                "gaussdb (GaussDB Kernel 505.2.0 build 5b2d3a0a) compiled",
+                "90204",
+                "A",
+                True,
+            )
+        ],
+        [(datanodes,)],
+    )
+    assert detected.flavour == flavour
+    assert detected.version == (505, 2, 0)
+    assert detected.server_version_num == 90204
+    assert detected.compatibility == "A"
+    assert detected.upsert_syntax == "on_duplicate_key"
+    assert fake_server.statements[1] == (capabilities._datanodes_sql, None)
+
+
+def test_identity_columns_unsupported(fake_server):
+    fake_server.fail(
+        capabilities._identity_probe_sql,
+        errors.SyntaxError('syntax error at or near "GENERATED"'),
+    )
+    detected = detect(
+        fake_server, [("openGauss 5.0.1 build 33b035fd", "90204", "PG", True)], [(0,)]
+    )
+    assert detected.flavour == capabilities.OPENGAUSS
+    assert detected.version == (5, 0, 1)
+    assert detected.identity_columns is False
+    # The savepoint is rolled back after the failure.
+    assert fake_server.statements[-1] == ("ROLLBACK TO SAVEPOINT", None)
+
+
+def test_cached_by_server(fake_server, monkeypatch):
+    default_key = capabilities._cache_key(connection.settings_dict)
+    monkeypatch.setitem(connection.settings_dict, "HOST", "other")
+    monkeypatch.setattr(connection, "connection", FakeConnection(fake_server))
+    fake_server.results.append(
+        [("PostgreSQL 16.2 on x86_64-pc-linux-gnu", "160002", None, False)]
+    )
+    try:
+        detected = capabilities.get_capabilities(connection)
+        assert capabilities.get_capabilities(connection) is detected
+    finally:
+        capabilities.clear_capabilities(connection.settings_dict)
+    assert detected.flavour == capabilities.POSTGRESQL
+    assert len(fake_server.statements) == 4
+    # The capabilities of the server of the other tests are unchanged.
+    assert (
+        capabilities._capabilities[default_key].flavour
+        == capabilities.GAUSSDB_CENTRALIZED
+    )
+
+
+@pytest.fixture
+def set_server_version(monkeypatch):
+    """Return a function setting the server_version_num of the server."""
+    key = capabilities._cache_key(connection.settings_dict)
+    wrapper = connections[DEFAULT_DB_ALIAS]
+
+    def set_server_version(server_version_num):
+        monkeypatch.setitem(
+            capabilities._capabilities,
+            key,
+            capabilities._capabilities[key]._replace(
+                server_version_num=server_version_num
+            ),
+        )
+        wrapper.__dict__.pop("pg_version", None)
+
+    yield set_server_version
+    wrapper.__dict__.pop("pg_version", None)
+
+
+@pytest.mark.parametrize("server_version_num", [90204, 80000])
+def test_supported_version(set_server_version, server_version_num):
+    set_server_version(server_version_num)
+    assert connection.features.minimum_database_version == (8,)
+    connection.check_database_version_supported()
+
+
+def test_unsupported_version(set_server_version):
+    set_server_version(70400)
+    with pytest.raises(NotSupportedError, match="GaussDB 8 or later is required"):
+        connection.check_database_version_supported()
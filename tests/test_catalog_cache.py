@@ -0,0 +1,76 @@
+# Copyright (c) 2025, HuaweiCloudDeveloper
+# Licensed under the BSD 3-Clause License.
+# See LICENSE file in the project root for full license information.
+
+import pytest
+from django.db import connection
+from django.db.models import CharField
+from testapp.models import Item
+
+
+@pytest.fixture
+def catalog_cache(server, monkeypatch):
+    monkeypatch.setattr(connection, "_catalog_cache", None)
+    return connection.catalog_cache
+
+
+def collation_queries(server):
+    return [
+        params
+        for sql, params in server.statements
+        if "FROM pg_collation WHERE collname" in sql
+    ]
+
+
+def test_queried_once_per_collation(server, catalog_cache):
+    server.results = [[(1,)], [(False,)], [(True,)]]
+    with connection.schema_editor() as editor:
+        assert editor._is_collation_deterministic("nd") is False
+        assert editor._is_collation_deterministic("nd") is False
+        assert editor._is_collation_deterministic("C") is True
+        assert editor._is_collation_deterministic("C") is True
+    # The pg_collation column is looked up once.
+    assert len(server.statements) == 3
+    assert collation_queries(server) == [["nd"], ["C"]]
+    assert catalog_cache == {
+        "has_collisdeterministic": True,
+        ("collisdeterministic", "nd"): False,
+        ("collisdeterministic", "C"): True,
+    }
+
+
+def test_no_collisdeterministic(server, catalog_cache):
+    server.results = [[(0,)]]
+    with connection.schema_editor() as editor:
+        assert editor._is_collation_deterministic("nd") is None
+        assert editor._is_collation_deterministic("C") is None
+    assert len(server.statements) == 1
+    assert collation_queries(server) == []
+
+
+def test_shared_by_schema_editors(server, catalog_cache):
+    server.results = [[(1,)], [(False,)]]
+    field = CharField(max_length=10, db_collation="nd", db_index=True)
+    field.set_attributes_from_name("code")
+    field.model = Item
+    for _ in range(2):
+        with connection.schema_editor() as editor:
+            assert editor._create_like_index_sql(Item, field) is None
+    assert collation_queries(server) == [["nd"]]
+
+
+def test_ddl_clears_cache(server, catalog_cache):
+    server.results = [[(1,)], [(False,)], [(1,)], [(True,)]]
+    with connection.schema_editor() as editor:
+        assert editor._is_collation_deterministic("nd") is False
+        editor.execute('ALTER COLLATION "nd" REFRESH VERSION')
+        assert catalog_cache == {}
+        # The collation may have been redefined.
+        assert editor._is_collation_deterministic("nd") is True
+    assert collation_queries(server) == [["nd"], ["nd"]]
+
+
+def test_close_clears_cache(server, catalog_cache):
+    catalog_cache[("collisdeterministic", "nd")] = False
+    connection._close()
+    assert connection.catalog_cache == {}
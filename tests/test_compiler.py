@@ -0,0 +1,172 @@
+# Copyright (c) 2025, HuaweiCloudDeveloper
+# Licensed under the BSD 3-Clause License.
+# See LICENSE file in the project root for full license information.
+
+import pytest
+from django.db import connection
+from django.db.models import CharField, F, Func, IntegerField, Value
+from django.db.models.fields.json import KeyTransform
+from django.db.models.functions import Cast, JSONArray, JSONObject, Lower, Upper
+from testapp.models import Item
+
+OBJECT = 'json_build_object(\'a\', "testapp_item"."name")'
+
+
+def as_sql(queryset):
+    """
+    Return the SQL of the queryset returned by the queryset function. The
+    querysets aren't held by variables, their repr in the tracebacks would
+    evaluate them.
+    """
+    return queryset().query.get_compiler(connection=connection).as_sql()
+
+
+def with_object():
+    return Item.objects.annotate(j=JSONObject(a="name")).values_list("id")
+
+
+@pytest.mark.parametrize(
+    "queryset, sql, params",
+    [
+        (
+            lambda: Item.objects.annotate(
+                j=JSONObject(a="name", b="count")
+            ).values_list("j"),
+            "SELECT json_build_object('a', \"testapp_item\".\"name\", 'b', "
+            '"testapp_item"."count") AS "j" FROM "testapp_item"',
+            (),
+        ),
+        (
+            lambda: Item.objects.annotate(j=JSONObject()).values_list("j"),
+            'SELECT \'{}\'::json AS "j" FROM "testapp_item"',
+            (),
+        ),
+        (
+            lambda: Item.objects.annotate(j=JSONArray("name", "count")).values_list(
+                "j"
+            ),
+            'SELECT json_build_array("testapp_item"."name", "testapp_item"."count") '
+            'AS "j" FROM "testapp_item"',
+            (),
+        ),
+        (
+            lambda: Item.objects.annotate(j=JSONArray()).values_list("j"),
+            'SELECT \'[]\'::json AS "j" FROM "testapp_item"',
+            (),
+        ),
+        (
+            lambda: Item.objects.annotate(c=Cast("count", CharField())).values_list(
+                "c"
+            ),
+            'SELECT "testapp_item"."count"::varchar AS "c" FROM "testapp_item"',
+            (),
+        ),
+        (
+            lambda: Item.objects.filter(data__has_key="a").values_list("id"),
+            'SELECT "testapp_item"."id" AS "id" FROM "testapp_item" '
+            'WHERE "testapp_item"."data" ? %s',
+            ("a",),
+        ),
+        (
+            lambda: Item.objects.filter(data__has_keys=["a", "b"]).values_list("id"),
+            'SELECT "testapp_item"."id" AS "id" FROM "testapp_item" '
+            'WHERE "testapp_item"."data" ?& array[%s, %s]',
+            ("a", "b"),
+        ),
+        (
+            lambda: Item.objects.filter(data__has_any_keys=["a", "b"]).values_list(
+                "id"
+            ),
+            'SELECT "testapp_item"."id" AS "id" FROM "testapp_item" '
+            'WHERE "testapp_item"."data" ?| array[%s, %s]',
+            ("a", "b"),
+        ),
+        (
+            lambda: with_object().annotate(k=KeyTransform("a", "j")).values_list("k"),
+            f'SELECT {OBJECT}->\'a\' AS "k" FROM "testapp_item"',
+            (),
+        ),
+        (
+            lambda: with_object()
+            .annotate(k=Lower(KeyTransform("a", "j")))
+            .values_list("k"),
+            f'SELECT LOWER({OBJECT}->\'a\') AS "k" FROM "testapp_item"',
+            (),
+        ),
+    ],
+)
+def test_compile(queryset, sql, params):
+    assert as_sql(queryset) == (sql, params)
+
+
+@pytest.mark.parametrize(
+    "queryset, sql",
+    [
+        (
+            lambda: Item.objects.annotate(f=Func(Value("a"), F("name"))).values_list(
+                "f"
+            ),
+            'SELECT json_build_object(%s, "testapp_item"."name") AS "f" '
+            'FROM "testapp_item"',
+        ),
+        # The template doesn't use the function name.
+        (
+            lambda: Item.objects.annotate(
+                f=Func(
+                    F("count"),
+                    template="(%(expressions)s + 1)",
+                    output_field=IntegerField(),
+                )
+            ).values_list("f"),
+            'SELECT ("testapp_item"."count" + 1) AS "f" FROM "testapp_item"',
+        ),
+        (
+            lambda: Item.objects.annotate(f=Lower("name")).values_list("f"),
+            'SELECT LOWER("testapp_item"."name") AS "f" FROM "testapp_item"',
+        ),
+    ],
+)
+def test_compile_func(queryset, sql):
+    query = queryset().query
+    function = query.annotations["f"].function
+    assert query.get_compiler(connection=connection).as_sql()[0] == sql
+    # The function name is set on a copy of the shared expression.
+    assert query.annotations["f"].function == function
+
+
+@pytest.mark.parametrize(
+    "ordering, sql",
+    [
+        (
+            lambda: KeyTransform("a", "j"),
+            f"ORDER BY ({OBJECT}->>'a')::text ASC",
+        ),
+        (
+            lambda: KeyTransform("a", "j").desc(),
+            f"ORDER BY ({OBJECT}->>'a')::text DESC",
+        ),
+        (
+            lambda: F("data__key").desc(nulls_last=True),
+            'ORDER BY ("testapp_item"."data")::text DESC NULLS LAST',
+        ),
+        (
+            lambda: Upper("name").desc(),
+            'ORDER BY UPPER("testapp_item"."name") DESC',
+        ),
+    ],
+)
+def test_compile_order_by(ordering, sql):
+    assert as_sql(lambda: with_object().order_by(ordering()))[0].endswith(sql)
+
+
+def test_order_by_key_transform_not_mutated():
+    """
+    The text cast of an ordering key transform doesn't leak into the other
+    compilations of the expression.
+    """
+    query = with_object().query
+    compiler = query.get_compiler(connection=connection)
+    key = KeyTransform("a", "j").resolve_expression(query)
+    assert compiler.compile(key.asc()) == (f"({OBJECT}->>'a')::text ASC", [])
+    assert compiler.compile(key) == (f"{OBJECT}->'a'", [])
+    assert not hasattr(key, "is_ordering")
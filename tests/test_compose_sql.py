@@ -0,0 +1,52 @@
+# Copyright (c) 2025, HuaweiCloudDeveloper
+# Licensed under the BSD 3-Clause License.
+# See LICENSE file in the project root for full license information.
+
+import datetime
+import decimal
+
+import pytest
+from conftest import offline_connection
+from django.db import connection
+
+
+@pytest.mark.parametrize(
+    "value, literal",
+    [
+        ("it's", "'it''s'"),
+        # standard_conforming_strings is unknown to the offline connection.
+        ("back\\slash", " E'back\\\\slash'"),
+        (None, "NULL"),
+        (datetime.date(2020, 1, 2), "'2020-01-02'::date"),
+        (
+            datetime.datetime(2020, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc),
+            "'2020-01-02 03:04:05+00:00'::timestamptz",
+        ),
+        (datetime.datetime(2020, 1, 2, 3, 4, 5), "'2020-01-02 03:04:05'::timestamp"),
+        (decimal.Decimal("1.50"), "1.50"),
+        ([1, 2], "'{1,2}'::int2[]"),
+    ],
+)
+def test_compose_sql(server, value, literal):
+    sql = connection.ops.compose_sql("SELECT %s FROM t WHERE a = %s", [value, 1])
+    assert sql == "SELECT %s FROM t WHERE a = 1" % literal
+    # Composed on the client.
+    assert server.statements == []
+
+
+def test_compose_sql_named_parameters(server):
+    sql = connection.ops.compose_sql("SELECT %(a)s, %(a)s", {"a": "x"})
+    assert sql == "SELECT 'x', 'x'"
+
+
+def test_composer(server, monkeypatch):
+    monkeypatch.setattr(connection, "_composer", None)
+    composer = connection.composer
+    assert connection.composer is composer
+    assert composer.connection is connection.connection
+    # A new connection gets its own composer. Restored before the server
+    # fixture detaches its connection.
+    with pytest.MonkeyPatch.context() as connection_patch:
+        connection_patch.setattr(connection, "connection", offline_connection())
+        assert connection.composer is not composer
+        assert connection.composer.connection is connection.connection
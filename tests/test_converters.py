@@ -0,0 +1,95 @@
+# Copyright (c) 2025, HuaweiCloudDeveloper
+# Licensed under the BSD 3-Clause License.
+# See LICENSE file in the project root for full license information.
+
+import datetime
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.db.models import Count, IntegerField
+from django.db.models.functions import Cast, Length
+from django.db.models.sql.compiler import SQLCompiler
+from testapp.models import Item
+
+from gaussdb_django.operations import (
+    convert_int_value,
+    convert_int_values,
+    convert_json_value,
+    convert_json_values,
+)
+
+CREATED = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def compiler(queryset):
+    compiler = queryset.query.get_compiler(connection=connection)
+    compiler.setup_query()
+    compiler.pre_sql_setup()
+    return compiler
+
+
+def converters(queryset):
+    compiler_ = compiler(queryset)
+    return compiler_.get_converters(
+        [s[0] for s in compiler_.select[: compiler_.col_count]]
+    )
+
+
+@pytest.mark.parametrize(
+    "queryset, chunks",
+    [
+        (
+            Item.objects.all(),
+            [
+                [(1, "a", None, Decimal("1.50"), {"k": 1}, CREATED, 3)],
+                [
+                    (2, "b", "x", Decimal("0"), [1, 2], None, 0),
+                    (3, "", "", 0, None, None, 1),
+                ],
+            ],
+        ),
+        (
+            Item.objects.annotate(v=Cast("name", IntegerField())).values_list(
+                "v", "data"
+            ),
+            [[("12", {"x": 1}), ("zz", "3"), (b"a", None), (Decimal("3"), "s")]],
+        ),
+        (
+            Item.objects.annotate(a=Length("name"), b=Count("child")).values_list(
+                "a", "b"
+            ),
+            [[(1, 2), (None, 0)]],
+        ),
+    ],
+)
+def test_results_iter_matches_row_by_row_conversion(queryset, chunks):
+    expected = list(SQLCompiler.results_iter(compiler(queryset), chunks))
+    assert list(compiler(queryset).results_iter(chunks)) == expected
+
+
+def test_integer_columns_not_converted():
+    assert converters(Item.objects.values_list("pk", "count")) == {}
+
+
+def test_integer_expressions_converted():
+    ((convs, _),) = converters(
+        Item.objects.annotate(n=Length("name")).values_list("n")
+    ).values()
+    assert convs[0] is convert_int_value
+
+
+def test_json_converter():
+    ((convs, expression),) = converters(Item.objects.values_list("data")).values()
+    assert convs[0] is convert_json_value
+    assert connection.ops.batch_converters[convs[0]] is convert_json_values
+
+
+def test_batch_converters_match_converters():
+    values = [None, 1, "2", "x", b"a", [1], {"a": 1}, Decimal("3"), 4.0, True]
+    assert convert_int_values(values, None, connection) == [
+        convert_int_value(value, None, connection) for value in values
+    ]
+    assert convert_json_values(values, None, connection) == [
+        convert_json_value(value, None, connection) for value in values
+    ]
@@ -0,0 +1,99 @@
+# Copyright (c) 2025, HuaweiCloudDeveloper
+# Licensed under the BSD 3-Clause License.
+# See LICENSE file in the project root for full license information.
+
+import datetime
+import zoneinfo
+from decimal import Decimal
+
+import pytest
+from django.test import override_settings
+from testapp.models import Child, Item
+
+
+pytestmark = pytest.mark.options(copy_bulk_insert=2)
+
+
+def test_copy_nulls_and_defaults(server):
+    created = datetime.datetime(2020, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc)
+    Item.objects.bulk_create(
+        [
+            Item(id=1, name="a", body="text", data={"k": 1}, created=created),
+            Item(id=2, name="b", body=None),
+        ]
+    )
+    assert server.statements == []
+    (copy,) = server.copies
+    assert copy.sql == (
+        'COPY "testapp_item" ("id", "name", "body", "price", "data", "created", '
+        '"count") FROM STDIN WITH (FORMAT binary)'
+    )
+    assert copy.types == [
+        "integer",
+        "varchar",
+        "text",
+        "numeric",
+        "jsonb",
+        "timestamp with time zone",
+        "integer",
+    ]
+    first, second = copy.rows
+    assert first[:4] == [1, "a", "text", Decimal("0")]
+    assert first[4].obj == {"k": 1}
+    assert first[5:] == [created, 0]
+    # The NULLs are copied as None and the defaults are filled in.
+    assert second[:4] == [2, "b", None, Decimal("0")]
+    assert second[4] is None
+    assert second[5:] == [None, 0]
+
+
+@pytest.fixture
+def naive_datetimes():
+    # Before the server fixture, changing the time zone of an open connection
+    # runs SET TIME ZONE.
+    with override_settings(USE_TZ=False, TIME_ZONE="Asia/Shanghai"):
+        yield
+
+
+def test_copy_naive_datetime_in_connection_timezone(naive_datetimes, server):
+    Item.objects.bulk_create(
+        [Item(id=i, name="a", created=datetime.datetime(2020, 1, 1)) for i in (1, 2)]
+    )
+    (copy,) = server.copies
+    assert copy.rows[0][5] == datetime.datetime(
+        2020, 1, 1, tzinfo=zoneinfo.ZoneInfo("Asia/Shanghai")
+    )
+
+
+def test_copy_returning_fields_from_copied_rows(server):
+    items = Item.objects.bulk_create([Item(id=i, name="n%d" % i) for i in (5, 6, 7)])
+    assert [item.pk for item in items] == [5, 6, 7]
+    assert len(server.copies) == 1
+    assert server.statements == []
+
+
+def test_insert_for_database_generated_returning_fields(server):
+    server.results = [[(1,), (2,)]]
+    items = Item.objects.bulk_create([Item(name="a"), Item(name="b")])
+    assert server.copies == []
+    ((sql, params),) = server.statements
+    assert sql.startswith('INSERT INTO "testapp_item"')
+    assert sql.endswith('RETURNING "testapp_item"."id"')
+    assert [item.pk for item in items] == [1, 2]
+
+
+def test_insert_below_threshold(server):
+    server.results = [[(1,)]]
+    Child.objects.bulk_create([Child(id=1, item_id=1, label="a")])
+    assert server.copies == []
+    assert len(server.statements) == 1
+
+
+def test_insert_with_conflict_handling(server):
+    server.results = [[(1,), (2,)]]
+    Child.objects.bulk_create(
+        [Child(id=1, item_id=1, label="a"), Child(id=2, item_id=1, label="b")],
+        ignore_conflicts=True,
+    )
+    assert server.copies == []
+    assert len(server.statements) == 1
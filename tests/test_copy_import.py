@@ -0,0 +1,53 @@
+# Copyright (c) 2025, HuaweiCloudDeveloper
+# Licensed under the BSD 3-Clause License.
+# See LICENSE file in the project root for full license information.
+
+from concurrent.futures import Executor, Future
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from gaussdb_django.management.commands import gaussdb_copy_import
+
+
+class ImmediateExecutor(Executor):
+    """Run the submitted functions in the calling thread."""
+
+    def __init__(self, workers):
+        pass
+
+    def submit(self, fn, *args):
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+
+@pytest.fixture
+def copy_import(server, monkeypatch):
+    """Return a function running the command and returning its output."""
+    monkeypatch.setattr(gaussdb_copy_import, "ThreadPoolExecutor", ImmediateExecutor)
+    # The chunks are copied on the connection attached to the server.
+    monkeypatch.setattr(connection, "close", lambda: None)
+
+    def copy_import(*args, **options):
+        stdout = StringIO()
+        call_command("gaussdb_copy_import", *args, stdout=stdout, **options)
+        return stdout.getvalue()
+
+    return copy_import
+
+
+def test_jsonl_blank_lines(copy_import, server, tmp_path):
+    path = tmp_path / "items.jsonl"
+    path.write_text('\n{"name": "a", "count": 1}\n\n{"name": "b"}\n  \n')
+    output = copy_import("testapp.Item", str(path), chunk_size=2)
+    assert output.startswith("Loaded 2 rows into testapp_item in ")
+    assert [copy.sql for copy in server.copies] == [
+        'COPY "testapp_item" ("name", "count") FROM STDIN WITH (FORMAT text)'
+    ]
+    assert server.copies[0].rows == [["a", 1], ["b", 0]]
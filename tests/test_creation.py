@@ -0,0 +1,74 @@
+# Copyright (c) 2025, HuaweiCloudDeveloper
+# Licensed under the BSD 3-Clause License.
+# See LICENSE file in the project root for full license information.
+
+from contextlib import contextmanager
+
+import pytest
+from django.db import connection
+
+from gaussdb_django.gaussdb_any import errors
+
+
+@pytest.fixture
+def creation(server, monkeypatch):
+    creation = connection.creation
+
+    @contextmanager
+    def nodb_cursor():
+        with connection.cursor() as cursor:
+            yield cursor
+
+    monkeypatch.setattr(creation, "_nodb_cursor", nodb_cursor)
+    monkeypatch.setattr(creation, "clone_retry_delay", 0)
+    monkeypatch.setattr(creation, "log", lambda message: None)
+    monkeypatch.setattr(connection, "close", lambda: None)
+    monkeypatch.setattr(connection, "close_pool", lambda: None)
+    monkeypatch.setitem(connection.settings_dict, "NAME", "test_db")
+    return creation
+
+
+def clone(creation, server, keepdb=False):
+    creation._clone_test_db("1", verbosity=0, keepdb=keepdb)
+    return [sql.split(" WITH")[0] for sql, _ in server.statements]
+
+
+def object_in_use():
+    return errors.ObjectInUse("source database is being accessed by other users")
+
+
+def test_clone_retried_while_template_in_use(creation, server):
+    server.fail("CREATE DATABASE", object_in_use(), object_in_use())
+    statements = clone(creation, server)
+    # The other sessions are terminated before each attempt.
+    assert [sql.split()[0] for sql in statements] == ["SELECT", "CREATE"] * 3
+    assert statements[-1] == 'CREATE DATABASE "test_db_1"'
+    assert server.errors == []
+
+
+def test_clone_gives_up_after_attempts(creation, server, monkeypatch):
+    monkeypatch.setattr(creation, "clone_attempts", 3)
+    server.fail("CREATE DATABASE", *(object_in_use() for _ in range(3)))
+    with pytest.raises(SystemExit):
+        clone(creation, server)
+    assert sum(sql.startswith("CREATE") for sql, _ in server.statements) == 3
+
+
+def test_clone_not_retried_on_other_errors(creation, server):
+    server.fail("CREATE DATABASE", errors.InsufficientPrivilege("denied"))
+    with pytest.raises(SystemExit):
+        clone(creation, server)
+    assert sum(sql.startswith("CREATE") for sql, _ in server.statements) == 1
+
+
+def test_existing_clone_recreated(creation, server):
+    server.fail("CREATE DATABASE", errors.DuplicateDatabase("exists"))
+    statements = clone(creation, server)
+    assert 'DROP DATABASE "test_db_1"' in statements
+    assert statements[-1] == 'CREATE DATABASE "test_db_1"'
+
+
+def test_existing_clone_kept(creation, server):
+    server.results = [[(1,)]]
+    statements = clone(creation, server, keepdb=True)
+    assert not any(sql.startswith("CREATE") for sql in statements)
@@ -0,0 +1,71 @@
+# Copyright (c) 2025, HuaweiCloudDeveloper
+# Licensed under the BSD 3-Clause License.
+# See LICENSE file in the project root for full license information.
+
+import pytest
+from testapp.models import Item
+
+from gaussdb_django.export import export_copy
+
+
+def test_csv_header(server):
+    server.copy_output = [b"name,count\n", b"a,2\n", b"it's,3\n"]
+    queryset = Item.objects.filter(name__in=["a", "it's"], count__gt=1)
+    chunks = list(export_copy(queryset.values_list("name", "count"), header=True))
+    assert chunks == [b"name,count\na,2\nit's,3\n"]
+    [copy] = server.copies
+    # The parameters are inlined, COPY doesn't take any.
+    assert copy.sql == (
+        'COPY (SELECT "testapp_item"."name" AS "name", "testapp_item"."count" AS '
+        '"count" FROM "testapp_item" WHERE ("testapp_item"."count" > 1 AND '
+        "\"testapp_item\".\"name\" IN ('a', 'it''s'))) "
+        "TO STDOUT WITH (FORMAT csv, HEADER)"
+    )
+    assert server.statements == []
+
+
+def test_chunks(server):
+    server.copy_output = [b"1\n", b"2\n", b"3\n", b"4\n", b"5\n"]
+    chunks = export_copy(Item.objects.values_list("count"), chunk_size=4)
+    assert list(chunks) == [b"1\n2\n", b"3\n4\n", b"5\n"]
+
+
+def test_binary(server):
+    server.copy_output = [b"PGCOPY\n\xff\r\n\x00", b"\xff\xff"]
+    chunks = list(export_copy(Item.objects.values("pk"), format="binary"))
+    assert chunks == [b"PGCOPY\n\xff\r\n\x00\xff\xff"]
+    [copy] = server.copies
+    assert copy.sql == (
+        'COPY (SELECT "testapp_item"."id" AS "pk" FROM "testapp_item") '
+        "TO STDOUT WITH (FORMAT binary)"
+    )
+
+
+def test_ordering_columns(server):
+    # The column selected for the ordering of DISTINCT is left out.
+    queryset = Item.objects.values_list("count").order_by("name").distinct()
+    list(export_copy(queryset, format="text"))
+    [copy] = server.copies
+    assert copy.sql == (
+        'COPY (SELECT "count" AS "count" FROM (SELECT DISTINCT '
+        '"testapp_item"."count" AS "count", "testapp_item"."name" FROM '
+        '"testapp_item" ORDER BY "testapp_item"."name" ASC) subquery) '
+        "TO STDOUT WITH (FORMAT text)"
+    )
+
+
+def test_empty_result(server):
+    assert list(export_copy(Item.objects.filter(pk__in=[]))) == []
+    assert server.copies == []
+
+
+@pytest.mark.parametrize(
+    "options, message",
+    [
+        ({"format": "xml"}, "Unsupported COPY format 'xml'"),
+        ({"format": "text", "header": True}, "Only the csv format"),
+    ],
+)
+def test_invalid_options(options, message):
+    with pytest.raises(ValueError, match=message):
+        export_copy(Item.objects.all(), **options)
@@ -0,0 +1,84 @@
+# Copyright (c) 2025, HuaweiCloudDeveloper
+# Licensed under the BSD 3-Clause License.
+# See LICENSE file in the project root for full license information.
+
+import pytest
+from django.core.management.color import no_style
+from django.db import connection
+from testapp.models import Child, Item
+
+from gaussdb_django.operations import SEQUENCE_RESET_BATCH_SIZE
+
+TABLES = ["testapp_child", "testapp_item", "testapp_tag"]
+
+
+@pytest.fixture
+def touched_tables(options, monkeypatch):
+    options(flush_touched_tables=True)
+    monkeypatch.setattr(connection, "_touched_tables", {})
+    monkeypatch.setattr(
+        connection.introspection,
+        "get_referencing_tables",
+        lambda: {"testapp_item": {"testapp_child"}},
+    )
+    monkeypatch.setattr(
+        connection.introspection, "table_names", lambda *args, **kwargs: TABLES
+    )
+
+
+def flush(allow_cascade=False):
+    sql = connection.ops.sql_flush(no_style(), TABLES, allow_cascade=allow_cascade)
+    connection.ops.execute_sql_flush(sql)
+    return sql
+
+
+@pytest.mark.usefixtures("touched_tables")
+def test_flush_touched_tables(server):
+    # All the tables are truncated by the first flush.
+    assert flush() == [
+        'TRUNCATE "testapp_child", "testapp_item", "testapp_tag";',
+    ]
+    assert connection.touched_tables == set()
+    # The statements are sent in a single round trip.
+    assert server.statements == [
+        ('TRUNCATE "testapp_child", "testapp_item", "testapp_tag";', None)
+    ]
+    assert flush() == []
+
+    server.results = [[(1,)]]
+    Child.objects.create(item_id=1, label="a")
+    assert connection.touched_tables == {"testapp_child"}
+    assert flush() == ['TRUNCATE "testapp_child";']
+    assert connection.touched_tables == set()
+
+
+@pytest.mark.usefixtures("touched_tables")
+def test_flush_referencing_tables(server):
+    flush()
+    server.results = [[(1,)]]
+    Item.objects.create(name="a")
+    # Without CASCADE, the tables with a foreign key to a truncated table are
+    # truncated with it.
+    assert connection.ops.sql_flush(no_style(), TABLES) == [
+        'TRUNCATE "testapp_child", "testapp_item";'
+    ]
+    assert connection.ops.sql_flush(no_style(), TABLES, allow_cascade=True) == [
+        'TRUNCATE "testapp_item" CASCADE;'
+    ]
+
+
+def test_flush_all_tables_by_default(server):
+    flush()
+    assert connection.touched_tables is None
+    assert flush() == ['TRUNCATE "testapp_child", "testapp_item", "testapp_tag";']
+
+
+def test_sequence_reset_batches():
+    sequences = [{"table": "table%d" % i, "column": "id"} for i in range(1201)]
+    sql = connection.ops.sequence_reset_by_name_sql(no_style(), sequences)
+    assert [statement.count("setval(") for statement in sql] == [
+        SEQUENCE_RESET_BATCH_SIZE,
+        SEQUENCE_RESET_BATCH_SIZE,
+        1201 - 2 * SEQUENCE_RESET_BATCH_SIZE,
+    ]
+    assert all(statement.startswith("SELECT setval(") for statement in sql)
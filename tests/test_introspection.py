@@ -0,0 +1,115 @@
+# Copyright (c) 2025, HuaweiCloudDeveloper
+# Licensed under the BSD 3-Clause License.
+# See LICENSE file in the project root for full license information.
+
+from collections import namedtuple
+
+import pytest
+from django.db import connection
+
+Column = namedtuple(
+    "Column", "name type_code display_size internal_size precision scale"
+)
+
+# The columns of testapp_item as described by the server.
+DESCRIPTION = [
+    Column("id", 23, None, 4, None, None),
+    Column("name", 1043, 50, None, None, None),
+    Column("price", 1700, None, None, 8, 2),
+]
+COLUMN_INFO = [
+    ("id", False, "nextval('testapp_item_id_seq'::regclass)", None, True, None),
+    ("name", False, None, None, False, "The name."),
+    ("price", True, None, "C", False, None),
+]
+# attname, atttypid, atttypmod, typlen of the columns.
+COLUMN_TYPES = [("id", 23, -1, 4), ("name", 1043, 54, -1), ("price", 1700, 524294, -1)]
+KEY_ROWS = [
+    ("testapp_item_pkey", ["id"], "p", None, None),
+    ("testapp_item_price_check", ["price"], "c", None, None),
+]
+INDEX_ROWS = [
+    (
+        "testapp_item_pkey",
+        True,
+        True,
+        "CREATE UNIQUE INDEX testapp_item_pkey ON testapp_item USING btree (id)",
+        None,
+        "btree",
+        None,
+    ),
+    (
+        "testapp_item_name_idx",
+        False,
+        False,
+        "CREATE INDEX testapp_item_name_idx ON testapp_item USING btree (name DESC)",
+        None,
+        "btree",
+        "(price > 0)",
+    ),
+]
+SEQUENCE_ROWS = [("testapp_item_id_seq", "id")]
+
+
+def introspect(table_name):
+    with connection.cursor() as cursor:
+        return (
+            connection.introspection.get_table_description(cursor, table_name),
+            connection.introspection.get_constraints(cursor, table_name),
+            connection.introspection.get_sequences(cursor, table_name),
+        )
+
+
+@pytest.fixture
+def item_catalog(server):
+    server.descriptions['SELECT * FROM "testapp_item" LIMIT 1'] = DESCRIPTION
+    return server
+
+
+def test_snapshot_parity(item_catalog):
+    server = item_catalog
+    server.results += [COLUMN_INFO, KEY_ROWS, INDEX_ROWS, SEQUENCE_ROWS]
+    expected = introspect("testapp_item")
+    assert len(server.statements) == 5
+
+    del server.statements[:]
+    server.results += [
+        # Columns, of testapp_item and of another table.
+        [
+            ("testapp_item", *types, *info[1:])
+            for types, info in zip(COLUMN_TYPES, COLUMN_INFO)
+        ]
+        + [("testapp_tag", "id", 23, -1, 4, False, None, None, True, None)],
+        # Constraints and indexes.
+        [("testapp_item", *row) for row in KEY_ROWS],
+        [("testapp_item", *row) for row in INDEX_ROWS],
+        # Sequences.
+        [("testapp_item", *row) for row in SEQUENCE_ROWS],
+    ]
+    with connection.introspection.snapshot():
+        assert introspect("testapp_item") == expected
+        # The other tables are served from the snapshot.
+        description, constraints, sequences = introspect("testapp_tag")
+    assert len(server.statements) == 4
+    assert [column.name for column in description] == ["id"]
+    assert constraints == {}
+    assert sequences == []
+    assert expected[0][1].comment == "The name."
+    assert expected[1]["testapp_item_name_idx"]["orders"] == ["DESC"]
+
+
+def test_snapshot_cleared(item_catalog):
+    server = item_catalog
+    with connection.introspection.snapshot(), connection.cursor() as cursor:
+        for _ in range(2):
+            server.results += [
+                [("testapp_item", *row) for row in SEQUENCE_ROWS],
+                [("testapp_item", *COLUMN_TYPES[0], *COLUMN_INFO[0][1:])],
+            ]
+        connection.introspection.get_sequences(cursor, "testapp_item")
+        connection.introspection.get_sequences(cursor, "testapp_item")
+        assert len(server.statements) == 2
+        connection.introspection.clear_table_catalog()
+        connection.introspection.get_sequences(cursor, "testapp_item")
+    # The sequences and columns are loaded again.
+    assert len(server.statements) == 4
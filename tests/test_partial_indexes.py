@@ -0,0 +1,63 @@
+# Copyright (c) 2025, HuaweiCloudDeveloper
+# Licensed under the BSD 3-Clause License.
+# See LICENSE file in the project root for full license information.
+
+from django.db import connection
+from django.db.models import Index, Q, UniqueConstraint
+from testapp.models import Child, Item
+
+KEY_ROWS = [("testapp_item_pkey", ["id"], "p", None, None)]
+INDEX_ROWS = [
+    (
+        "testapp_item_pkey",
+        True,
+        True,
+        "CREATE UNIQUE INDEX testapp_item_pkey ON testapp_item USING btree (id)",
+        None,
+        "btree",
+        None,
+    ),
+    (
+        "item_live_idx",
+        False,
+        False,
+        "CREATE INDEX item_live_idx ON testapp_item USING btree (name) "
+        "WHERE (created IS NULL)",
+        None,
+        "btree",
+        "(created IS NULL)",
+    ),
+]
+
+
+def test_get_constraints_condition(server):
+    server.results = [KEY_ROWS, INDEX_ROWS]
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, "testapp_item")
+    assert "pg_get_expr(i.indpred, i.indrelid) as condition" in server.statements[1][0]
+    index = constraints["item_live_idx"]
+    assert index["columns"] == ["name"]
+    assert index["index"] is True
+    assert index["condition"] == "(created IS NULL)"
+    # Constraints of the key table don't have a condition.
+    assert "condition" not in constraints["testapp_item_pkey"]
+
+
+def test_partial_index_sql(server):
+    with connection.schema_editor(collect_sql=True) as editor:
+        editor.add_index(
+            Item,
+            Index(fields=["name"], name="item_live_idx", condition=Q(created=None)),
+        )
+        editor.add_constraint(
+            Child,
+            UniqueConstraint(
+                fields=["item"], name="child_a_uniq", condition=Q(label="a")
+            ),
+        )
+    assert editor.collected_sql == [
+        'CREATE INDEX IF NOT EXISTS "item_live_idx" ON "testapp_item" ("name") '
+        'WHERE "created" IS NULL;',
+        'CREATE UNIQUE INDEX "child_a_uniq" ON "testapp_child" ("item_id") '
+        "WHERE \"label\" = 'a';",
+    ]
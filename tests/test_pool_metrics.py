@@ -0,0 +1,125 @@
+# Copyright (c) 2025, HuaweiCloudDeveloper
+# Licensed under the BSD 3-Clause License.
+# See LICENSE file in the project root for full license information.
+
+from collections import Counter, defaultdict
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connections
+from gaussdb_pool import PoolTimeout
+
+from gaussdb_django import monitoring
+from gaussdb_django.signals import pool_checkout, pool_timeout
+
+
+class FakePool:
+    closed = False
+
+    def __init__(self, error=None):
+        self.error = error
+        self.popped = False
+
+    def getconn(self):
+        if self.error:
+            raise self.error
+        return "connection"
+
+    def get_stats(self):
+        return {"pool_min": 1, "pool_max": 4, "pool_size": 3, "pool_available": 1}
+
+    def pop_stats(self):
+        self.popped = True
+        return self.get_stats()
+
+
+@pytest.fixture
+def wrapper(monkeypatch):
+    """The default DatabaseWrapper, with its own pools and counters."""
+    wrapper = connections[DEFAULT_DB_ALIAS]
+    monkeypatch.setattr(wrapper, "_connection_pools", {})
+    monkeypatch.setattr(wrapper, "_async_connection_pools", {})
+    monkeypatch.setattr(monitoring, "_pool_counters", defaultdict(Counter))
+    return wrapper
+
+
+def receive(signal):
+    received = []
+
+    def receiver(**kwargs):
+        received.append(kwargs)
+
+    signal.connect(receiver, weak=False)
+    return received, receiver
+
+
+def test_getconn_sends_pool_checkout(wrapper):
+    pool = FakePool()
+    received, receiver = receive(pool_checkout)
+    try:
+        assert wrapper._pool_getconn(pool) == "connection"
+    finally:
+        pool_checkout.disconnect(receiver)
+    [kwargs] = received
+    wait_time = kwargs.pop("wait_time")
+    assert wait_time >= 0
+    assert kwargs == {
+        "signal": pool_checkout,
+        "sender": type(wrapper),
+        "connection": wrapper,
+        "pool": pool,
+        "kind": "sync",
+    }
+    assert monitoring._pool_counters[DEFAULT_DB_ALIAS, "sync"] == {"checkouts": 1}
+
+
+def test_getconn_sends_pool_timeout(wrapper):
+    pool = FakePool(PoolTimeout("timeout"))
+    received, receiver = receive(pool_timeout)
+    try:
+        with pytest.raises(PoolTimeout):
+            wrapper._pool_getconn(pool)
+    finally:
+        pool_timeout.disconnect(receiver)
+    [kwargs] = received
+    assert (kwargs["connection"], kwargs["pool"], kwargs["kind"]) == (
+        wrapper,
+        pool,
+        "sync",
+    )
+    assert kwargs["wait_time"] >= 0
+    assert monitoring._pool_counters[DEFAULT_DB_ALIAS, "sync"] == {"timeouts": 1}
+
+
+def test_pool_metrics_command(wrapper):
+    pool = wrapper._connection_pools[DEFAULT_DB_ALIAS] = FakePool()
+    monitoring.record_pool_event(DEFAULT_DB_ALIAS, "sync", "checkouts")
+    monitoring.record_pool_event(DEFAULT_DB_ALIAS, "sync", "checkouts")
+    out = StringIO()
+    call_command("gaussdb_pool_metrics", stdout=out)
+    lines = out.getvalue().splitlines()
+    assert lines[:3] == [
+        "# HELP gaussdb_django_pool_min Minimum number of connections of the pool.",
+        "# TYPE gaussdb_django_pool_min gauge",
+        'gaussdb_django_pool_min{alias="default",kind="sync"} 1',
+    ]
+    assert "# TYPE gaussdb_django_pool_checkouts_total counter" in lines
+    assert 'gaussdb_django_pool_in_use{alias="default",kind="sync"} 2' in lines
+    assert 'gaussdb_django_pool_checkouts_total{alias="default",kind="sync"} 2' in lines
+    assert 'gaussdb_django_pool_timeouts_total{alias="default",kind="sync"} 0' in lines
+    assert not pool.popped
+
+
+def test_pool_metrics_command_reset(wrapper):
+    pool = wrapper._connection_pools[DEFAULT_DB_ALIAS] = FakePool()
+    monitoring.record_pool_event(DEFAULT_DB_ALIAS, "sync", "returns")
+    out = StringIO()
+    call_command(
+        "gaussdb_pool_metrics", database=DEFAULT_DB_ALIAS, reset=True, stdout=out
+    )
+    assert 'gaussdb_django_pool_returns_total{alias="default",kind="sync"} 1' in (
+        out.getvalue()
+    )
+    assert pool.popped
+    assert (DEFAULT_DB_ALIAS, "sync") not in monitoring._pool_counters
@@ -0,0 +1,63 @@
+# Copyright (c) 2025, HuaweiCloudDeveloper
+# Licensed under the BSD 3-Clause License.
+# See LICENSE file in the project root for full license information.
+
+from contextlib import contextmanager
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+
+
+class FakeConnection:
+    """Record the transactions of a driver connection."""
+
+    def __init__(self):
+        self.transactions = []
+
+    @contextmanager
+    def transaction(self, force_rollback=False):
+        yield
+        self.transactions.append(force_rollback)
+
+
+def test_disabled_by_default():
+    assert connection.features.prepared_statements_max is None
+    assert connection.get_connection_params()["prepare_threshold"] is None
+
+
+@pytest.mark.options(server_side_binding=True, prepared_statements=True)
+def test_default_threshold():
+    assert connection.features.prepared_statements_max == 100
+    assert connection.get_connection_params()["prepare_threshold"] == 5
+
+
+@pytest.mark.options(
+    server_side_binding=True, prepared_statements=20, prepare_threshold=2
+)
+def test_threshold():
+    assert connection.features.prepared_statements_max == 20
+    assert connection.get_connection_params()["prepare_threshold"] == 2
+
+
+@pytest.mark.options(prepared_statements=True)
+def test_requires_server_side_binding():
+    with pytest.raises(ImproperlyConfigured, match="server_side_binding"):
+        connection.features.prepared_statements_max
+
+
+@pytest.mark.options(server_side_binding=True, prepared_statements=True)
+def test_clear(monkeypatch):
+    driver_connection = FakeConnection()
+    monkeypatch.setattr(connection, "connection", driver_connection)
+    connection.clear_prepared_statements()
+    # An empty transaction is rolled back so that the driver deallocates the
+    # statements.
+    assert driver_connection.transactions == [True]
+
+
+def test_clear_disabled(monkeypatch):
+    driver_connection = FakeConnection()
+    monkeypatch.setattr(connection, "connection", driver_connection)
+    connection.clear_prepared_statements()
+    assert driver_connection.transactions == []
@@ -0,0 +1,69 @@
+# Copyright (c) 2025, HuaweiCloudDeveloper
+# Licensed under the BSD 3-Clause License.
+# See LICENSE file in the project root for full license information.
+
+import pytest
+from django.db import connection
+from django.db.models import F
+from django.utils import timezone
+from testapp.models import Item
+
+from gaussdb_django.sql_cache import clear_compiled_sql_cache, query_fingerprint
+
+
+pytestmark = pytest.mark.options(compiled_sql_cache=True)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    yield
+    clear_compiled_sql_cache()
+
+
+def as_sql(queryset):
+    return queryset.query.get_compiler(connection=connection).as_sql()
+
+
+def test_cache_hit_with_other_values():
+    assert as_sql(Item.objects.filter(name="a")) == (
+        'SELECT "testapp_item"."id", "testapp_item"."name", "testapp_item"."body", '
+        '"testapp_item"."price", "testapp_item"."data", "testapp_item"."created", '
+        '"testapp_item"."count" FROM "testapp_item" WHERE "testapp_item"."name" = %s',
+        ("a",),
+    )
+    sql, params = as_sql(Item.objects.filter(name="b"))
+    assert params == ("b",)
+    assert connection.compiled_sql_cache.info()["hits"] == 1
+
+
+def test_filters_differing_only_by_column():
+    by_name = query_fingerprint(Item.objects.filter(name="a").query)[0]
+    by_body = query_fingerprint(Item.objects.filter(body="a").query)[0]
+    assert by_name != by_body
+    assert by_name == query_fingerprint(Item.objects.filter(name="b").query)[0]
+
+    as_sql(Item.objects.filter(name="a"))
+    sql, params = as_sql(Item.objects.filter(body="a"))
+    assert sql.endswith('WHERE "testapp_item"."body" = %s')
+    assert params == ("a",)
+    assert connection.compiled_sql_cache.info()["hits"] == 0
+
+
+def test_filters_differing_only_by_compared_expression():
+    by_count = query_fingerprint(Item.objects.filter(price=F("count")).query)[0]
+    by_id = query_fingerprint(Item.objects.filter(price=F("id")).query)[0]
+    assert by_count != by_id
+
+
+def test_time_zone():
+    queryset = Item.objects.filter(created__day=1)
+    with timezone.override("UTC"):
+        utc_key = query_fingerprint(queryset.query)[0]
+        utc_sql, utc_params = as_sql(queryset)
+    with timezone.override("Asia/Shanghai"):
+        shanghai_key = query_fingerprint(queryset.query)[0]
+        shanghai_sql, shanghai_params = as_sql(queryset)
+    assert utc_key != shanghai_key
+    assert connection.compiled_sql_cache.info()["hits"] == 0
+    assert "UTC" in utc_sql + repr(utc_params)
+    assert "Asia/Shanghai" in shanghai_sql + repr(shanghai_params)
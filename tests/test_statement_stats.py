@@ -0,0 +1,81 @@
+# Copyright (c) 2025, HuaweiCloudDeveloper
+# Licensed under the BSD 3-Clause License.
+# See LICENSE file in the project root for full license information.
+
+import gc
+
+from gaussdb_django.monitoring import (
+    LATENCY_BUCKETS,
+    OTHER_STATEMENTS,
+    StatementStats,
+    fingerprint_sql,
+)
+
+
+class Connection:
+    pass
+
+
+def test_fingerprint_sql():
+    assert fingerprint_sql(
+        "SELECT * FROM t WHERE a = 'x''y' AND b IN (%s, %s, %s) LIMIT 21"
+    ) == ("SELECT * FROM t WHERE a = ? AND b IN (%s, ...) LIMIT ?")
+    assert fingerprint_sql("INSERT INTO t VALUES (%s, %s), (%s, %s)") == (
+        "INSERT INTO t VALUES (%s, ...), ..."
+    )
+
+
+def test_buckets():
+    stats = StatementStats(max_statements=10)
+    connection = Connection()
+    histograms = stats.connection_histograms(connection)
+    # The upper bounds are inclusive, 16µs falls in the first bucket.
+    for duration in (1000, 16000, 16001, 32000, 100 * 10**9):
+        histograms.record(histograms.execute, "SELECT ?", duration)
+    histograms.record(histograms.fetch, "SELECT ?", 40000)
+
+    snapshot = stats.snapshot()["SELECT ?"]
+    execute = snapshot["execute"]
+    assert execute["count"] == 5
+    assert execute["total"] == (1000 + 16000 + 16001 + 32000 + 100 * 10**9) / 1e9
+    assert execute["max"] == 100.0
+    buckets = dict(execute["buckets"])
+    assert len(buckets) == len(LATENCY_BUCKETS) + 1
+    assert {bound: count for bound, count in buckets.items() if count} == {
+        16e-6: 2,
+        32e-6: 2,
+        # Overflow bucket.
+        None: 1,
+    }
+    fetch = {bound: count for bound, count in snapshot["fetch"]["buckets"] if count}
+    assert fetch == {64e-6: 1}
+
+
+def test_max_statements():
+    stats = StatementStats(max_statements=2)
+    connection = Connection()
+    histograms = stats.connection_histograms(connection)
+    for fingerprint in ("a", "b", "c", "d", "a"):
+        histograms.record(histograms.execute, fingerprint, 1000)
+    snapshot = stats.snapshot()
+    assert {key: value["execute"]["count"] for key, value in snapshot.items()} == {
+        "a": 2,
+        "b": 1,
+        OTHER_STATEMENTS: 2,
+    }
+
+
+def test_retired_connections():
+    stats = StatementStats(max_statements=10)
+    connection, other = Connection(), Connection()
+    stats.connection_histograms(connection).record(
+        stats.connections[0].execute, "a", 1000
+    )
+    stats.connection_histograms(other).record(stats.connections[1].execute, "a", 2000)
+    # The histograms of a collected connection are kept in the totals.
+    del connection
+    gc.collect()
+    assert len(stats.connections) == 1
+    assert stats.snapshot()["a"]["execute"]["count"] == 2
+    stats.reset()
+    assert stats.snapshot() == {}
@@ -0,0 +1,87 @@
+# Copyright (c) 2025, HuaweiCloudDeveloper
+# Licensed under the BSD 3-Clause License.
+# See LICENSE file in the project root for full license information.
+
+import gaussdb
+import pytest
+from conftest import offline_connection
+from django.db import connection
+
+from gaussdb_django.base import STREAMING_CURSOR_NAME
+
+pytestmark = pytest.mark.options(streaming_cursors=True)
+
+
+class OfflineConnection(gaussdb.Connection):
+    """
+    An open driver connection in autocommit mode, failing on I/O but whose
+    commits do nothing.
+    """
+
+    autocommit = True
+    closed = False
+
+    def commit(self):
+        pass
+
+    def wait(self, gen, interval=None):
+        for _ in gen:
+            raise AssertionError("I/O on an offline connection.")
+
+
+@pytest.fixture
+def dedicated_connections(monkeypatch):
+    """
+    Attach an offline connection to the default connection and return the
+    dedicated connections opened by the streaming cursors, with the
+    connection initialized by init_connection_state().
+    """
+    connections = []
+
+    def get_new_connection(conn_params):
+        connections.append(offline_connection(OfflineConnection))
+        return connections[-1]
+
+    def init_connection_state():
+        connections.append(("initialized", connection.connection))
+
+    monkeypatch.setattr(connection, "connection", offline_connection(OfflineConnection))
+    monkeypatch.setattr(connection, "_streaming_connection", None)
+    monkeypatch.setattr(connection, "get_new_connection", get_new_connection)
+    monkeypatch.setattr(connection, "init_connection_state", init_connection_state)
+    yield connections
+    monkeypatch.setattr(connection, "_streaming_connection", None)
+
+
+def test_chunked_cursor(dedicated_connections):
+    main_connection = connection.connection
+    cursor = connection.chunked_cursor()
+    dedicated_connection = cursor.cursor.connection
+    assert dedicated_connections == [
+        dedicated_connection,
+        ("initialized", dedicated_connection),
+    ]
+    assert connection.connection is main_connection
+    assert cursor.cursor.name == STREAMING_CURSOR_NAME
+    # The cursor is declared without hold in a transaction.
+    assert dedicated_connection.autocommit is False
+    assert cursor.cursor._withhold is False
+
+    cursor.close()
+    assert dedicated_connection.autocommit is True
+    assert connection._streaming_connection is dedicated_connection
+
+    # The connection is reused by the next streaming cursor.
+    cursor = connection.chunked_cursor()
+    assert cursor.cursor.connection is dedicated_connection
+    assert connection._streaming_connection is None
+    assert len(dedicated_connections) == 2
+    cursor.close()
+
+
+def test_chunked_cursor_without_streaming(dedicated_connections, options):
+    options(streaming_cursors=False)
+    cursor = connection.chunked_cursor()
+    assert cursor.cursor.connection is connection.connection
+    assert cursor.cursor.name != STREAMING_CURSOR_NAME
+    assert dedicated_connections == []
@@ -0,0 +1,76 @@
+# Copyright (c) 2025, HuaweiCloudDeveloper
+# Licensed under the BSD 3-Clause License.
+# See LICENSE file in the project root for full license information.
+
+import pytest
+from django.db import NotSupportedError, connection
+from django.db.models.constants import OnConflict
+from testapp.models import Child, Item
+
+FIELDS = [Item._meta.get_field("name"), Item._meta.get_field("count")]
+
+
+def suffix_sql(on_conflict, update_fields=(), unique_fields=()):
+    return connection.ops.on_conflict_suffix_sql(
+        FIELDS, on_conflict, update_fields, unique_fields
+    )
+
+
+def test_on_duplicate_key():
+    assert connection.features.upsert_syntax == "on_duplicate_key"
+    assert suffix_sql(None) == ""
+    assert suffix_sql(OnConflict.IGNORE) == "ON DUPLICATE KEY UPDATE NOTHING"
+    assert suffix_sql(OnConflict.UPDATE, ["name", "count"]) == (
+        'ON DUPLICATE KEY UPDATE "name" = EXCLUDED."name", '
+        '"count" = EXCLUDED."count"'
+    )
+
+
+@pytest.mark.options(upsert_syntax="on_conflict")
+def test_on_conflict():
+    assert suffix_sql(OnConflict.IGNORE) == "ON CONFLICT DO NOTHING"
+    assert suffix_sql(OnConflict.UPDATE, ["count"], ["name"]) == (
+        'ON CONFLICT("name") DO UPDATE SET "count" = EXCLUDED."count"'
+    )
+
+
+def test_update_conflicts_without_returning(server):
+    objs = [Item(name="a", count=1), Item(name="b", count=2)]
+    Item.objects.bulk_create(objs, update_conflicts=True, update_fields=["count"])
+    ((sql, params),) = server.statements
+    assert sql.endswith(
+        "VALUES (%s, %s, %s, %s, %s, %s), (%s, %s, %s, %s, %s, %s) "
+        'ON DUPLICATE KEY UPDATE "count" = EXCLUDED."count"'
+    )
+    assert [obj.pk for obj in objs] == [None, None]
+
+
+def test_ignore_conflicts(server):
+    Child.objects.bulk_create(
+        [Child(item_id=1, label="a"), Child(item_id=2, label="b")],
+        ignore_conflicts=True,
+    )
+    ((sql, params),) = server.statements
+    assert sql.endswith("ON DUPLICATE KEY UPDATE NOTHING")
+
+
+def test_unique_fields_rejected():
+    with pytest.raises(NotSupportedError):
+        Item.objects.bulk_create(
+            [Item(name="a")],
+            update_conflicts=True,
+            update_fields=["count"],
+            unique_fields=["name"],
+        )
+
+
+@pytest.mark.options(upsert_syntax="on_conflict")
+def test_on_conflict_returning(server):
+    server.results.append([(1,), (2,)])
+    objs = [Item(name="a", count=1), Item(name="b", count=2)]
+    Item.objects.bulk_create(
+        objs, update_conflicts=True, update_fields=["count"], unique_fields=["name"]
+    )
+    ((sql, params),) = server.statements
+    assert sql.endswith('RETURNING "testapp_item"."id"')
+    assert [obj.pk for obj in objs] == [1, 2]
@@ -0,0 +1,23 @@
+# Copyright (c) 2025, HuaweiCloudDeveloper
+# Licensed under the BSD 3-Clause License.
+# See LICENSE file in the project root for full license information.
+
+from django.db import models
+
+
+class Item(models.Model):
+    name = models.CharField(max_length=50, db_index=True)
+    body = models.TextField(null=True)
+    price = models.DecimalField(max_digits=8, decimal_places=2, default=0)
+    data = models.JSONField(null=True)
+    created = models.DateTimeField(null=True)
+    count = models.IntegerField(default=0)
+
+
+class Child(models.Model):
+    item = models.ForeignKey(Item, models.CASCADE)
+    label = models.CharField(max_length=20, unique=True)
+
+
+class Tag(models.Model):
+    name = models.CharField(max_length=20)